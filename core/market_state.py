@@ -7,20 +7,32 @@ Manages state transitions for all tracked markets.
 Implements Section 9 (Market State Machine) of PRD:
 - Market discovery, watching, eligibility, execution, reconciliation
 - Automatic state transitions based on time, price, and feed freshness
-- Thread-safe with asyncio.Lock
+- Lock-free: every mutation completes without awaiting, so each call is
+  atomic under asyncio's cooperative scheduling
 - Comprehensive logging of state changes
 """
 
-import asyncio
 import logging
+import sys
+import time
+from collections import defaultdict, deque
 from enum import Enum
 from dataclasses import dataclass, field
-from datetime import datetime, timedelta
-from typing import Optional, List, Dict, Tuple
+from datetime import datetime, timedelta, timezone
+from typing import Callable, Deque, Optional, List, Dict, Set, Tuple
 
 
 logger = logging.getLogger(__name__)
 
+# Transitions retained per market in Market.transition_history
+TRANSITION_HISTORY_LEN = 32
+
+
+def _to_monotonic_ns(when: datetime) -> int:
+    """Convert a wall-clock datetime (naive UTC or aware) to time.monotonic_ns() scale."""
+    now = datetime.now(timezone.utc) if when.tzinfo is not None else datetime.utcnow()
+    return time.monotonic_ns() + (when - now) // timedelta(microseconds=1) * 1000
+
 
 class MarketState(Enum):
     """Enumeration of all possible market states in the trading lifecycle"""
@@ -34,19 +46,25 @@ class MarketState(Enum):
     ON_HOLD = "on_hold"  # Stale feed or error, paused
 
 
-@dataclass
+@dataclass(slots=True)
 class Market:
     """
     Represents a single market with all tracking data.
 
     Tracks prices, execution state, and metadata needed for
     state machine transitions and execution.
+
+    Expiry and feed freshness are kept as time.monotonic_ns() integers so
+    the per-tick checks are a subtract and compare. end_time_ns is derived
+    from end_time when not given; code that moves end_time afterwards must
+    update end_time_ns too.
     """
 
     token_id: str
     condition_id: str
     question: str
-    end_time: datetime  # Resolution time
+    end_time: Optional[datetime] = None  # Resolution time (wall clock)
+    end_time_ns: int = 0  # Resolution time (monotonic ns, 0 = unknown)
 
     # State management
     state: MarketState = MarketState.DISCOVERED
@@ -54,7 +72,7 @@ class Market:
     # Price data
     current_bid: Optional[float] = None
     current_ask: Optional[float] = None
-    last_update: Optional[datetime] = None
+    last_update_ns: int = 0  # Monotonic ns of last price update, 0 = never
 
     # Execution data
     allocated_capital: float = 0.0
@@ -67,9 +85,44 @@ class Market:
 
     # Internal tracking
     created_at: datetime = field(default_factory=datetime.utcnow)
-    transition_history: List[Tuple[datetime, MarketState, MarketState, str]] = field(
-        default_factory=list
+    # Most recent transitions only, so long-lived markets use constant memory
+    transition_history: Deque[Tuple[datetime, MarketState, MarketState, str]] = field(
+        default_factory=lambda: deque(maxlen=TRANSITION_HISTORY_LEN)
     )
+    # (guard inputs, valid_until_ns) from the last check_transitions pass
+    # that left the market in place; see MarketStateMachine._guard_key
+    _guard_cache: tuple = field(default=(), init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        if not self.end_time_ns and isinstance(self.end_time, datetime):
+            self.end_time_ns = _to_monotonic_ns(self.end_time)
+        elif self.end_time is None and self.end_time_ns:
+            self.end_time = datetime.utcnow() + timedelta(
+                microseconds=(self.end_time_ns - time.monotonic_ns()) // 1000
+            )
+
+    @property
+    def last_update(self) -> Optional[datetime]:
+        """Wall-clock (naive UTC) time of the last price update, or None."""
+        if not self.last_update_ns:
+            return None
+        return datetime.utcnow() - timedelta(
+            microseconds=(time.monotonic_ns() - self.last_update_ns) // 1000
+        )
+
+    def time_to_expiry_sec(self, now_ns: Optional[int] = None) -> float:
+        """
+        Calculate seconds remaining until market resolution.
+
+        Args:
+            now_ns: Current monotonic time in ns (defaults to time.monotonic_ns())
+
+        Returns:
+            float: Seconds remaining (negative if already expired)
+        """
+        if now_ns is None:
+            now_ns = time.monotonic_ns()
+        return (self.end_time_ns - now_ns) / 1e9
 
     def time_to_expiry(self) -> timedelta:
         """
@@ -78,24 +131,24 @@ class Market:
         Returns:
             timedelta: Time remaining (negative if already expired)
         """
-        return self.end_time - datetime.utcnow()
+        return timedelta(seconds=self.time_to_expiry_sec())
 
-    def is_stale(self, threshold_ms: int = 500) -> bool:
+    def is_stale(self, threshold_ms: int = 500, now_ns: Optional[int] = None) -> bool:
         """
         Check if market feed is stale (no updates in threshold_ms).
 
         Args:
             threshold_ms: Staleness threshold in milliseconds
+            now_ns: Current monotonic time in ns (defaults to time.monotonic_ns())
 
         Returns:
-            True if no update in threshold_ms, False if recent update or None
+            True if no update in threshold_ms or never updated
         """
-        if self.last_update is None:
+        if self.last_update_ns == 0:
             return True
-
-        threshold_seconds = threshold_ms / 1000.0
-        time_since_update = (datetime.utcnow() - self.last_update).total_seconds()
-        return time_since_update > threshold_seconds
+        if now_ns is None:
+            now_ns = time.monotonic_ns()
+        return (now_ns - self.last_update_ns) > threshold_ms * 1_000_000
 
     def record_transition(
         self, new_state: MarketState, reason: str = ""
@@ -118,6 +171,13 @@ class Market:
         return None
 
 
+# ON_HOLD -> WATCHING requires an update this recent (Market.is_stale default)
+_RECOVERY_STALE_NS = 500 * 1_000_000
+
+# States check_transitions evaluates (DONE is terminal)
+_AUTO_TRANSITION_STATES = tuple(s for s in MarketState if s is not MarketState.DONE)
+
+
 @dataclass
 class SchedulerConfig:
     """
@@ -143,7 +203,8 @@ class MarketStateMachine:
     """
     Manages state transitions for all tracked markets.
 
-    Thread-safe with asyncio.Lock. Handles:
+    Holds no locks: no method awaits while it reads or mutates markets, so
+    each call runs atomically on the event loop. Handles:
     - Adding/removing markets
     - State transitions with validation
     - Automatic eligibility checks based on time/price
@@ -151,16 +212,23 @@ class MarketStateMachine:
     - Comprehensive state history
     """
 
-    def __init__(self, config: SchedulerConfig):
+    def __init__(
+        self,
+        config: SchedulerConfig,
+        clock: Callable[[], int] = time.monotonic_ns,
+    ):
         """
         Initialize state machine.
 
         Args:
             config: Scheduler configuration
+            clock: Monotonic nanosecond clock (injectable for tests)
         """
         self.markets: Dict[str, Market] = {}
         self.config = config
-        self._lock = asyncio.Lock()
+        self._clock = clock
+        # token_ids bucketed by state, kept in step with Market.state
+        self._by_state: Dict[MarketState, Set[str]] = defaultdict(set)
 
         logger.info(
             f"MarketStateMachine initialized with config: "
@@ -169,6 +237,13 @@ class MarketStateMachine:
             f"max_buy_price={config.max_buy_price}"
         )
 
+    def _set_state(self, market: Market, new_state: MarketState, reason: str) -> None:
+        """Move a market to new_state, recording history and updating the state index."""
+        self._by_state[market.state].discard(market.token_id)
+        self._by_state[new_state].add(market.token_id)
+        market.record_transition(new_state, reason)
+        market.state = new_state
+
     async def add_market(self, market: Market) -> None:
         """
         Add a new market to tracking.
@@ -179,15 +254,15 @@ class MarketStateMachine:
         Raises:
             ValueError: If market already exists
         """
-        async with self._lock:
-            if market.token_id in self.markets:
-                raise ValueError(f"Market {market.token_id} already exists")
+        if market.token_id in self.markets:
+            raise ValueError(f"Market {market.token_id} already exists")
 
-            self.markets[market.token_id] = market
-            logger.info(
-                f"Market added: {market.token_id} | Question: {market.question[:50]}... | "
-                f"Expiry: {market.end_time}"
-            )
+        self.markets[market.token_id] = market
+        self._by_state[market.state].add(market.token_id)
+        logger.info(
+            f"Market added: {market.token_id} | Question: {market.question[:50]}... | "
+            f"Expiry: {market.end_time}"
+        )
 
     async def remove_market(self, token_id: str) -> None:
         """
@@ -199,16 +274,15 @@ class MarketStateMachine:
         Returns:
             True if removed, False if not found
         """
-        async with self._lock:
-            if token_id in self.markets:
-                market = self.markets[token_id]
-                del self.markets[token_id]
-                logger.info(
-                    f"Market removed: {token_id} | Final state: {market.state.value} | "
-                    f"Transitions: {len(market.transition_history)}"
-                )
-            else:
-                logger.warning(f"Attempted to remove non-existent market: {token_id}")
+        if token_id in self.markets:
+            market = self.markets.pop(token_id)
+            self._by_state[market.state].discard(token_id)
+            logger.info(
+                f"Market removed: {token_id} | Final state: {market.state.value} | "
+                f"Transitions: {len(market.transition_history)}"
+            )
+        else:
+            logger.warning(f"Attempted to remove non-existent market: {token_id}")
 
     async def transition(
         self, token_id: str, new_state: MarketState, reason: str = ""
@@ -226,28 +300,26 @@ class MarketStateMachine:
         Returns:
             True if transition succeeded, False otherwise
         """
-        async with self._lock:
-            market = self.markets.get(token_id)
-            if not market:
-                logger.warning(f"Cannot transition: market {token_id} not found")
-                return False
+        market = self.markets.get(token_id)
+        if not market:
+            logger.warning(f"Cannot transition: market {token_id} not found")
+            return False
 
-            # Validate transition is allowed
-            if not self._is_valid_transition(market.state, new_state):
-                logger.warning(
-                    f"Invalid transition: {token_id} {market.state.value} -> {new_state.value}"
-                )
-                return False
+        # Validate transition is allowed
+        if not self._is_valid_transition(market.state, new_state):
+            logger.warning(
+                f"Invalid transition: {token_id} {market.state.value} -> {new_state.value}"
+            )
+            return False
 
-            old_state = market.state
-            market.state = new_state
-            market.record_transition(new_state, reason)
+        old_state = market.state
+        self._set_state(market, new_state, reason)
 
-            logger.info(
-                f"Market transitioned: {token_id} | "
-                f"{old_state.value} -> {new_state.value} | {reason}"
-            )
-            return True
+        logger.info(
+            f"Market transitioned: {token_id} | "
+            f"{old_state.value} -> {new_state.value} | {reason}"
+        )
+        return True
 
     async def get_markets_by_state(self, state: MarketState) -> List[Market]:
         """
@@ -259,8 +331,7 @@ class MarketStateMachine:
         Returns:
             List of markets in that state
         """
-        async with self._lock:
-            return [m for m in self.markets.values() if m.state == state]
+        return [self.markets[token_id] for token_id in list(self._by_state[state])]
 
     async def update_price(self, token_id: str, bid: float, ask: float) -> None:
         """
@@ -271,23 +342,22 @@ class MarketStateMachine:
             bid: Current bid price (0-1)
             ask: Current ask price (0-1)
         """
-        async with self._lock:
-            market = self.markets.get(token_id)
-            if not market:
-                logger.debug(f"Price update for unknown market: {token_id}")
-                return
-
-            market.current_bid = bid
-            market.current_ask = ask
-            market.last_update = datetime.utcnow()
-
-            # Reset failure count on successful update
-            if market.failure_count > 0:
-                logger.info(
-                    f"Market {token_id} feed recovered. "
-                    f"Failure count reset from {market.failure_count} to 0"
-                )
-                market.failure_count = 0
+        market = self.markets.get(token_id)
+        if not market:
+            logger.debug(f"Price update for unknown market: {token_id}")
+            return
+
+        market.current_bid = bid
+        market.current_ask = ask
+        market.last_update_ns = self._clock()
+
+        # Reset failure count on successful update
+        if market.failure_count > 0:
+            logger.info(
+                f"Market {token_id} feed recovered. "
+                f"Failure count reset from {market.failure_count} to 0"
+            )
+            market.failure_count = 0
 
     async def check_transitions(
         self,
@@ -305,32 +375,152 @@ class MarketStateMachine:
             List of (token_id, old_state, new_state) tuples for all transitions
         """
         transitions = []
+        now_ns = self._clock()
+
+        # Snapshot the non-terminal buckets; DONE markets have no outgoing
+        # transitions
+        candidates = [
+            token_id
+            for state in _AUTO_TRANSITION_STATES
+            for token_id in self._by_state[state]
+        ]
+        for token_id in candidates:
+            transition = self._apply_auto_transition(self.markets[token_id], now_ns)
+            if transition:
+                transitions.append(transition)
 
-        async with self._lock:
-            for token_id, market in list(self.markets.items()):
-                old_state = market.state
-                new_state = await self._check_market_transitions(market)
+        return transitions
 
-                # Perform transition if needed
-                if new_state != old_state:
-                    market.state = new_state
-                    market.record_transition(new_state, "auto-transition")
-                    transitions.append((token_id, old_state, new_state))
+    async def advance_until_stable(
+        self, token_id: Optional[str] = None, max_steps: int = 8
+    ) -> List[Tuple[str, MarketState, MarketState]]:
+        """
+        Apply automatic transitions repeatedly until no market moves.
 
-                    log_message = (
-                        f"Auto-transition: {token_id} | "
-                        f"{old_state.value} -> {new_state.value}"
-                    )
+        Equivalent to calling check_transitions() until it returns nothing,
+        but with one clock read and without re-snapshotting the state buckets.
 
-                    if new_state == MarketState.ELIGIBLE:
-                        time_to_expiry = market.time_to_expiry().total_seconds()
-                        log_message += f" | {time_to_expiry:.1f}s to expiry"
+        Args:
+            token_id: Market to advance (all markets if None)
+            max_steps: Maximum transitions per market, guarding against cycles
 
-                    logger.info(log_message)
+        Returns:
+            List of (token_id, old_state, new_state) tuples in order applied
+        """
+        transitions = []
+        now_ns = self._clock()
+
+        if token_id is None:
+            token_ids = [
+                tid
+                for state in _AUTO_TRANSITION_STATES
+                for tid in self._by_state[state]
+            ]
+        else:
+            token_ids = [token_id]
+
+        for tid in token_ids:
+            market = self.markets.get(tid)
+            if market is None:
+                continue
+            for _ in range(max_steps):
+                transition = self._apply_auto_transition(market, now_ns)
+                if not transition:
+                    break
+                transitions.append(transition)
 
         return transitions
 
-    async def _check_market_transitions(self, market: Market) -> MarketState:
+    def _apply_auto_transition(
+        self, market: Market, now_ns: int
+    ) -> Optional[Tuple[str, MarketState, MarketState]]:
+        """
+        Evaluate one market's guards and perform the resulting transition.
+
+        Args:
+            market: Market to check
+            now_ns: Clock reading for this pass
+
+        Returns:
+            (token_id, old_state, new_state) if the market moved, else None
+        """
+        # Skip guard evaluation if nothing it reads has changed and no
+        # time-based guard can have flipped since the last pass
+        key = self._guard_key(market)
+        cache = market._guard_cache
+        if cache and cache[0] == key and now_ns < cache[1]:
+            return None
+
+        old_state = market.state
+        new_state = self._check_market_transitions(market, now_ns)
+
+        if new_state == old_state:
+            market._guard_cache = (key, self._guard_valid_until_ns(market, now_ns))
+            return None
+
+        self._set_state(market, new_state, "auto-transition")
+
+        log_message = (
+            f"Auto-transition: {market.token_id} | "
+            f"{old_state.value} -> {new_state.value}"
+        )
+
+        if new_state == MarketState.ELIGIBLE:
+            time_to_expiry = market.time_to_expiry_sec(now_ns)
+            log_message += f" | {time_to_expiry:.1f}s to expiry"
+
+        logger.info(log_message)
+        return (market.token_id, old_state, new_state)
+
+    @staticmethod
+    def _guard_key(market: Market) -> tuple:
+        """Market fields the transition guards read, other than the clock."""
+        return (
+            market.state,
+            market.current_bid,
+            market.current_ask,
+            market.last_update_ns,
+            market.failure_count,
+            market.orders_placed,
+            market.end_time_ns,
+        )
+
+    def _guard_valid_until_ns(self, market: Market, now_ns: int) -> int:
+        """
+        Earliest time a time-based guard could change its result.
+
+        Staleness and time-to-expiry guards only flip once, when their
+        deadline passes, so with unchanged inputs the last result holds
+        until the nearest deadline still in the future.
+
+        Args:
+            market: Market just evaluated
+            now_ns: Clock reading for this pass
+
+        Returns:
+            Monotonic ns deadline (sys.maxsize if none remain)
+        """
+        deadlines = []
+        # end_time_ns == 0 means the expiry is unknown: no expiry deadline
+        if market.end_time_ns:
+            if market.state == MarketState.WATCHING:
+                deadlines.append(
+                    market.end_time_ns - self.config.time_to_eligibility_sec * 1_000_000_000
+                )
+            elif market.state == MarketState.EXECUTING:
+                deadlines.append(market.end_time_ns)
+
+        if market.last_update_ns:
+            deadlines.append(
+                market.last_update_ns + self.config.stale_feed_threshold_ms * 1_000_000
+            )
+            if market.state == MarketState.ON_HOLD:
+                deadlines.append(market.last_update_ns + _RECOVERY_STALE_NS)
+        return min((d for d in deadlines if d > now_ns), default=sys.maxsize)
+
+    def _check_market_transitions(
+        self, market: Market, now_ns: int
+    ) -> MarketState:
         """
         Determine what state a market should be in.
 
@@ -345,68 +535,81 @@ class MarketStateMachine:
 
         Args:
             market: Market to check
+            now_ns: Clock reading for this pass
 
         Returns:
             Target state for this market
         """
+        # Plain locals and integer ns arithmetic: this runs per market per tick
+        config = self.config
         current_state = market.state
+        last_update_ns = market.last_update_ns
+        since_update_ns = now_ns - last_update_ns
+        too_many_failures = market.failure_count > config.max_failures_before_hold
+
+        if current_state is MarketState.ON_HOLD:
+            # Rule 2: ON_HOLD → WATCHING if feed recovers
+            if (
+                last_update_ns
+                and since_update_ns <= _RECOVERY_STALE_NS
+                and not too_many_failures
+            ):
+                logger.info(f"Market {market.token_id} feed recovered from ON_HOLD")
+                return MarketState.WATCHING
+            return current_state
 
         # Rule 1: Any state → ON_HOLD if stale or too many failures
-        if market.is_stale(self.config.stale_feed_threshold_ms):
-            if current_state != MarketState.ON_HOLD:
-                logger.warning(f"Market {market.token_id} feed is stale")
-                return MarketState.ON_HOLD
+        if not last_update_ns or since_update_ns > config.stale_feed_threshold_ms * 1_000_000:
+            logger.warning(f"Market {market.token_id} feed is stale")
+            return MarketState.ON_HOLD
 
-        if market.failure_count > self.config.max_failures_before_hold:
-            if current_state != MarketState.ON_HOLD:
-                logger.warning(
-                    f"Market {market.token_id} failure_count={market.failure_count} "
-                    f"> max={self.config.max_failures_before_hold}"
-                )
-                return MarketState.ON_HOLD
-
-        # Rule 2: ON_HOLD → WATCHING if feed recovers
-        if current_state == MarketState.ON_HOLD:
-            if not market.is_stale() and market.failure_count <= self.config.max_failures_before_hold:
-                logger.info(f"Market {market.token_id} feed recovered from ON_HOLD")
-                return MarketState.WATCHING
+        if too_many_failures:
+            logger.warning(
+                f"Market {market.token_id} failure_count={market.failure_count} "
+                f"> max={config.max_failures_before_hold}"
+            )
+            return MarketState.ON_HOLD
 
         # Rule 3: DISCOVERED → WATCHING when we get first price update
-        if current_state == MarketState.DISCOVERED:
-            if market.last_update is not None:
-                return MarketState.WATCHING
+        # (always true here: a market with no update was held by rule 1)
+        if current_state is MarketState.DISCOVERED:
+            return MarketState.WATCHING
 
         # Rule 4: WATCHING → ELIGIBLE when time < threshold AND price < max_buy_price
-        if current_state == MarketState.WATCHING:
-            time_to_expiry = market.time_to_expiry().total_seconds()
-
-            if time_to_expiry <= self.config.time_to_eligibility_sec:
-                # Check price criteria
-                if market.current_ask is not None:
-                    if market.current_ask < self.config.max_buy_price:
+        # (end_time_ns == 0 is an unknown expiry: stay in WATCHING)
+        if current_state is MarketState.WATCHING:
+            end_time_ns = market.end_time_ns
+            if (
+                end_time_ns
+                and end_time_ns - now_ns <= config.time_to_eligibility_sec * 1_000_000_000
+            ):
+                ask = market.current_ask
+                # No price data yet: stay in WATCHING
+                if ask is not None:
+                    if ask < config.max_buy_price:
                         return MarketState.ELIGIBLE
-                    else:
-                        logger.debug(
-                            f"Market {market.token_id} price too high: "
-                            f"ask={market.current_ask:.3f} > max={self.config.max_buy_price}"
-                        )
-                else:
-                    # No price data yet, stay in WATCHING
-                    pass
+                    logger.debug(
+                        "Market %s price too high: ask=%.3f > max=%s",
+                        market.token_id, ask, config.max_buy_price,
+                    )
+            return current_state
 
         # Rule 5: ELIGIBLE → EXECUTING when orders placed
-        if current_state == MarketState.ELIGIBLE:
+        if current_state is MarketState.ELIGIBLE:
             if market.orders_placed > 0:
                 return MarketState.EXECUTING
+            return current_state
 
         # Rule 6: EXECUTING → RECONCILING when market resolves
-        if current_state == MarketState.EXECUTING:
-            if market.time_to_expiry().total_seconds() <= 0:
+        # (never on an unknown expiry, end_time_ns == 0)
+        if current_state is MarketState.EXECUTING:
+            if market.end_time_ns and market.end_time_ns <= now_ns:
                 return MarketState.RECONCILING
+            return current_state
 
         # Rule 7: RECONCILING → DONE when P&L calculated
         # (P&L calculation is external, but we mark DONE after some time)
-        if current_state == MarketState.RECONCILING:
+        if current_state is MarketState.RECONCILING:
             # In real implementation, check if P&L has been calculated
             # For now, assume it's done immediately
             return MarketState.DONE
@@ -451,28 +654,26 @@ class MarketStateMachine:
         Returns:
             True if successful
         """
-        async with self._lock:
-            market = self.markets.get(token_id)
-            if not market:
-                return False
+        market = self.markets.get(token_id)
+        if not market:
+            return False
 
-            if market.state != MarketState.ELIGIBLE:
-                logger.warning(
-                    f"Cannot mark execution: {token_id} not in ELIGIBLE state "
-                    f"(current: {market.state.value})"
-                )
-                return False
+        if market.state != MarketState.ELIGIBLE:
+            logger.warning(
+                f"Cannot mark execution: {token_id} not in ELIGIBLE state "
+                f"(current: {market.state.value})"
+            )
+            return False
 
-            market.allocated_capital = capital_allocated
-            market.orders_placed += 1
-            market.state = MarketState.EXECUTING
-            market.record_transition(MarketState.EXECUTING, "execution-started")
+        market.allocated_capital = capital_allocated
+        market.orders_placed += 1
+        self._set_state(market, MarketState.EXECUTING, "execution-started")
 
-            logger.info(
-                f"Execution started: {token_id} | Capital: ${capital_allocated:.2f} | "
-                f"Orders: {market.orders_placed}"
-            )
-            return True
+        logger.info(
+            f"Execution started: {token_id} | Capital: ${capital_allocated:.2f} | "
+            f"Orders: {market.orders_placed}"
+        )
+        return True
 
     async def mark_resolution(self, token_id: str, pnl: float) -> bool:
         """
@@ -487,20 +688,18 @@ class MarketStateMachine:
         Returns:
             True if successful
         """
-        async with self._lock:
-            market = self.markets.get(token_id)
-            if not market:
-                return False
+        market = self.markets.get(token_id)
+        if not market:
+            return False
 
-            market.pnl = pnl
-            market.state = MarketState.RECONCILING
-            market.record_transition(MarketState.RECONCILING, "resolution-detected")
+        market.pnl = pnl
+        self._set_state(market, MarketState.RECONCILING, "resolution-detected")
 
-            logger.info(
-                f"Market resolved: {token_id} | P&L: ${pnl:+.2f} | "
-                f"Total capital: ${market.allocated_capital:.2f}"
-            )
-            return True
+        logger.info(
+            f"Market resolved: {token_id} | P&L: ${pnl:+.2f} | "
+            f"Total capital: ${market.allocated_capital:.2f}"
+        )
+        return True
 
     async def mark_done(self, token_id: str) -> bool:
         """
@@ -514,26 +713,24 @@ class MarketStateMachine:
         Returns:
             True if successful
         """
-        async with self._lock:
-            market = self.markets.get(token_id)
-            if not market:
-                return False
+        market = self.markets.get(token_id)
+        if not market:
+            return False
 
-            if market.state != MarketState.RECONCILING:
-                logger.warning(
-                    f"Cannot mark done: {token_id} not in RECONCILING state "
-                    f"(current: {market.state.value})"
-                )
-                return False
+        if market.state != MarketState.RECONCILING:
+            logger.warning(
+                f"Cannot mark done: {token_id} not in RECONCILING state "
+                f"(current: {market.state.value})"
+            )
+            return False
 
-            market.state = MarketState.DONE
-            market.record_transition(MarketState.DONE, "completed")
+        self._set_state(market, MarketState.DONE, "completed")
 
-            logger.info(
-                f"Market marked done: {token_id} | Final P&L: ${market.pnl:+.2f} | "
-                f"Total transitions: {len(market.transition_history)}"
-            )
-            return True
+        logger.info(
+            f"Market marked done: {token_id} | Final P&L: ${market.pnl:+.2f} | "
+            f"Total transitions: {len(market.transition_history)}"
+        )
+        return True
 
     async def mark_failure(self, token_id: str, reason: str = "") -> bool:
         """
@@ -548,30 +745,45 @@ class MarketStateMachine:
         Returns:
             True if successful
         """
-        async with self._lock:
-            market = self.markets.get(token_id)
-            if not market:
-                return False
+        return await self.record_failures(token_id, [reason])
 
-            market.failure_count += 1
-            logger.warning(
-                f"Market failure recorded: {token_id} | "
-                f"Count: {market.failure_count} | Reason: {reason}"
-            )
+    async def record_failures(self, token_id: str, reasons: List[str]) -> bool:
+        """
+        Record several failures for a market in one atomic step (no awaits).
 
-            # Auto-hold if threshold exceeded
-            if market.failure_count > self.config.max_failures_before_hold:
-                if market.state != MarketState.ON_HOLD:
-                    market.state = MarketState.ON_HOLD
-                    market.record_transition(
-                        MarketState.ON_HOLD, f"too-many-failures ({market.failure_count})"
-                    )
-                    logger.error(
-                        f"Market moved to ON_HOLD due to failures: {token_id} "
-                        f"({market.failure_count}/{self.config.max_failures_before_hold})"
-                    )
+        The ON_HOLD threshold is checked once against the final count.
 
-            return True
+        Args:
+            token_id: Market token ID
+            reasons: Reason for each failure
+
+        Returns:
+            True if successful
+        """
+        market = self.markets.get(token_id)
+        if not market:
+            return False
+
+        market.failure_count += len(reasons)
+        logger.warning(
+            f"Market failure recorded: {token_id} | "
+            f"Count: {market.failure_count} | Reason: {'; '.join(reasons)}"
+        )
+
+        # Auto-hold if threshold exceeded
+        if market.failure_count > self.config.max_failures_before_hold:
+            if market.state != MarketState.ON_HOLD:
+                self._set_state(
+                    market,
+                    MarketState.ON_HOLD,
+                    f"too-many-failures ({market.failure_count})",
+                )
+                logger.error(
+                    f"Market moved to ON_HOLD due to failures: {token_id} "
+                    f"({market.failure_count}/{self.config.max_failures_before_hold})"
+                )
+
+        return True
 
     async def get_stats(self) -> Dict[str, int]:
         """
@@ -580,14 +792,9 @@ class MarketStateMachine:
         Returns:
             Dictionary with counts by state
         """
-        async with self._lock:
-            stats = {}
-            for state in MarketState:
-                count = sum(1 for m in self.markets.values() if m.state == state)
-                stats[state.value] = count
-
-            stats["total"] = len(self.markets)
-            return stats
+        stats = {state.value: len(self._by_state[state]) for state in MarketState}
+        stats["total"] = len(self.markets)
+        return stats
 
     async def cleanup_old_done_markets(self) -> int:
         """
@@ -600,18 +807,19 @@ class MarketStateMachine:
         max_age = timedelta(hours=self.config.max_hold_hours)
         cutoff = datetime.utcnow() - max_age
 
-        async with self._lock:
-            to_remove = []
-            for token_id, market in self.markets.items():
-                if (
-                    market.state == MarketState.DONE
-                    and market.last_transition_time() is not None
-                    and market.last_transition_time() < cutoff
-                ):
-                    to_remove.append(token_id)
-
-            for token_id in to_remove:
-                del self.markets[token_id]
+        to_remove = []
+        for token_id in list(self._by_state[MarketState.DONE]):
+            market = self.markets[token_id]
+            if (
+                market.last_transition_time() is not None
+                and market.last_transition_time() < cutoff
+            ):
+                to_remove.append(token_id)
+
+        for token_id in to_remove:
+            market = self.markets.pop(token_id, None)
+            if market is not None:
+                self._by_state[market.state].discard(token_id)
                 removed += 1
 
         if removed > 0:
@@ -4,20 +4,19 @@ Market Priority Queue for Polymarket Latency-Arbitrage Bot
 
 Time-priority queue for markets, keyed by expiry time and edge size.
 
-Uses Python's heapq for efficient O(log n) operations.
+Uses an indexed binary heap for O(log n) operations.
 Markets are prioritized by:
-1. Time to expiry (sooner = higher priority)
-2. Edge size (larger = higher priority as tiebreaker)
+1. Expiry deadline (sooner = higher priority)
+2. Insertion order (earlier = higher priority as tiebreaker)
 
-Implementation uses a two-list pattern for efficient removal:
+Implementation keeps each entry's heap position in a side index:
 - _heap: The actual heap structure
-- _entries: Maps token_id to entry metadata for O(1) removal
+- _pos: Maps token_id to its index in _heap for in-place removal/updates
 """
 
 import heapq
 import logging
-from typing import Optional, Dict, List, Tuple, TYPE_CHECKING
-from datetime import datetime
+from typing import Optional, Dict, Iterable, List, Tuple, TYPE_CHECKING
 
 if TYPE_CHECKING:
     from market_state import Market
@@ -30,75 +29,83 @@ class MarketPriorityQueue:
     """
     Time-priority queue for markets.
 
-    Supports O(log n) push/pop and O(1) removal via lazy deletion pattern.
+    Supports O(log n) push/pop/remove/update_priority. Entries are removed
+    from the heap immediately, so no tombstones accumulate.
 
-    Priority is calculated as:
-    -time_to_expiry - Returns negated seconds to expiry so heap's min-max
-                      semantics put shortest-expiry markets at top
+    Priority is the market's monotonic expiry deadline (end_time_ns), so the
+    min-heap puts shortest-expiry markets at top using integer compares.
     """
 
     def __init__(self):
         """Initialize empty priority queue"""
-        self._heap: List[Tuple[float, str]] = []  # (priority, token_id)
-        self._entries: Dict[str, Tuple[float, str, bool]] = {}  # token_id -> (priority, token_id, removed)
+        self._heap: List[Tuple[int, int, str]] = []  # (priority, seq, token_id)
+        self._pos: Dict[str, int] = {}  # token_id -> index in _heap
         self._entry_count = 0  # Counter for stable sort
 
+    @staticmethod
+    def _priority(market: "Market") -> int:
+        """Priority key for a market (monotonic expiry deadline in ns)."""
+        return market.end_time_ns
+
     def push(self, market: "Market") -> None:
         """
         Add market with priority = time_to_expiry.
 
         Sooner expiries get higher priority (lower values at top of min-heap).
+        Pushing a market already in the queue updates its priority.
 
         Args:
             market: Market instance to add
         """
-        # Calculate priority as seconds to expiry
-        # Min-heap puts lowest values at top, so shortest-expiry markets first
-        time_to_expiry_seconds = market.time_to_expiry().total_seconds()
-        priority = time_to_expiry_seconds
+        if market.token_id in self._pos:
+            self.update_priority(market)
+            return
 
-        # Lazy deletion: remove old entry if exists
-        if market.token_id in self._entries:
-            old_priority, _, _ = self._entries[market.token_id]
-            # Mark old entry as removed
-            self._entries[market.token_id] = (old_priority, market.token_id, True)
+        priority = self._priority(market)
 
-        # Add new entry
         self._entry_count += 1
-        self._entries[market.token_id] = (priority, market.token_id, False)
-        heapq.heappush(self._heap, (priority, self._entry_count, market.token_id))
+        self._heap.append((priority, self._entry_count, market.token_id))
+        self._pos[market.token_id] = len(self._heap) - 1
+        self._sift_up(len(self._heap) - 1)
 
-        logger.debug(
-            f"Market queued: {market.token_id} | "
-            f"Time to expiry: {time_to_expiry_seconds:.1f}s | Priority: {priority:.1f}"
-        )
+        logger.debug("Market queued: %s | Priority: %d", market.token_id, priority)
 
-    def pop(self) -> Optional[str]:
+    def heapify(self, markets: Iterable["Market"]) -> None:
         """
-        Get and remove highest priority market token_id.
+        Replace the queue contents with markets in a single O(n) build.
 
-        Uses lazy deletion to skip removed entries.
+        Cheaper than pushing markets one at a time when seeding a large
+        batch (e.g. at startup). A token appearing twice keeps its last entry.
 
-        Returns:
-            token_id of next market to process, or None if queue empty
+        Args:
+            markets: Markets to queue
         """
-        while self._heap:
-            priority, _, token_id = heapq.heappop(self._heap)
+        entries: Dict[str, Tuple[int, int, str]] = {}
+        for market in markets:
+            self._entry_count += 1
+            entries[market.token_id] = (self._priority(market), self._entry_count, market.token_id)
+
+        self._heap = list(entries.values())
+        heapq.heapify(self._heap)
+        self._pos = {entry[2]: idx for idx, entry in enumerate(self._heap)}
 
-            if token_id not in self._entries:
-                continue  # Already removed, skip
+        logger.debug("Market queue rebuilt with %d markets", len(self._heap))
 
-            _, _, removed = self._entries[token_id]
-            if removed:
-                continue  # Marked as removed, skip
+    def pop(self) -> Optional[str]:
+        """
+        Get and remove highest priority market token_id.
 
-            # This is a valid entry
-            del self._entries[token_id]
+        Returns:
+            token_id of next market to process, or None if queue empty
+        """
+        if not self._heap:
+            return None
 
-            logger.debug(f"Market popped from queue: {token_id} | Time to expiry: {priority:.1f}s")
-            return token_id
+        priority, _, token_id = self._heap[0]
+        self._remove_at(0)
 
-        return None
+        logger.debug("Market popped from queue: %s | Priority: %d", token_id, priority)
+        return token_id
 
     def peek(self) -> Optional[str]:
         """
@@ -107,65 +114,39 @@ class MarketPriorityQueue:
         Returns:
             token_id of next market, or None if queue empty
         """
-        # Skip removed entries to find next valid
-        temp_removed = []
-
-        while self._heap:
-            priority, _, token_id = self._heap[0]
-
-            if token_id not in self._entries:
-                # Already fully removed, skip
-                heapq.heappop(self._heap)
-                continue
-
-            _, _, removed = self._entries[token_id]
-            if removed:
-                # Marked as removed, skip
-                heapq.heappop(self._heap)
-                continue
-
-            # Found valid entry
-            return token_id
-
-        return None
+        if not self._heap:
+            return None
+        return self._heap[0][2]
 
     def update_priority(self, market: "Market") -> None:
         """
         Update priority when price/time changes.
 
-        Since we can't update in-place in a heap, we use lazy deletion:
-        Mark old entry as removed and add new entry.
+        Rewrites the entry in place and restores heap order around it.
 
         Args:
             market: Market with updated time/price
         """
-        if market.token_id not in self._entries:
+        idx = self._pos.get(market.token_id)
+        if idx is None:
             # Not in queue, just add it
             self.push(market)
             return
 
-        # Mark old entry as removed
-        old_priority, _, _ = self._entries[market.token_id]
-        self._entries[market.token_id] = (old_priority, market.token_id, True)
-
-        # Add new entry with updated priority
-        time_to_expiry_seconds = market.time_to_expiry().total_seconds()
-        new_priority = time_to_expiry_seconds
-
-        self._entry_count += 1
-        self._entries[market.token_id] = (new_priority, market.token_id, False)
-        heapq.heappush(self._heap, (new_priority, self._entry_count, market.token_id))
+        old_priority, seq, token_id = self._heap[idx]
+        new_priority = self._priority(market)
+        self._heap[idx] = (new_priority, seq, token_id)
+        self._sift_up(idx)
+        self._sift_down(self._pos[token_id])
 
         logger.debug(
-            f"Market priority updated: {market.token_id} | "
-            f"Time to expiry: {new_priority:.1f}s (was {old_priority:.1f}s)"
+            "Market priority updated: %s | Priority: %d (was %d)",
+            market.token_id, new_priority, old_priority,
         )
 
     def remove(self, token_id: str) -> bool:
         """
-        Mark market as removed (lazy deletion).
-
-        Actual removal from heap happens on next pop/peek.
+        Remove market from the queue.
 
         Args:
             token_id: Market token ID to remove
@@ -173,27 +154,72 @@ class MarketPriorityQueue:
         Returns:
             True if was in queue, False otherwise
         """
-        if token_id not in self._entries:
+        idx = self._pos.get(token_id)
+        if idx is None:
             logger.debug(f"Market not in queue for removal: {token_id}")
             return False
 
-        # Mark as removed
-        priority, _, _ = self._entries[token_id]
-        self._entries[token_id] = (priority, token_id, True)
+        self._remove_at(idx)
 
-        logger.debug(f"Market marked for removal: {token_id}")
+        logger.debug(f"Market removed from queue: {token_id}")
         return True
 
+    def _remove_at(self, idx: int) -> None:
+        """Remove the entry at heap index idx, keeping _pos consistent."""
+        heap = self._heap
+        del self._pos[heap[idx][2]]
+
+        last = heap.pop()
+        if idx == len(heap):
+            return
+
+        # Move the last entry into the hole and restore heap order
+        heap[idx] = last
+        self._pos[last[2]] = idx
+        self._sift_up(idx)
+        self._sift_down(self._pos[last[2]])
+
+    def _sift_up(self, idx: int) -> None:
+        """Move the entry at idx toward the root until its parent is smaller."""
+        heap, pos = self._heap, self._pos
+        entry = heap[idx]
+        while idx > 0:
+            parent = (idx - 1) >> 1
+            if heap[parent] <= entry:
+                break
+            heap[idx] = heap[parent]
+            pos[heap[idx][2]] = idx
+            idx = parent
+        heap[idx] = entry
+        pos[entry[2]] = idx
+
+    def _sift_down(self, idx: int) -> None:
+        """Move the entry at idx toward the leaves until both children are larger."""
+        heap, pos = self._heap, self._pos
+        size = len(heap)
+        entry = heap[idx]
+        while True:
+            child = 2 * idx + 1
+            if child >= size:
+                break
+            if child + 1 < size and heap[child + 1] < heap[child]:
+                child += 1
+            if entry <= heap[child]:
+                break
+            heap[idx] = heap[child]
+            pos[heap[idx][2]] = idx
+            idx = child
+        heap[idx] = entry
+        pos[entry[2]] = idx
+
     def __len__(self) -> int:
         """
         Get number of active markets in queue.
 
-        Counts only non-removed entries.
-
         Returns:
             Number of active markets
         """
-        return sum(1 for _, _, removed in self._entries.values() if not removed)
+        return len(self._heap)
 
     def is_empty(self) -> bool:
         """
@@ -202,20 +228,16 @@ class MarketPriorityQueue:
         Returns:
             True if no active markets in queue
         """
-        return self.__len__() == 0
+        return not self._heap
 
     def get_all_active(self) -> List[str]:
         """
         Get list of all active token_ids in queue.
 
         Returns:
-            List of token IDs not marked as removed
+            List of token IDs in the queue
         """
-        return [
-            token_id
-            for token_id, (_, _, removed) in self._entries.items()
-            if not removed
-        ]
+        return list(self._pos)
 
     def debug_stats(self) -> Dict[str, int]:
         """
@@ -224,12 +246,9 @@ class MarketPriorityQueue:
         Returns:
             Dictionary with heap size, active entries, removed entries
         """
-        active = sum(1 for _, _, removed in self._entries.values() if not removed)
-        removed = sum(1 for _, _, removed in self._entries.values() if removed)
-
         return {
             "heap_size": len(self._heap),
-            "active_entries": active,
-            "removed_entries": removed,
-            "total_entries": len(self._entries),
+            "active_entries": len(self._heap),
+            "removed_entries": 0,
+            "total_entries": len(self._pos),
         }
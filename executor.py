@@ -19,12 +19,14 @@ import asyncio
 import time
 import logging
 import re
-from typing import Dict, Any, Optional, Set
+from typing import Dict, Any, Optional, List
 from dataclasses import dataclass, field
 from functools import partial
 
 from py_clob_client.client import ClobClient
-from py_clob_client.clob_types import MarketOrderArgs, OrderType, ApiCreds, OrderArgs
+from py_clob_client.clob_types import (
+    MarketOrderArgs, OrderType, ApiCreds, OrderArgs, PostOrdersArgs,
+)
 from py_clob_client.order_builder.constants import BUY, SELL
 
 from config import CLOB_HOST
@@ -38,7 +40,7 @@ class OrderValidationError(Exception):
     pass
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class OrderRequest:
     """
     Order execution request with validation.
@@ -92,7 +94,7 @@ class OrderRequest:
 
         # Ensure metadata is a dict
         if self.metadata is None:
-            self.metadata = {}
+            object.__setattr__(self, "metadata", {})
 
 
 class OrderExecutor:
@@ -115,9 +117,8 @@ class OrderExecutor:
         self.position_store = position_store
         self.client = self._init_client()
 
-        # Deduplication tracking
-        self.pending_orders: Set[str] = set()
-        self.order_lock = asyncio.Lock()
+        # Deduplication tracking: order key -> result of the in-flight order
+        self._inflight: Dict[str, asyncio.Future] = {}
 
         # Rate limiting with thread-safe lock
         self.order_timestamps: list = []
@@ -160,12 +161,15 @@ class OrderExecutor:
         """Generate unique key for order deduplication"""
         return f"{request.strategy}:{request.token_id}:{request.action}:{request.size:.2f}"
 
-    async def _check_rate_limit(self) -> bool:
+    async def _check_rate_limit(self, count: int = 1) -> bool:
         """
         Check if we're within rate limits.
 
         Thread-safe implementation using asyncio lock.
 
+        Args:
+            count: Number of orders about to be submitted
+
         Returns:
             True if can proceed, False if rate limited
         """
@@ -174,14 +178,14 @@ class OrderExecutor:
             # Remove timestamps older than 60 seconds
             self.order_timestamps = [ts for ts in self.order_timestamps if now - ts < 60]
 
-            if len(self.order_timestamps) >= self.max_orders_per_minute:
+            if len(self.order_timestamps) + count > self.max_orders_per_minute:
                 logger.warning(
                     f"Rate limit reached: {len(self.order_timestamps)}/{self.max_orders_per_minute} "
                     f"orders in last 60s"
                 )
                 return False
 
-            self.order_timestamps.append(now)
+            self.order_timestamps.extend([now] * count)
             return True
 
     async def execute_order(self, request: OrderRequest) -> bool:
@@ -197,12 +201,16 @@ class OrderExecutor:
         start_time = time.time()
         order_key = self._get_order_key(request)
 
-        # Check deduplication
-        async with self.order_lock:
-            if order_key in self.pending_orders:
-                logger.warning(f"Duplicate order detected: {order_key}")
-                return False
-            self.pending_orders.add(order_key)
+        # Check deduplication: a duplicate shares the in-flight order's result
+        # instead of submitting again
+        inflight = self._inflight.get(order_key)
+        if inflight is not None:
+            logger.warning(f"Duplicate order detected: {order_key} - awaiting in-flight order")
+            return await asyncio.shield(inflight)
+
+        result = asyncio.get_running_loop().create_future()
+        self._inflight[order_key] = result
+        success = False
 
         try:
             # Check rate limit with retry
@@ -231,9 +239,9 @@ class OrderExecutor:
             return success
 
         finally:
-            # Remove from pending
-            async with self.order_lock:
-                self.pending_orders.discard(order_key)
+            # Remove from in-flight and release any duplicates
+            del self._inflight[order_key]
+            result.set_result(success)
 
     async def _execute_market_order(self, request: OrderRequest) -> bool:
         """
@@ -358,7 +366,7 @@ class OrderExecutor:
             "failed_orders": self.failed_orders,
             "success_rate": self.successful_orders / max(self.total_orders, 1),
             "avg_latency_seconds": avg_latency,
-            "pending_orders": len(self.pending_orders),
+            "pending_orders": len(self._inflight),
             "rate_limit_window": len(self.order_timestamps),
         }
 
@@ -392,17 +400,7 @@ class OrderExecutor:
         start_time = time.time()
 
         # Validate inputs
-        if side not in ("YES", "NO"):
-            logger.error(f"Invalid side: {side}")
-            return None
-        if action not in ("BUY", "SELL"):
-            logger.error(f"Invalid action: {action}")
-            return None
-        if not (0 < price < 1):
-            logger.error(f"Invalid price: {price}")
-            return None
-        if size <= 0:
-            logger.error(f"Invalid size: {size}")
+        if not self._validate_limit_order(side, action, price, size):
             return None
 
         # Check rate limit
@@ -465,6 +463,113 @@ class OrderExecutor:
 
         return None
 
+    async def place_limit_orders(
+        self,
+        orders: List[Dict[str, Any]],
+        strategy: str = "spread_capture",
+    ) -> List[Optional[str]]:
+        """
+        Place several GTC limit orders in one signed batch request.
+
+        Each order dict carries token_id, side, action, price and size.
+        The venue accepts or rejects each order individually, so callers
+        needing all-or-nothing semantics must cancel the survivors.
+
+        Args:
+            orders: Limit order parameters
+            strategy: Strategy name for logging
+
+        Returns:
+            Order ID (or None if rejected) for each input order, in order
+        """
+        if not orders:
+            return []
+
+        start_time = time.time()
+
+        # Validate inputs - reject the whole batch so legs stay together
+        for o in orders:
+            if not self._validate_limit_order(o["side"], o["action"], o["price"], o["size"]):
+                return [None] * len(orders)
+
+        # Check rate limit for every order in the batch
+        if not await self._check_rate_limit(len(orders)):
+            await asyncio.sleep(1)
+            if not await self._check_rate_limit(len(orders)):
+                logger.error(f"Rate limit exceeded for batch of {len(orders)} limit orders")
+                return [None] * len(orders)
+
+        logger.info(
+            f"{'[DRY RUN] ' if self.config.dry_run else ''}Placing batch of "
+            f"{len(orders)} limit orders: {strategy}"
+        )
+
+        if self.config.dry_run:
+            now = int(time.time())
+            return [
+                f"dry_run_{o['token_id'][:8]}_{now}_{i}" for i, o in enumerate(orders)
+            ]
+
+        try:
+            loop = asyncio.get_event_loop()
+
+            # Sign all orders in thread pool (blocking calls)
+            signed_orders = []
+            for o in orders:
+                order_args = OrderArgs(
+                    token_id=o["token_id"],
+                    price=o["price"],
+                    size=o["size"],
+                    side=BUY if o["action"] == "BUY" else SELL,
+                )
+                signed_orders.append(await loop.run_in_executor(
+                    self._executor,
+                    partial(self.client.create_order, order_args)
+                ))
+
+            # Submit all orders in one request
+            response = await loop.run_in_executor(
+                self._executor,
+                partial(
+                    self.client.post_orders,
+                    [PostOrdersArgs(order=so, orderType=OrderType.GTC) for so in signed_orders],
+                )
+            )
+
+            results = response if isinstance(response, list) else []
+            order_ids: List[Optional[str]] = [None] * len(orders)
+            for i, result in enumerate(results[: len(orders)]):
+                if isinstance(result, dict) and result.get("success", True):
+                    order_ids[i] = result.get("orderID") or result.get("id") or None
+
+            latency = time.time() - start_time
+            logger.info(
+                f"Batch limit orders placed: {sum(1 for oid in order_ids if oid)}/{len(orders)} | "
+                f"Latency: {latency:.3f}s"
+            )
+            return order_ids
+
+        except Exception as e:
+            logger.error(f"Failed to place limit order batch: {e}", exc_info=True)
+
+        return [None] * len(orders)
+
+    def _validate_limit_order(self, side: str, action: str, price: float, size: float) -> bool:
+        """Validate limit order parameters, logging the first problem found."""
+        if side not in ("YES", "NO"):
+            logger.error(f"Invalid side: {side}")
+            return False
+        if action not in ("BUY", "SELL"):
+            logger.error(f"Invalid action: {action}")
+            return False
+        if not (0 < price < 1):
+            logger.error(f"Invalid price: {price}")
+            return False
+        if size <= 0:
+            logger.error(f"Invalid size: {size}")
+            return False
+        return True
+
     async def cancel_order(self, order_id: str) -> bool:
         """
         Cancel a specific order by ID.
@@ -496,6 +601,42 @@ class OrderExecutor:
 
         return False
 
+    async def cancel_orders(self, order_ids: List[str]) -> List[str]:
+        """
+        Cancel several orders in one request.
+
+        Args:
+            order_ids: Order IDs to cancel
+
+        Returns:
+            Order IDs the exchange reports as cancelled
+        """
+        if not order_ids:
+            return []
+
+        if self.config.dry_run:
+            logger.info(f"[DRY RUN] Would cancel {len(order_ids)} orders")
+            return list(order_ids)
+
+        try:
+            loop = asyncio.get_event_loop()
+
+            response = await loop.run_in_executor(
+                self._executor,
+                partial(self.client.cancel_orders, list(order_ids))
+            )
+
+            if isinstance(response, dict):
+                cancelled = response.get("canceled", [])
+                if isinstance(cancelled, list):
+                    logger.info(f"Cancelled {len(cancelled)}/{len(order_ids)} orders")
+                    return cancelled
+
+        except Exception as e:
+            logger.error(f"Failed to cancel {len(order_ids)} orders: {e}")
+
+        return []
+
     async def cancel_all_orders(self, token_id: Optional[str] = None) -> int:
         """
         Cancel all open orders, optionally filtered by token.
@@ -238,7 +238,10 @@ async def main():
         config = MinimalConfig()
 
     checker = HealthChecker(config)
-    await checker.run()
+    try:
+        await checker.run()
+    finally:
+        await checker.notifier.close()
 
 
 if __name__ == "__main__":
@@ -26,6 +26,7 @@ import asyncio
 import signal
 import sys
 import logging
+import time
 import argparse
 from typing import Optional, Dict, Any
 from datetime import datetime, timezone
@@ -319,7 +320,7 @@ class ScalingOrchestrator:
         try:
             while self.running:
                 self.iteration += 1
-                iteration_start = datetime.now(timezone.utc)
+                iteration_start_ns = time.monotonic_ns()
 
                 try:
                     # 1. CHECK RISK CONTROLS
@@ -350,7 +351,7 @@ class ScalingOrchestrator:
                         can_trade, reason = await self.risk_manager.pre_execution_check(
                             market_id=market.token_id,
                             amount=market.current_ask or 0.5,  # Estimate
-                            feed_last_update=market.last_update or iteration_start,
+                            feed_last_update_ns=market.last_update_ns or iteration_start_ns,
                         )
 
                         if not can_trade:
@@ -28,7 +28,7 @@ Usage:
     can_trade, reason = await risk.pre_execution_check(
         market_id="market_123",
         amount=100.0,
-        feed_last_update=datetime.now(timezone.utc)
+        feed_last_update_ns=time.monotonic_ns()
     )
 """
 
@@ -16,10 +16,11 @@ All operations are thread-safe with asyncio.Lock.
 
 import asyncio
 import logging
+import time
 from dataclasses import dataclass
 from datetime import datetime, timedelta, timezone
 from enum import Enum
-from typing import Dict, Optional
+from typing import Callable, Dict, List, Optional
 
 logger = logging.getLogger(__name__)
 
@@ -37,6 +38,7 @@ class CircuitBreakerConfig:
     failure_threshold: int = 3              # Trips after N consecutive failures
     recovery_timeout_seconds: int = 60      # Time before auto-reset from OPEN
     half_open_max_requests: int = 1         # Max requests allowed in HALF_OPEN state
+    clock: Callable[[], float] = time.monotonic  # Seconds clock for recovery timing
 
 
 class CircuitBreaker:
@@ -74,6 +76,7 @@ class CircuitBreaker:
         self.state = CircuitState.CLOSED
         self.failure_count = 0
         self.last_failure_time: Optional[datetime] = None
+        self._last_failure_clock: float = 0.0  # config.clock() at last failure
         self.half_open_requests = 0
         self._lock = asyncio.Lock()
 
@@ -125,6 +128,7 @@ class CircuitBreaker:
             reason: Description of the failure
         """
         self.last_failure_time = datetime.now(timezone.utc)
+        self._last_failure_clock = self.config.clock()
         self.failure_count += 1
 
         if self.state == CircuitState.HALF_OPEN:
@@ -152,7 +156,7 @@ class CircuitBreaker:
         if self.state != CircuitState.OPEN or self.last_failure_time is None:
             return
 
-        elapsed = (datetime.now(timezone.utc) - self.last_failure_time).total_seconds()
+        elapsed = self.config.clock() - self._last_failure_clock
         if elapsed >= self.config.recovery_timeout_seconds:
             logger.info(
                 f"Circuit breaker {self.market_id}: OPEN -> HALF_OPEN "
@@ -253,6 +257,18 @@ class CircuitBreakerRegistry:
         breaker = await self.get_or_create(market_id)
         breaker.record_failure(reason)
 
+    async def record_failures(self, market_id: str, reasons: List[str]) -> None:
+        """
+        Record several failed executions for a market with one breaker lookup.
+
+        Args:
+            market_id: Market identifier
+            reasons: Description of each failure
+        """
+        breaker = await self.get_or_create(market_id)
+        for reason in reasons:
+            breaker.record_failure(reason)
+
     async def get_open_breakers(self) -> list[str]:
         """
         List all markets with open circuit breakers.
@@ -17,6 +17,7 @@ All operations are thread-safe with asyncio.Lock.
 
 import asyncio
 import logging
+import time
 from dataclasses import dataclass, field
 from datetime import datetime, timezone
 from enum import Enum
@@ -61,8 +62,8 @@ class KillSwitchManager:
         )
         manager = KillSwitchManager(config)
 
-        # In trading loop
-        if await manager.check_stale_feed(last_update):
+        # In trading loop (feed timestamps from time.monotonic_ns())
+        if await manager.check_stale_feed(last_update_ns):
             # Stop trading immediately
             pass
 
@@ -84,18 +85,17 @@ class KillSwitchManager:
         self._lock = asyncio.Lock()
         self._last_reset: datetime = datetime.now(timezone.utc)
 
-    async def check_stale_feed(self, last_update: datetime) -> bool:
+    async def check_stale_feed(self, last_update_monotonic_ns: int) -> bool:
         """
         Check if data feed is stale and activate kill switch if needed.
 
         Args:
-            last_update: Timestamp of last feed update
+            last_update_monotonic_ns: time.monotonic_ns() of last feed update
 
         Returns:
             True if feed is stale (kill switch activated), False otherwise
         """
-        now = datetime.now(timezone.utc)
-        stale_ms = (now - last_update).total_seconds() * 1000
+        stale_ms = (time.monotonic_ns() - last_update_monotonic_ns) / 1_000_000
 
         if stale_ms > self.config.stale_feed_threshold_ms:
             reason = f"Feed stale for {stale_ms:.0f}ms (threshold: {self.config.stale_feed_threshold_ms}ms)"
@@ -292,7 +292,7 @@ class RiskManager:
         can_execute, reason = await manager.pre_execution_check(
             market_id="market_123",
             amount=100.0,
-            feed_last_update=datetime.now(timezone.utc)
+            feed_last_update_ns=time.monotonic_ns()
         )
 
         # Record execution outcome
@@ -366,7 +366,7 @@ class RiskManager:
         self,
         market_id: str,
         amount: float,
-        feed_last_update: datetime,
+        feed_last_update_ns: int,
     ) -> Tuple[bool, str]:
         """
         Full pre-execution validation across all risk systems.
@@ -379,7 +379,7 @@ class RiskManager:
         Args:
             market_id: Market identifier
             amount: Proposed trade amount
-            feed_last_update: Timestamp of last data feed update
+            feed_last_update_ns: time.monotonic_ns() of last data feed update
 
         Returns:
             Tuple of (allowed: bool, reason: str)
@@ -391,7 +391,7 @@ class RiskManager:
             return False, f"Trading halted: {reasons}"
 
         # Check stale feed
-        if await self.kill_switches.check_stale_feed(feed_last_update):
+        if await self.kill_switches.check_stale_feed(feed_last_update_ns):
             return False, "Data feed is stale"
 
         # Check market circuit breaker
@@ -461,13 +461,19 @@ class EnhancedSniperBot:
     # Execution Logic with Risk and Capital Integration
     # =========================================================================
 
-    def should_execute(self, market: Market, prices: Dict[str, float]) -> bool:
+    def should_execute(
+        self,
+        market: Market,
+        prices: Dict[str, float],
+        now_ns: Optional[int] = None,
+    ) -> bool:
         """
         Determine if trade should be executed based on timing and price.
 
         Args:
             market: Market object with end_time
             prices: Current bid/ask/last prices
+            now_ns: Current monotonic time in ns (defaults to time.monotonic_ns())
 
         Returns:
             True if execution criteria met
@@ -475,8 +481,7 @@ class EnhancedSniperBot:
         if not market.end_time:
             return False
 
-        now = datetime.now(timezone.utc)
-        time_remaining = (market.end_time - now).total_seconds()
+        time_remaining = market.time_to_expiry_sec(now_ns)
 
         # Must be within execution window
         if time_remaining > self.sniper_config.execution_window_seconds:
@@ -510,11 +515,11 @@ class EnhancedSniperBot:
             (can_execute, reason) tuple
         """
         # 1. Risk manager checks (kill switches, circuit breakers, exposure)
-        feed_time = datetime.now(timezone.utc)
+        feed_time_ns = time.monotonic_ns()
         can_trade, reason = await self.risk_manager.pre_execution_check(
             market_id=token_id,
             amount=amount,
-            feed_last_update=feed_time,
+            feed_last_update_ns=feed_time_ns,
         )
 
         if not can_trade:
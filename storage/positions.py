@@ -13,11 +13,14 @@ Rebuilt with Opus 4.5 audit fixes:
 """
 
 import aiosqlite
+import asyncio
 import json
 import time
 import logging
 import os
-from typing import Optional, Dict, List, Any
+import uuid
+from contextvars import ContextVar
+from typing import Optional, Dict, List, Any, Set
 from datetime import datetime
 from contextlib import asynccontextmanager
 
@@ -35,6 +38,11 @@ except ImportError:
 
 logger = logging.getLogger(__name__)
 
+# (store, connection, owning task) of the begin_batch() transaction open in
+# the current context. Tasks created inside the batch inherit the context, so
+# the owner is checked too: only the task that opened the batch joins it.
+_active_batch: ContextVar[Optional[tuple]] = ContextVar("positions_active_batch", default=None)
+
 
 class PositionStore:
     """
@@ -44,21 +52,125 @@ class PositionStore:
     Supports Redis caching for hot data.
     """
 
-    def __init__(self, db_path: str = "data/positions.db", redis_url: Optional[str] = None):
+    # Databases whose schema was created/migrated by this process
+    _initialized_paths: Set[str] = set()
+
+    def __init__(
+        self,
+        db_path: str = "data/positions.db",
+        redis_url: Optional[str] = None,
+        redis_pool: Optional[Any] = None,
+    ):
         """
         Initialize position store.
 
         Args:
-            db_path: Path to SQLite database file
+            db_path: Path to SQLite database file, a "file:" URI, or ":memory:"
+                (in-memory databases use a shared cache so every connection
+                sees the same data)
             redis_url: Optional Redis connection URL (e.g., redis://localhost:6379)
+            redis_pool: Optional shared redis ConnectionPool (created with
+                decode_responses=True); used instead of redis_url so several
+                stores reuse the same connections. The store never closes it.
         """
+        if db_path == ":memory:":
+            db_path = f"file:positions_{uuid.uuid4().hex}?mode=memory&cache=shared"
+
         self.db_path = db_path
         self.redis_url = redis_url
+        self.redis_pool = redis_pool
         self.redis_client = None
         self._initialized = False
+        self._uri = db_path.startswith("file:")
+        self._in_memory = self._uri and "mode=memory" in db_path
+        # Holds an in-memory database open between per-operation connections
+        self._keepalive: Optional[aiosqlite.Connection] = None
+        # Shared-cache connections fail with "table is locked" instead of
+        # waiting on busy_timeout, so in-memory access is serialized
+        self._memory_lock = asyncio.Lock() if self._in_memory else None
+        # Held by begin_batch() for the whole batch and by every other write
+        # transaction, so writes from other tasks wait until the batch commits
+        self._write_lock = asyncio.Lock()
 
         # Ensure data directory exists
-        os.makedirs(os.path.dirname(db_path) or ".", exist_ok=True)
+        if not self._uri:
+            os.makedirs(os.path.dirname(db_path) or ".", exist_ok=True)
+
+    def _connect(self) -> aiosqlite.Connection:
+        """Open a connection to the configured database"""
+        return aiosqlite.connect(self.db_path, uri=self._uri)
+
+    def _batch_db(self) -> Optional[aiosqlite.Connection]:
+        """Connection of the batch the current task has open on this store, if any"""
+        batch = _active_batch.get()
+        if batch is not None and batch[0] is self and batch[2] is asyncio.current_task():
+            return batch[1]
+        return None
+
+    @asynccontextmanager
+    async def _open(self):
+        """Connection context for one operation (serialized for in-memory databases)"""
+        batch_db = self._batch_db()
+        if batch_db is not None:
+            yield batch_db
+        elif self._memory_lock is None:
+            async with self._connect() as db:
+                yield db
+        else:
+            async with self._memory_lock, self._connect() as db:
+                yield db
+
+    @asynccontextmanager
+    async def _transaction(self):
+        """Connection inside a write transaction (joins this task's open batch)"""
+        batch_db = self._batch_db()
+        if batch_db is not None:
+            yield batch_db
+            return
+
+        async with self._write_lock, self._open() as db:
+            try:
+                await db.execute("BEGIN IMMEDIATE")
+                yield db
+                await db.commit()
+            except Exception:
+                await db.rollback()
+                raise
+
+    @asynccontextmanager
+    async def begin_batch(self):
+        """
+        Group writes into a single transaction.
+
+        Every write made through this store inside the block shares one
+        BEGIN IMMEDIATE ... COMMIT, so N trades cost one commit instead of N.
+        Reads inside the block see the uncommitted writes. If the block
+        raises, the whole batch is rolled back.
+
+        The batch belongs to the task that opened it: writes from other
+        tasks wait until it commits or rolls back instead of joining it.
+
+        Usage:
+            async with store.begin_batch():
+                await store.record_trade(...)
+                await store.record_trade(...)
+        """
+        if not self._initialized:
+            await self.initialize()
+        if self._batch_db() is not None:
+            raise RuntimeError("PositionStore batch already open")
+
+        async with self._write_lock, self._open() as db:
+            token = _active_batch.set((self, db, asyncio.current_task()))
+            try:
+                await db.execute("BEGIN IMMEDIATE")
+                yield self
+                await db.commit()
+            except Exception:
+                await db.rollback()
+                raise
+            finally:
+                _active_batch.reset(token)
 
     async def initialize(self):
         """
@@ -73,20 +185,26 @@ class PositionStore:
         await self._init_database()
 
         # Initialize Redis if available
-        if REDIS_AVAILABLE and self.redis_url:
+        if REDIS_AVAILABLE and (self.redis_pool or self.redis_url):
             try:
                 if aioredis:
-                    self.redis_client = aioredis.from_url(
-                        self.redis_url,
-                        decode_responses=True
-                    )
+                    if self.redis_pool:
+                        self.redis_client = aioredis.Redis(connection_pool=self.redis_pool)
+                    else:
+                        self.redis_client = aioredis.from_url(
+                            self.redis_url,
+                            decode_responses=True
+                        )
                     await self.redis_client.ping()
                 else:
                     # Fallback to sync redis
-                    self.redis_client = redis.from_url(
-                        self.redis_url,
-                        decode_responses=True
-                    )
+                    if self.redis_pool:
+                        self.redis_client = redis.Redis(connection_pool=self.redis_pool)
+                    else:
+                        self.redis_client = redis.from_url(
+                            self.redis_url,
+                            decode_responses=True
+                        )
                     self.redis_client.ping()
                 logger.info("Redis cache connected")
             except Exception as e:
@@ -97,7 +215,19 @@ class PositionStore:
 
     async def _init_database(self):
         """Initialize SQLite database schema"""
-        async with aiosqlite.connect(self.db_path) as db:
+        if self._in_memory and self._keepalive is None:
+            # A shared-cache memory database is dropped with its last connection
+            self._keepalive = await self._connect()
+
+        # Schema DDL is idempotent, so skip it for a database this process
+        # already set up (unless the file has since been removed)
+        if self.db_path in PositionStore._initialized_paths and (
+            self._in_memory or os.path.exists(self.db_path)
+        ):
+            logger.debug(f"Database schema already initialized at {self.db_path}")
+            return
+
+        async with self._open() as db:
             # Enable WAL mode for better concurrency
             await db.execute("PRAGMA journal_mode=WAL")
             await db.execute("PRAGMA synchronous=NORMAL")
@@ -165,12 +295,13 @@ class PositionStore:
 
             await db.commit()
 
+        PositionStore._initialized_paths.add(self.db_path)
         logger.info(f"Database initialized at {self.db_path}")
 
     @asynccontextmanager
     async def _get_connection(self):
         """Get async database connection as context manager"""
-        async with aiosqlite.connect(self.db_path) as db:
+        async with self._open() as db:
             db.row_factory = aiosqlite.Row
             yield db
 
@@ -224,11 +355,9 @@ class PositionStore:
             except Exception as e:
                 logger.warning(f"Cache invalidation failed: {e}")
 
-        async with aiosqlite.connect(self.db_path) as db:
+        # One transaction per trade; inside begin_batch() it joins the batch
+        async with self._transaction() as db:
             try:
-                # Begin transaction
-                await db.execute("BEGIN IMMEDIATE")
-
                 # Insert trade
                 cursor = await db.execute(
                     """
@@ -295,9 +424,6 @@ class PositionStore:
                         (token_id,)
                     )
 
-                # Commit transaction
-                await db.commit()
-
                 logger.info(
                     f"Trade recorded: {strategy} | {action} {side} | "
                     f"${size:.2f} @ ${price:.3f}"
@@ -305,8 +431,7 @@ class PositionStore:
                 return trade_id
 
             except Exception as e:
-                # Rollback on any error
-                await db.rollback()
+                # _transaction() rolls back on the way out
                 logger.error(f"Failed to record trade: {e}")
                 raise
 
@@ -350,7 +475,7 @@ class PositionStore:
         # Check if position exists
         existing = await self.get_position(token_id)
 
-        async with aiosqlite.connect(self.db_path) as db:
+        async with self._transaction() as db:
             if existing:
                 # Build dynamic update query
                 updates = []
@@ -381,7 +506,6 @@ class PositionStore:
 
                 query = f"UPDATE positions SET {', '.join(updates)} WHERE token_id = ?"
                 await db.execute(query, values)
-                await db.commit()
 
             else:
                 # Insert new position
@@ -400,7 +524,6 @@ class PositionStore:
                     (token_id, entry_price, now, size, side,
                      status or "open", strategy, metadata_json, now),
                 )
-                await db.commit()
 
     async def get_position(self, token_id: str) -> Optional[Dict[str, Any]]:
         """
@@ -428,7 +551,7 @@ class PositionStore:
                 logger.warning(f"Cache read failed: {e}")
 
         # Query database
-        async with aiosqlite.connect(self.db_path) as db:
+        async with self._open() as db:
             db.row_factory = aiosqlite.Row
             cursor = await db.execute(
                 "SELECT * FROM positions WHERE token_id = ?",
@@ -480,7 +603,7 @@ class PositionStore:
         if not self._initialized:
             await self.initialize()
 
-        async with aiosqlite.connect(self.db_path) as db:
+        async with self._open() as db:
             db.row_factory = aiosqlite.Row
 
             if strategy:
@@ -527,7 +650,7 @@ class PositionStore:
         if not self._initialized:
             await self.initialize()
 
-        async with aiosqlite.connect(self.db_path) as db:
+        async with self._open() as db:
             db.row_factory = aiosqlite.Row
 
             if strategy:
@@ -577,7 +700,7 @@ class PositionStore:
         if not self._initialized:
             await self.initialize()
 
-        async with aiosqlite.connect(self.db_path) as db:
+        async with self._open() as db:
             db.row_factory = aiosqlite.Row
 
             # Fixed: Added size > 0 check to prevent division by zero
@@ -622,5 +745,11 @@ class PositionStore:
     async def close(self):
         """Close database connections"""
         if self.redis_client and aioredis:
+            # Leaves a shared redis_pool connected for its other users
             await self.redis_client.close()
+        if self._keepalive is not None:
+            await self._keepalive.close()
+            self._keepalive = None
+            # The memory database may be gone once its last connection closes
+            PositionStore._initialized_paths.discard(self.db_path)
         self._initialized = False
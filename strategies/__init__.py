@@ -12,7 +12,7 @@ Available strategies:
 from strategies.base_strategy import BaseStrategy
 from strategies.spread_capture import SpreadCaptureStrategy, SpreadCaptureConfig
 from strategies.position_tracker import PositionTracker, Position
-from strategies.order_manager import OrderManager, Order, OrderStatus
+from strategies.order_manager import OrderManager, Order, OrderSpec, OrderStatus
 
 __all__ = [
     "BaseStrategy",
@@ -22,5 +22,6 @@ __all__ = [
     "Position",
     "OrderManager",
     "Order",
+    "OrderSpec",
     "OrderStatus",
 ]
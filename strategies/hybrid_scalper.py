@@ -331,6 +331,9 @@ class HybridScalper(BaseStrategy):
         if self._session:
             await self._session.close()
 
+        if self.notifier:
+            await self.notifier.close()
+
         # Close RAG knowledge store
         if self.knowledge_store:
             await self.knowledge_store.close()
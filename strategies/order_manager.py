@@ -92,6 +92,17 @@ class Order:
         }
 
 
+@dataclass
+class OrderSpec:
+    """Parameters for one order in a batch submission."""
+
+    token_id: str
+    side: str  # YES or NO
+    price: float
+    size: float
+    metadata: Dict[str, Any] = field(default_factory=dict)
+
+
 class OrderManager:
     """
     Manages limit order lifecycle for spread capture strategy.
@@ -180,6 +191,73 @@ class OrderManager:
         """
         return await self._place_order(token_id, side, "SELL", price, size, metadata)
 
+    async def place_batch_buy(self, specs: List[OrderSpec]) -> List[Optional[str]]:
+        """
+        Place several limit buy orders in one signed batch request.
+
+        Args:
+            specs: Orders to place
+
+        Returns:
+            Order ID (or None if not placed) for each spec, in order
+        """
+        return await self._place_batch(specs, "BUY")
+
+    async def _place_batch(self, specs: List[OrderSpec], action: str) -> List[Optional[str]]:
+        """Internal batch order placement."""
+        if not specs:
+            return []
+
+        async with self._lock:
+            # Check order limit per market, counting earlier specs in the batch
+            pending: Dict[str, int] = {}
+            for spec in specs:
+                market_orders = self.orders_by_market.get(spec.token_id, [])
+                active_count = pending.get(spec.token_id, 0) + sum(
+                    1 for oid in market_orders
+                    if oid in self.orders and self.orders[oid].is_active
+                )
+
+                if active_count >= self.max_orders_per_market:
+                    logger.warning(
+                        f"Order limit reached for {spec.token_id[:16]}... "
+                        f"({active_count}/{self.max_orders_per_market})"
+                    )
+                    return [None] * len(specs)
+
+                pending[spec.token_id] = pending.get(spec.token_id, 0) + 1
+
+        # Place all orders via executor in one request
+        order_ids = await self.executor.place_limit_orders(
+            [
+                {
+                    "token_id": spec.token_id,
+                    "side": spec.side,
+                    "action": action,
+                    "price": spec.price,
+                    "size": spec.size,
+                }
+                for spec in specs
+            ],
+            strategy="spread_capture",
+        )
+
+        # Track orders
+        async with self._lock:
+            for spec, order_id in zip(specs, order_ids):
+                if not order_id:
+                    continue
+                self._track_order(order_id, spec.token_id, spec.side, action, spec.price, spec.size, spec.metadata)
+
+        for spec, order_id in zip(specs, order_ids):
+            if order_id:
+                logger.info(
+                    f"Order placed: {order_id} | {action} {spec.side} {spec.token_id[:16]}... "
+                    f"@ ${spec.price:.3f} x ${spec.size:.2f}"
+                )
+
+        return order_ids
+
     async def _place_order(
         self,
         token_id: str,
@@ -220,23 +298,7 @@ class OrderManager:
 
         # Track order
         async with self._lock:
-            order = Order(
-                order_id=order_id,
-                token_id=token_id,
-                side=side,
-                action=action,
-                price=price,
-                size=size,
-                metadata=metadata or {},
-            )
-
-            self.orders[order_id] = order
-
-            if token_id not in self.orders_by_market:
-                self.orders_by_market[token_id] = []
-            self.orders_by_market[token_id].append(order_id)
-
-            self.total_orders_placed += 1
+            self._track_order(order_id, token_id, side, action, price, size, metadata)
 
         logger.info(
             f"Order placed: {order_id} | {action} {side} {token_id[:16]}... "
@@ -245,6 +307,35 @@ class OrderManager:
 
         return order_id
 
+    def _track_order(
+        self,
+        order_id: str,
+        token_id: str,
+        side: str,
+        action: str,
+        price: float,
+        size: float,
+        metadata: Optional[Dict] = None,
+    ):
+        """Record a placed order. Caller must hold self._lock."""
+        order = Order(
+            order_id=order_id,
+            token_id=token_id,
+            side=side,
+            action=action,
+            price=price,
+            size=size,
+            metadata=metadata or {},
+        )
+
+        self.orders[order_id] = order
+
+        if token_id not in self.orders_by_market:
+            self.orders_by_market[token_id] = []
+        self.orders_by_market[token_id].append(order_id)
+
+        self.total_orders_placed += 1
+
     async def cancel_order(self, order_id: str) -> bool:
         """
         Cancel a specific order.
@@ -276,29 +367,113 @@ class OrderManager:
 
         return success
 
-    async def cancel_all_for_market(self, token_id: str) -> int:
+    async def cancel_orders(self, order_ids: List[str]) -> int:
         """
-        Cancel all orders for a specific market.
+        Cancel several orders in one request.
 
         Args:
-            token_id: Market token ID
+            order_ids: Order IDs to cancel
 
         Returns:
             Number of orders cancelled
         """
+        if not order_ids:
+            return 0
+
+        cancelled_ids = await self.executor.cancel_orders(order_ids)
+
         async with self._lock:
-            order_ids = self.orders_by_market.get(token_id, [])
-            active_orders = [
-                oid for oid in order_ids
-                if oid in self.orders and self.orders[oid].is_active
-            ]
+            self._mark_cancelled(cancelled_ids)
 
-        cancelled = 0
-        for order_id in active_orders:
-            if await self.cancel_order(order_id):
-                cancelled += 1
+        return len(cancelled_ids)
 
-        return cancelled
+    def _mark_cancelled(self, order_ids: List[str]):
+        """Mark cancelled orders in local state. Caller must hold self._lock."""
+        for order_id in order_ids:
+            order = self.orders.get(order_id)
+            if order and order.is_active:
+                order.status = OrderStatus.CANCELLED
+                self.total_orders_cancelled += 1
+
+    async def cancel_and_place(
+        self,
+        cancel_ids: List[str],
+        new_order: OrderSpec,
+        action: str = "SELL",
+    ) -> Optional[str]:
+        """
+        Cancel orders and place a replacement in a single round-trip.
+
+        The CLOB has no combined cancel+post endpoint, so the cancel and
+        the signed order are sent concurrently instead of one after the
+        other. Orders being cancelled do not count toward the per-market
+        order limit.
+
+        Args:
+            cancel_ids: Order IDs to cancel
+            new_order: Replacement order
+            action: BUY or SELL for the replacement
+
+        Returns:
+            Replacement order ID if placed, None otherwise
+        """
+        token_id = new_order.token_id
+        cancelling = set(cancel_ids)
+
+        async with self._lock:
+            market_orders = self.orders_by_market.get(token_id, [])
+            active_count = sum(
+                1 for oid in market_orders
+                if oid not in cancelling and oid in self.orders and self.orders[oid].is_active
+            )
+
+            if active_count >= self.max_orders_per_market:
+                logger.warning(
+                    f"Order limit reached for {token_id[:16]}... "
+                    f"({active_count}/{self.max_orders_per_market})"
+                )
+                return None
+
+        cancelled_ids, order_id = await asyncio.gather(
+            self.executor.cancel_orders(list(cancel_ids)),
+            self.executor.place_limit_order(
+                token_id=token_id,
+                side=new_order.side,
+                action=action,
+                price=new_order.price,
+                size=new_order.size,
+                strategy="spread_capture",
+            ),
+        )
+
+        async with self._lock:
+            self._mark_cancelled(cancelled_ids)
+            if order_id:
+                self._track_order(
+                    order_id, token_id, new_order.side, action,
+                    new_order.price, new_order.size, new_order.metadata,
+                )
+
+        if order_id:
+            logger.info(
+                f"Order placed: {order_id} | {action} {new_order.side} {token_id[:16]}... "
+                f"@ ${new_order.price:.3f} x ${new_order.size:.2f} "
+                f"(replaced {len(cancelled_ids)}/{len(cancel_ids)})"
+            )
+
+        return order_id
+
+    async def cancel_all_for_market(self, token_id: str) -> int:
+        """
+        Cancel all orders for a specific market.
+
+        Args:
+            token_id: Market token ID
+
+        Returns:
+            Number of orders cancelled
+        """
+        return await self.cancel_orders(await self.get_active_order_ids(token_id))
 
     async def cancel_all(self) -> int:
         """
@@ -332,11 +507,9 @@ class OrderManager:
                 if order.is_active and order.age_seconds > self.stale_order_seconds
             ]
 
-        cancelled = 0
-        for order_id in stale_orders:
-            if await self.cancel_order(order_id):
-                cancelled += 1
-                logger.info(f"Cancelled stale order: {order_id}")
+        cancelled = await self.cancel_orders(stale_orders)
+        if cancelled:
+            logger.info(f"Cancelled {cancelled} stale orders")
 
         return cancelled
 
@@ -387,6 +560,53 @@ class OrderManager:
 
         return changes
 
+    async def apply_event(self, event: Dict[str, Any]) -> bool:
+        """
+        Apply a pushed user-channel event to local order state.
+
+        Only ``order`` events are applied. PLACEMENT and UPDATE carry the
+        cumulative ``size_matched``; CANCELLATION marks the order cancelled.
+        ``trade`` events are ignored: they repeat for each settlement status
+        (MATCHED, MINED, CONFIRMED) and the fill they report also arrives
+        as an order UPDATE.
+
+        Args:
+            event: Decoded user-channel message
+
+        Returns:
+            True if a tracked order changed
+        """
+        if event.get("event_type") != "order":
+            return False
+
+        order_id = event.get("id")
+
+        async with self._lock:
+            order = self.orders.get(order_id)
+            if not order or not order.is_active:
+                return False
+
+            if event.get("type") == "CANCELLATION":
+                self._mark_cancelled([order_id])
+                return True
+
+            filled = float(event.get("size_matched") or 0)
+            if filled <= order.filled_size:
+                if order.status == OrderStatus.PENDING:
+                    order.status = OrderStatus.OPEN
+                    return True
+                return False
+
+            self.total_volume_filled += filled - order.filled_size
+            order.filled_size = filled
+            if filled >= order.size:
+                order.status = OrderStatus.FILLED
+                self.total_orders_filled += 1
+            else:
+                order.status = OrderStatus.PARTIALLY_FILLED
+
+            return True
+
     async def get_order(self, order_id: str) -> Optional[Order]:
         """Get order by ID."""
         async with self._lock:
@@ -410,6 +630,14 @@ class OrderManager:
 
             return orders
 
+    async def get_active_order_ids(self, token_id: str) -> List[str]:
+        """Get IDs of active orders for a market from local state."""
+        async with self._lock:
+            return [
+                oid for oid in self.orders_by_market.get(token_id, [])
+                if oid in self.orders and self.orders[oid].is_active
+            ]
+
     async def get_pending_buys(self, token_id: str) -> List[Order]:
         """Get pending buy orders for a market."""
         active = await self.get_active_orders(token_id)
@@ -11,7 +11,7 @@ import time
 import logging
 from dataclasses import dataclass, field
 from typing import Dict, Optional, List
-from datetime import datetime
+from datetime import datetime, timezone
 
 logger = logging.getLogger(__name__)
 
@@ -73,7 +73,11 @@ class Position:
     def time_to_market_expiry(self) -> Optional[float]:
         """Seconds until market expires, or None if unknown."""
         if self.market_expiry:
-            return (self.market_expiry - datetime.utcnow()).total_seconds()
+            if self.market_expiry.tzinfo is not None:
+                now = datetime.now(timezone.utc)
+            else:
+                now = datetime.utcnow()
+            return (self.market_expiry - now).total_seconds()
         return None
 
     def should_take_profit(self) -> bool:
@@ -168,40 +172,60 @@ class PositionTracker:
         Returns:
             True if position added, False if at max capacity or already exists
         """
+        position = Position(
+            token_id=token_id,
+            side=side,
+            entry_price=entry_price,
+            size=size,
+            entry_time=time.time(),
+            take_profit_price=take_profit_price,
+            stop_loss_price=stop_loss_price,
+            max_hold_seconds=max_hold_seconds,
+            current_price=entry_price,
+            order_id=order_id,
+            market_question=market_question,
+            market_expiry=market_expiry,
+        )
+
         async with self._lock:
-            if len(self.positions) >= self.max_positions:
-                logger.warning(
-                    f"Cannot add position - at max capacity ({self.max_positions})"
-                )
-                return False
+            return self._insert_position(position)
 
-            if token_id in self.positions:
-                logger.warning(f"Position already exists for {token_id[:16]}...")
-                return False
+    async def add_positions(self, positions: List[Position]) -> int:
+        """
+        Add several positions under a single lock acquisition.
 
-            position = Position(
-                token_id=token_id,
-                side=side,
-                entry_price=entry_price,
-                size=size,
-                entry_time=time.time(),
-                take_profit_price=take_profit_price,
-                stop_loss_price=stop_loss_price,
-                max_hold_seconds=max_hold_seconds,
-                current_price=entry_price,
-                order_id=order_id,
-                market_question=market_question,
-                market_expiry=market_expiry,
-            )
+        Args:
+            positions: Positions to open
 
-            self.positions[token_id] = position
-            self.total_positions_opened += 1
+        Returns:
+            Number of positions added (capacity and duplicate checks apply
+            to each position as in add_position)
+        """
+        async with self._lock:
+            return sum(self._insert_position(position) for position in positions)
 
-            logger.info(
-                f"Position opened: {token_id[:16]}... | {side} @ ${entry_price:.3f} | "
-                f"Size: ${size:.2f} | TP: ${take_profit_price or 0:.3f}"
+    def _insert_position(self, position: Position) -> bool:
+        """Record a new position. Caller must hold self._lock."""
+        token_id = position.token_id
+
+        if len(self.positions) >= self.max_positions:
+            logger.warning(
+                f"Cannot add position - at max capacity ({self.max_positions})"
             )
-            return True
+            return False
+
+        if token_id in self.positions:
+            logger.warning(f"Position already exists for {token_id[:16]}...")
+            return False
+
+        self.positions[token_id] = position
+        self.total_positions_opened += 1
+
+        logger.info(
+            f"Position opened: {token_id[:16]}... | {position.side} @ ${position.entry_price:.3f} | "
+            f"Size: ${position.size:.2f} | TP: ${position.take_profit_price or 0:.3f}"
+        )
+        return True
 
     async def update_position(
         self,
@@ -282,6 +306,11 @@ class PositionTracker:
         async with self._lock:
             return self.positions.get(token_id)
 
+    async def snapshot(self) -> Dict[str, Position]:
+        """Get a point-in-time copy of open positions keyed by token ID."""
+        async with self._lock:
+            return dict(self.positions)
+
     async def get_all_positions(self) -> List[Position]:
         """Get all open positions."""
         async with self._lock:
@@ -15,20 +15,69 @@ This is achieved by NEVER holding directional risk to resolution - either:
 """
 
 import asyncio
+import json
 import logging
+import re
+import sys
 import time
-from dataclasses import dataclass
-from datetime import datetime, timezone, timedelta
-from typing import Optional, List, Dict, Any, Tuple
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Optional, List, Dict, Any, Tuple, Set, FrozenSet
 
 import aiohttp
+import numpy as np
+import websockets
 
 from strategies.base_strategy import BaseStrategy
 from strategies.position_tracker import PositionTracker, Position
-from strategies.order_manager import OrderManager, OrderStatus
+from strategies.order_manager import OrderManager, OrderSpec, OrderStatus
 
 logger = logging.getLogger(__name__)
 
+# orjson is optional - decodes the float-heavy book/market payloads faster
+try:
+    import orjson
+    _json_loads = orjson.loads
+    ORJSON_AVAILABLE = True
+except ImportError:
+    _json_loads = json.loads
+    ORJSON_AVAILABLE = False
+
+# Question keywords identifying crypto markets, matched as substrings in a
+# single case-insensitive pass
+CRYPTO_KEYWORDS = ("bitcoin", "btc", "eth", "ethereum", "solana", "crypto")
+_CRYPTO_RE = re.compile("|".join(map(re.escape, CRYPTO_KEYWORDS)), re.IGNORECASE)
+
+# Markets expiring further out than this (seconds) are not traded
+MAX_EXPIRY_HORIZON_SECONDS = 2 * 3600
+
+# Open-position books younger than this (seconds) are reused as-is
+POSITION_BOOK_MAX_AGE = 0.5
+
+# Longest the position loop sleeps while holding positions without a push,
+# so HTTP price refresh still runs if the book stream is down
+POSITION_WAKE_MAX_SECONDS = 1.0
+
+# Order maintenance cadence, and the HTTP reconciliation interval used
+# while the user order stream is pushing state changes
+ORDER_SYNC_SECONDS = 5.0
+ORDER_DRIFT_SYNC_SECONDS = 60.0
+
+# Concurrent in-flight HTTP requests per host, kept under the venues'
+# per-IP rate limits so bursts queue locally instead of drawing 429s
+CLOB_MAX_CONCURRENT_REQUESTS = 20
+GAMMA_MAX_CONCURRENT_REQUESTS = 8
+
+
+def _parse_iso8601_to_epoch(value: str) -> float:
+    """Parse an ISO-8601 timestamp to UTC epoch seconds (naive means UTC)."""
+    if value[-1:] == "Z":
+        value = value[:-1] + "+00:00"
+    parsed = datetime.fromisoformat(value)
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed.timestamp()
+
 
 @dataclass
 class SpreadOpportunity:
@@ -60,6 +109,116 @@ class SpreadOpportunity:
     arbitrage_profit: Optional[float] = None  # If combined_cost < 1.0
 
 
+@dataclass
+class PriceTable:
+    """
+    Top-of-book cache stored as a struct of arrays.
+
+    Each token is assigned a fixed row on first sight; bid/ask/size/timestamp
+    live in contiguous float64 columns so freshness checks can be evaluated
+    across every tracked token in one vectorized pass. paired_idx holds the
+    row of each token's YES/NO counterpart (-1 if unpaired) so arbitrage
+    costs are a single gather. Columns grow by 2x when capacity is exhausted.
+    """
+
+    capacity: int = 128
+    index: Dict[str, int] = field(default_factory=dict)  # token_id -> row
+    tokens: List[str] = field(default_factory=list)  # row -> token_id
+
+    bid: np.ndarray = field(init=False, repr=False)
+    ask: np.ndarray = field(init=False, repr=False)
+    bid_size: np.ndarray = field(init=False, repr=False)
+    ask_size: np.ndarray = field(init=False, repr=False)
+    last_update: np.ndarray = field(init=False, repr=False)
+    paired_idx: np.ndarray = field(init=False, repr=False)
+
+    COLUMNS = ("bid", "ask", "bid_size", "ask_size", "last_update")
+
+    def __post_init__(self):
+        for name in self.COLUMNS:
+            setattr(self, name, np.zeros(self.capacity, dtype=np.float64))
+        self.paired_idx = np.full(self.capacity, -1, dtype=np.int32)
+
+    def __len__(self) -> int:
+        return len(self.index)
+
+    def __contains__(self, token_id: str) -> bool:
+        return token_id in self.index
+
+    def slot(self, token_id: str) -> int:
+        """Get the row for a token, assigning a new one if unseen."""
+        idx = self.index.get(token_id)
+        if idx is None:
+            idx = len(self.index)
+            if idx >= self.capacity:
+                self._grow()
+            self.index[token_id] = idx
+            self.tokens.append(token_id)
+        return idx
+
+    def pair(self, token_id: str, paired_token_id: str):
+        """Record two tokens as each other's counterpart."""
+        a = self.slot(token_id)
+        b = self.slot(paired_token_id)
+        self.paired_idx[a] = b
+        self.paired_idx[b] = a
+
+    def _grow(self):
+        """Double capacity, preserving existing rows."""
+        new_capacity = self.capacity * 2
+        for name in self.COLUMNS:
+            column = np.zeros(new_capacity, dtype=np.float64)
+            column[: self.capacity] = getattr(self, name)
+            setattr(self, name, column)
+        paired_idx = np.full(new_capacity, -1, dtype=np.int32)
+        paired_idx[: self.capacity] = self.paired_idx
+        self.paired_idx = paired_idx
+        self.capacity = new_capacity
+
+    def update(
+        self,
+        token_id: str,
+        bid: float,
+        ask: float,
+        bid_size: float,
+        ask_size: float,
+        now: Optional[float] = None,
+    ) -> int:
+        """Write top-of-book for a token and return its row."""
+        idx = self.slot(token_id)
+        self.bid[idx] = bid
+        self.ask[idx] = ask
+        self.bid_size[idx] = bid_size
+        self.ask_size[idx] = ask_size
+        self.last_update[idx] = time.time() if now is None else now
+        return idx
+
+    def update_quote(
+        self,
+        token_id: str,
+        bid: float,
+        ask: float,
+        now: Optional[float] = None,
+    ) -> int:
+        """Write best bid/ask for a token, keeping the last known sizes."""
+        idx = self.slot(token_id)
+        self.bid[idx] = bid
+        self.ask[idx] = ask
+        self.last_update[idx] = time.time() if now is None else now
+        return idx
+
+    def age(self, token_id: str, now: float) -> float:
+        """Seconds since a token was last updated (inf if never seen)."""
+        idx = self.index.get(token_id)
+        if idx is None:
+            return float("inf")
+        return now - self.last_update[idx]
+
+    def stale_mask(self, now: float, max_age: float) -> np.ndarray:
+        """Boolean mask over assigned rows that are older than max_age."""
+        return (now - self.last_update[: len(self.index)]) > max_age
+
+
 @dataclass
 class SpreadCaptureConfig:
     """Configuration for spread capture strategy."""
@@ -143,8 +302,25 @@ class SpreadCaptureStrategy(BaseStrategy):
 
         # Market data cache
         self.market_cache: Dict[str, Dict] = {}  # token_id -> market data
-        self.price_cache: Dict[str, Dict] = {}  # token_id -> {bid, ask, last_update}
-        self.paired_tokens: Dict[str, str] = {}  # token_id -> paired_token_id
+        self.prices = PriceTable()  # token_id -> row of top-of-book columns
+
+        # Tokens the book stream should be subscribed to
+        self._ws_assets: Set[str] = set()
+
+        # Wakes the position loop on held-token price pushes and new positions
+        self._position_event = asyncio.Event()
+        self._user_stream_live = False
+
+        # Shared HTTP session and per-host request caps
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._clob_sem = asyncio.BoundedSemaphore(CLOB_MAX_CONCURRENT_REQUESTS)
+        self._gamma_sem = asyncio.BoundedSemaphore(GAMMA_MAX_CONCURRENT_REQUESTS)
+
+        # Parsed Gamma market list, reused across scans until stale
+        self._markets_cache: List[Dict] = []
+        self._markets_cache_ts = 0.0
+        self._markets_cache_ttl = 30.0
+        self._markets_cache_rollover: Optional[float] = None  # soonest eligible expiry (epoch)
 
         # Scanning state
         self.last_scan_time = 0
@@ -159,6 +335,12 @@ class SpreadCaptureStrategy(BaseStrategy):
         self.starting_bankroll = config.starting_bankroll
         self.current_bankroll = config.starting_bankroll
 
+        # Sizing constants, fixed for the strategy's lifetime
+        self._position_size_pct = self.spread_config.position_size_pct
+        self._max_exposure_pct = self.spread_config.max_exposure_pct
+        self._max_position_cap = self.spread_config.max_position_usd  # 0 = no cap
+        self._max_exposure_cap = self.spread_config.max_total_exposure_usd  # 0 = no cap
+
         logger.info(
             f"SpreadCaptureStrategy initialized | "
             f"Min spread: {self.spread_config.min_spread_pct}% | "
@@ -179,19 +361,15 @@ class SpreadCaptureStrategy(BaseStrategy):
             Position size in USDC
         """
         # Update current bankroll with realized P&L
-        self.current_bankroll = self.starting_bankroll + self.position_tracker.total_realized_pnl
+        bankroll = self.starting_bankroll + self.position_tracker.total_realized_pnl
+        self.current_bankroll = bankroll
 
-        # Calculate percentage-based size
-        size = self.current_bankroll * self.spread_config.position_size_pct
-
-        # Apply hard cap if set
-        if self.spread_config.max_position_usd > 0:
-            size = min(size, self.spread_config.max_position_usd)
+        size = bankroll * self._position_size_pct
+        if self._max_position_cap > 0:
+            size = min(size, self._max_position_cap)
 
         # Minimum viable size
-        size = max(size, 1.0)
-
-        return size
+        return max(size, 1.0)
 
     def calculate_max_exposure(self) -> float:
         """
@@ -200,13 +378,12 @@ class SpreadCaptureStrategy(BaseStrategy):
         Returns:
             Max exposure in USDC
         """
-        self.current_bankroll = self.starting_bankroll + self.position_tracker.total_realized_pnl
+        bankroll = self.starting_bankroll + self.position_tracker.total_realized_pnl
+        self.current_bankroll = bankroll
 
-        exposure = self.current_bankroll * self.spread_config.max_exposure_pct
-
-        # Apply hard cap if set
-        if self.spread_config.max_total_exposure_usd > 0:
-            exposure = min(exposure, self.spread_config.max_total_exposure_usd)
+        exposure = bankroll * self._max_exposure_pct
+        if self._max_exposure_cap > 0:
+            exposure = min(exposure, self._max_exposure_cap)
 
         return exposure
 
@@ -227,6 +404,8 @@ class SpreadCaptureStrategy(BaseStrategy):
                 asyncio.create_task(self._market_scan_loop()),
                 asyncio.create_task(self._position_management_loop()),
                 asyncio.create_task(self._order_sync_loop()),
+                asyncio.create_task(self._ws_book_loop()),
+                asyncio.create_task(self._ws_user_loop()),
             ]
 
             # Wait for all tasks
@@ -247,10 +426,21 @@ class SpreadCaptureStrategy(BaseStrategy):
         cancelled = await self.order_manager.cancel_all()
         logger.info(f"Cancelled {cancelled} pending orders")
 
+        # Close HTTP session
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+            self._session = None
+
         # Log final stats
         metrics = self.get_strategy_metrics()
         logger.info(f"Final metrics: {metrics}")
 
+    async def _get_session(self) -> aiohttp.ClientSession:
+        """Get or create the reusable HTTP session."""
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession()
+        return self._session
+
     # =========================================================================
     # Market Scanning
     # =========================================================================
@@ -275,143 +465,289 @@ class SpreadCaptureStrategy(BaseStrategy):
         markets = await self._fetch_eligible_markets()
         self.markets_scanned = len(markets)
 
-        for market in markets:
-            token_id = market.get("token_id")
-            if not token_id:
-                continue
+        # One tracker read per scan; refreshed only after an execution
+        held = await self.position_tracker.snapshot()
+        total_exposure = sum(pos.size for pos in held.values())
 
-            # Check if we already have a position
-            existing = await self.position_tracker.get_position(token_id)
-            if existing:
-                continue
+        # Keep the book stream on every eligible and held token
+        self._ws_assets = {m["token_id"] for m in markets if m.get("token_id")}
+        self._ws_assets.update(held)
+
+        # Skip tokens we already hold
+        candidates = [
+            m for m in markets
+            if m.get("token_id") and m["token_id"] not in held
+        ]
+
+        if not candidates:
+            self.last_scan_time = now
+            return
+
+        prices = self.prices
+        rows = np.array([m["row"] for m in candidates], dtype=np.int64)
+        paired_rows = prices.paired_idx[rows].astype(np.int64)
 
-            # Check capacity (percentage-based)
-            current_exposure = await self.position_tracker.get_total_exposure()
-            max_exposure = self.calculate_max_exposure()
-            if current_exposure >= max_exposure:
+        # Refresh stale books for candidates (and their pairs) in one request
+        wanted = rows
+        if self.spread_config.enable_arbitrage:
+            wanted = np.union1d(rows, paired_rows[paired_rows >= 0])
+        stale_rows = wanted[now - prices.last_update[wanted] >= 1.0]
+        if len(stale_rows):
+            await self._fetch_orderbooks_batch([prices.tokens[r] for r in stale_rows])
+
+        hits, arb_mask = self._screen_opportunities(rows, paired_rows)
+
+        # Each YES/NO pair is checked for arbitrage once per scan
+        pairs_checked: Set[FrozenSet[str]] = set()
+
+        # Tokens held or already taken by an opportunity earlier in this scan
+        claimed = set(held)
+        slots = self.spread_config.max_concurrent_positions - len(held)
+        opportunities: List[SpreadOpportunity] = []
+
+        for i in hits:
+            token_id = candidates[i]["token_id"]
+            if token_id in claimed:
                 continue
 
-            positions = await self.position_tracker.get_all_positions()
-            if len(positions) >= self.spread_config.max_concurrent_positions:
+            paired_row = int(paired_rows[i]) if arb_mask[i] else -1
+            if paired_row >= 0 and prices.tokens[paired_row] in claimed:
+                paired_row = -1
+
+            opportunity = self._analyze_opportunity(
+                candidates[i],
+                row=int(rows[i]),
+                paired_row=paired_row,
+                pairs_checked=pairs_checked,
+            )
+
+            # Arbitrage takes a position slot per leg; a pair that doesn't
+            # fit may leave room for a single-leg opportunity further on
+            legs = 2 if opportunity.paired_token_id else 1
+            if legs > slots:
                 continue
+            slots -= legs
+
+            claimed.add(token_id)
+            if opportunity.paired_token_id:
+                claimed.add(opportunity.paired_token_id)
+            opportunities.append(opportunity)
+            if not slots:
+                break
 
-            # Analyze opportunity
-            opportunity = await self._analyze_opportunity(market)
-            if opportunity:
-                await self._execute_opportunity(opportunity)
+        if opportunities:
+            await self._execute_opportunities(opportunities, total_exposure)
 
         self.last_scan_time = now
 
-    async def _fetch_eligible_markets(self) -> List[Dict]:
-        """Fetch markets eligible for spread capture."""
-        from config import GAMMA_API
+    def _screen_opportunities(
+        self,
+        rows: np.ndarray,
+        paired_rows: np.ndarray,
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Vectorized spread and arbitrage screen over price-table rows.
 
-        now = datetime.now(timezone.utc)
-        min_expiry = now + timedelta(seconds=self.spread_config.no_entry_before_expiry_seconds)
-        max_expiry = now + timedelta(hours=2)
+        Args:
+            rows: Price-table row per candidate token (-1 if no book)
+            paired_rows: Row of each candidate's paired token (-1 if none)
 
-        async with aiohttp.ClientSession() as session:
-            url = f"{GAMMA_API}/markets"
-            params = {
-                "active": "true",
-                "closed": "false",
-                "limit": 100,
-            }
+        Returns:
+            (indices into rows passing the spread screen,
+             boolean mask aligned with rows marking arbitrage pairs)
+        """
+        has_book = rows >= 0
+        safe_rows = np.where(has_book, rows, 0)
+        bids = self.prices.bid[safe_rows]
+        asks = self.prices.ask[safe_rows]
+
+        spreads = (asks - bids) / np.maximum(bids, 1e-9) * 100
+        mask = (
+            has_book
+            & (bids > 0)
+            & (asks > 0)
+            & (spreads >= self.spread_config.min_spread_pct)
+            & (spreads <= self.spread_config.max_spread_pct)
+        )
 
-            try:
-                async with session.get(url, params=params) as response:
-                    if response.status != 200:
-                        return []
-
-                    markets = await response.json()
-                    eligible = []
-
-                    for market in markets:
-                        # Parse expiry
-                        end_date_str = market.get("endDate") or market.get("end_date_iso")
-                        if not end_date_str:
-                            continue
-
-                        try:
-                            end_date = datetime.fromisoformat(
-                                end_date_str.replace("Z", "+00:00")
-                            )
-                        except ValueError:
-                            continue
-
-                        # Filter by expiry window
-                        if not (min_expiry <= end_date <= max_expiry):
-                            continue
-
-                        # Filter by market type (crypto 15-min)
-                        question = market.get("question", "").lower()
-                        is_crypto = any(kw in question for kw in ["bitcoin", "btc", "eth", "ethereum", "solana", "crypto"])
-
-                        if "crypto" in self.spread_config.market_types and not is_crypto:
-                            continue
-
-                        # Extract tokens
-                        tokens = market.get("tokens", [])
-                        for token in tokens:
-                            token_id = token.get("token_id")
-                            outcome = token.get("outcome", "")
-
-                            if token_id:
-                                eligible.append({
-                                    "token_id": token_id,
-                                    "condition_id": market.get("conditionId", ""),
-                                    "question": market.get("question", ""),
-                                    "end_date": end_date,
-                                    "outcome": outcome,
-                                    "neg_risk": market.get("negRisk", False),
-                                    "tokens": tokens,
-                                })
-
-                                # Cache market and pair mapping
-                                self.market_cache[token_id] = market
-                                for other in tokens:
-                                    if other.get("token_id") != token_id:
-                                        self.paired_tokens[token_id] = other.get("token_id")
-
-                    return eligible
+        if self.spread_config.enable_arbitrage:
+            has_pair = paired_rows >= 0
+            paired_asks = self.prices.ask[np.where(has_pair, paired_rows, 0)]
+            arb_mask = (
+                has_pair
+                & (paired_asks > 0)
+                & (asks + paired_asks < self.spread_config.max_arbitrage_cost)
+            )
+        else:
+            arb_mask = np.zeros(len(rows), dtype=bool)
 
-            except Exception as e:
-                logger.error(f"Failed to fetch markets: {e}")
+        return np.flatnonzero(mask), arb_mask
+
+    async def _fetch_eligible_markets(self) -> List[Dict]:
+        """
+        Fetch markets eligible for spread capture.
+
+        The parsed Gamma market list is cached for _markets_cache_ttl seconds
+        and only the expiry-window filter is re-applied on each scan. The cache
+        is dropped early once its soonest-expiring eligible market rolls out of
+        the entry window, since that is when the next bucket's market appears.
+        """
+        now = time.time()
+        min_expiry = now + self.spread_config.no_entry_before_expiry_seconds
+        max_expiry = now + MAX_EXPIRY_HORIZON_SECONDS
+
+        cache_age = now - self._markets_cache_ts
+        rolled_over = (
+            self._markets_cache_rollover is not None
+            and min_expiry > self._markets_cache_rollover
+        )
+        if cache_age >= self._markets_cache_ttl or rolled_over:
+            markets = await self._fetch_markets()
+            if markets is None:
                 return []
+            self._markets_cache = markets
+            self._markets_cache_ts = time.time()
+            self._markets_cache_rollover = min(
+                (
+                    m["end_epoch"] for m in markets
+                    if min_expiry <= m["end_epoch"] <= max_expiry
+                ),
+                default=None,
+            )
 
-    async def _analyze_opportunity(self, market: Dict) -> Optional[SpreadOpportunity]:
+        crypto_only = "crypto" in self.spread_config.market_types
+        eligible = []
+
+        for market in self._markets_cache:
+            # Filter by expiry window
+            if not (min_expiry <= market["end_epoch"] <= max_expiry):
+                continue
+
+            # Filter by market type (crypto 15-min)
+            if crypto_only and not market["is_crypto"]:
+                continue
+
+            for token in market["tokens"]:
+                token_id = token.get("token_id")
+                if token_id:
+                    eligible.append({
+                        "token_id": token_id,
+                        "row": self.prices.slot(token_id),
+                        "condition_id": market["condition_id"],
+                        "question": market["question"],
+                        "end_date": market["end_date"],
+                        "outcome": token.get("outcome", ""),
+                        "neg_risk": market["neg_risk"],
+                        "tokens": market["tokens"],
+                    })
+
+        return eligible
+
+    def invalidate_markets_cache(self):
+        """Force the next scan to refetch the market list."""
+        self._markets_cache_ts = 0.0
+        self._markets_cache_rollover = None
+
+    async def _fetch_markets(self) -> Optional[List[Dict]]:
         """
-        Analyze a market for spread capture opportunity.
+        Fetch and parse active markets from the Gamma API.
 
-        Args:
-            market: Market data dictionary
+        Expiry timestamps are parsed and the crypto keyword check is evaluated
+        once here so per-scan filtering is a comparison and a bool check.
 
         Returns:
-            SpreadOpportunity if opportunity found, None otherwise
+            List of parsed market dicts, or None if the fetch failed
         """
-        token_id = market["token_id"]
-        end_date = market.get("end_date")
+        from config import GAMMA_API
 
-        # Fetch current orderbook
-        book = await self._fetch_orderbook(token_id)
-        if not book:
-            return None
+        session = await self._get_session()
+        url = f"{GAMMA_API}/markets"
+        params = {
+            "active": "true",
+            "closed": "false",
+            "limit": 100,
+        }
 
-        bid = book.get("bid", 0)
-        ask = book.get("ask", 0)
+        try:
+            async with self._gamma_sem, session.get(url, params=params) as response:
+                if response.status != 200:
+                    return None
+
+                markets = _json_loads(await response.read())
+                parsed = []
+
+                for market in markets:
+                    # Parse expiry
+                    end_date_str = market.get("endDate") or market.get("end_date_iso")
+                    if not end_date_str:
+                        continue
+
+                    try:
+                        end_epoch = _parse_iso8601_to_epoch(end_date_str)
+                    except ValueError:
+                        continue
+
+                    question = market.get("question", "")
+                    tokens = market.get("tokens", [])
+
+                    parsed.append({
+                        "condition_id": market.get("conditionId", ""),
+                        "question": question,
+                        "end_epoch": end_epoch,
+                        "end_date": datetime.fromtimestamp(end_epoch, timezone.utc),
+                        "is_crypto": _CRYPTO_RE.search(question) is not None,
+                        "neg_risk": market.get("negRisk", False),
+                        "tokens": tokens,
+                    })
+
+                    # Intern token IDs so every cache, table row and order
+                    # keyed on them shares one string object per token
+                    token_ids = []
+                    for token in tokens:
+                        token_id = token.get("token_id")
+                        if token_id:
+                            token_id = token["token_id"] = sys.intern(token_id)
+                            token_ids.append(token_id)
+
+                    # Cache market and pair mapping
+                    for token_id in token_ids:
+                        self.market_cache[token_id] = market
+                    if len(token_ids) == 2:
+                        self.prices.pair(*token_ids)
+
+                return parsed
 
-        if bid <= 0 or ask <= 0:
+        except Exception as e:
+            logger.error(f"Failed to fetch markets: {e}")
             return None
 
-        # Calculate spread
-        spread = ask - bid
-        spread_pct = (spread / bid) * 100 if bid > 0 else 0
+    def _analyze_opportunity(
+        self,
+        market: Dict,
+        row: int,
+        paired_row: int = -1,
+        pairs_checked: Optional[Set[FrozenSet[str]]] = None,
+    ) -> SpreadOpportunity:
+        """
+        Build a spread capture opportunity for a screened market.
 
-        # Check spread criteria
-        if spread_pct < self.spread_config.min_spread_pct:
-            return None
-        if spread_pct > self.spread_config.max_spread_pct:
-            return None
+        Args:
+            market: Market data dictionary
+            row: Price-table row of the market's token
+            paired_row: Row of the paired token if the pair passed the
+                arbitrage screen, -1 otherwise
+            pairs_checked: Token pairs already evaluated for arbitrage this
+                scan; the pair is skipped if present and recorded otherwise
+
+        Returns:
+            SpreadOpportunity for the market
+        """
+        token_id = market["token_id"]
+        end_date = market.get("end_date")
+
+        bid = float(self.prices.bid[row])
+        ask = float(self.prices.ask[row])
+        spread_pct = (ask - bid) / bid * 100
 
         # Create opportunity
         opportunity = SpreadOpportunity(
@@ -427,27 +763,28 @@ class SpreadCaptureStrategy(BaseStrategy):
             exit_target=bid * (1 + self.spread_config.exit_target_pct / 100),
         )
 
-        # Check for arbitrage opportunity (buy both sides)
-        if self.spread_config.enable_arbitrage:
-            paired_token = self.paired_tokens.get(token_id)
-            if paired_token:
-                paired_book = await self._fetch_orderbook(paired_token)
-                if paired_book:
-                    paired_ask = paired_book.get("ask", 0)
-                    if paired_ask > 0:
-                        # Combined cost to own both sides
-                        combined = ask + paired_ask
-                        if combined < self.spread_config.max_arbitrage_cost:
-                            opportunity.paired_token_id = paired_token
-                            opportunity.paired_ask = paired_ask
-                            opportunity.combined_cost = combined
-                            opportunity.arbitrage_profit = 1.0 - combined
-                            self.arbitrage_opportunities += 1
-                            logger.info(
-                                f"[ARBITRAGE] {token_id[:16]}... | "
-                                f"YES: ${ask:.3f} + NO: ${paired_ask:.3f} = ${combined:.3f} | "
-                                f"Profit: ${opportunity.arbitrage_profit:.4f}"
-                            )
+        # Arbitrage: own both sides when combined cost < max_arbitrage_cost
+        paired_token = self.prices.tokens[paired_row] if paired_row >= 0 else None
+        if paired_token:
+            pair = frozenset((token_id, paired_token))
+            if pairs_checked is not None and pair in pairs_checked:
+                paired_token = None
+            elif pairs_checked is not None:
+                pairs_checked.add(pair)
+
+        if paired_token:
+            paired_ask = float(self.prices.ask[paired_row])
+            combined = ask + paired_ask
+            opportunity.paired_token_id = paired_token
+            opportunity.paired_ask = paired_ask
+            opportunity.combined_cost = combined
+            opportunity.arbitrage_profit = 1.0 - combined
+            self.arbitrage_opportunities += 1
+            if logger.isEnabledFor(logging.INFO):
+                logger.info(
+                    "[ARBITRAGE] %s... | YES: $%.3f + NO: $%.3f = $%.3f | Profit: $%.4f",
+                    token_id[:16], ask, paired_ask, combined, opportunity.arbitrage_profit,
+                )
 
         # Calculate expected profit for spread trade
         opportunity.expected_profit_pct = self.spread_config.exit_target_pct
@@ -455,151 +792,401 @@ class SpreadCaptureStrategy(BaseStrategy):
         self.opportunities_found += 1
         return opportunity
 
-    async def _fetch_orderbook(self, token_id: str) -> Optional[Dict]:
-        """Fetch current orderbook for a token."""
+    async def _fetch_orderbooks_batch(self, token_ids: List[str]) -> int:
+        """
+        Fetch orderbooks for several tokens in one request.
+
+        Args:
+            token_ids: Tokens to refresh
+
+        Returns:
+            Number of books written to the price table
+        """
         from config import CLOB_HOST
 
-        # Check cache (< 1 second old)
-        cached = self.price_cache.get(token_id)
-        if cached and time.time() - cached.get("last_update", 0) < 1.0:
-            return cached
+        session = await self._get_session()
+        url = f"{CLOB_HOST}/books"
+        payload = [{"token_id": token_id} for token_id in token_ids]
 
-        async with aiohttp.ClientSession() as session:
-            url = f"{CLOB_HOST}/book"
-            params = {"token_id": token_id}
+        try:
+            async with self._clob_sem, session.post(url, json=payload) as response:
+                if response.status != 200:
+                    return 0
 
-            try:
-                async with session.get(url, params=params) as response:
-                    if response.status != 200:
-                        return None
+                books = _json_loads(await response.read())
+                now = time.time()
+                updated = 0
 
-                    data = await response.json()
+                for data in books:
+                    token_id = data.get("asset_id")
+                    if token_id:
+                        self._store_book(token_id, data, now)
+                        updated += 1
 
-                    bids = data.get("bids", [])
-                    asks = data.get("asks", [])
+                return updated
 
-                    bid = float(bids[0].get("price", 0)) if bids else 0
-                    ask = float(asks[0].get("price", 0)) if asks else 0
+        except Exception as e:
+            logger.debug("Failed to fetch %d orderbooks: %s", len(token_ids), e)
+            return 0
+
+    def _store_book(self, token_id: str, data: Dict, now: Optional[float] = None) -> int:
+        """Write the top of a CLOB book response into the price table."""
+        bids = data.get("bids", [])
+        asks = data.get("asks", [])
+
+        return self.prices.update(
+            token_id,
+            bid=float(bids[0].get("price", 0)) if bids else 0.0,
+            ask=float(asks[0].get("price", 0)) if asks else 0.0,
+            bid_size=float(bids[0].get("size", 0)) if bids else 0.0,
+            ask_size=float(asks[0].get("size", 0)) if asks else 0.0,
+            now=now,
+        )
 
-                    result = {
-                        "bid": bid,
-                        "ask": ask,
-                        "last_update": time.time(),
-                        "bid_size": float(bids[0].get("size", 0)) if bids else 0,
-                        "ask_size": float(asks[0].get("size", 0)) if asks else 0,
-                    }
+    async def _ws_book_loop(self):
+        """Background loop streaming book updates into the price table."""
+        while self.running:
+            try:
+                await self._stream_books()
+            except asyncio.CancelledError:
+                break
+            except Exception as e:
+                logger.error(f"Book stream error: {e}")
+                await asyncio.sleep(5)
 
-                    self.price_cache[token_id] = result
-                    return result
+    async def _stream_books(self):
+        """
+        Subscribe to the CLOB market channel and apply book/price_change pushes.
+
+        Tokens added to _ws_assets by later scans are subscribed on the open
+        connection. HTTP fetches remain the cold-start and fallback path: a
+        token with a fresh streamed row is never refetched.
+        """
+        from config import CLOB_WS
+
+        ws_url = f"{CLOB_WS}market"
+
+        async with websockets.connect(ws_url, ping_interval=10) as ws:
+            logger.info(f"Book stream connected to {ws_url}")
+            subscribed: Set[str] = set()
+
+            while self.running:
+                pending = self._ws_assets - subscribed
+                if pending:
+                    await ws.send(json.dumps({
+                        "type": "subscribe",
+                        "channel": "market",
+                        "assets_ids": sorted(pending),
+                    }))
+                    subscribed |= pending
+
+                try:
+                    message = await asyncio.wait_for(ws.recv(), timeout=1.0)
+                except asyncio.TimeoutError:
+                    continue
+
+                try:
+                    data = _json_loads(message)
+                except ValueError as e:
+                    logger.warning(f"Book stream sent invalid JSON: {e}")
+                    continue
+
+                for event in data if isinstance(data, list) else (data,):
+                    self._handle_book_event(event)
+
+    async def _ws_user_loop(self):
+        """Background loop streaming our order updates into the order manager."""
+        if self.config.dry_run or not self.config.clob_api_key:
+            logger.info("User order stream disabled - order state is polled")
+            return
 
+        while self.running:
+            try:
+                await self._stream_user_orders()
+            except asyncio.CancelledError:
+                break
             except Exception as e:
-                logger.debug(f"Failed to fetch orderbook for {token_id[:16]}: {e}")
-                return None
+                logger.error(f"User order stream error: {e}")
+                await asyncio.sleep(5)
+            finally:
+                self._user_stream_live = False
+
+    async def _stream_user_orders(self):
+        """
+        Subscribe to the authenticated CLOB user channel.
+
+        Order events are applied to the order manager as they arrive, so
+        fills and cancels are visible without waiting for an HTTP sync.
+        """
+        from config import CLOB_WS
+
+        ws_url = f"{CLOB_WS}user"
+
+        async with websockets.connect(ws_url, ping_interval=10) as ws:
+            await ws.send(json.dumps({
+                "type": "user",
+                "markets": [],
+                "auth": {
+                    "apiKey": self.config.clob_api_key,
+                    "secret": self.config.clob_secret,
+                    "passphrase": self.config.clob_passphrase,
+                },
+            }))
+            self._user_stream_live = True
+            logger.info(f"User order stream connected to {ws_url}")
+
+            while self.running:
+                try:
+                    message = await asyncio.wait_for(ws.recv(), timeout=1.0)
+                except asyncio.TimeoutError:
+                    continue
+
+                try:
+                    data = _json_loads(message)
+                except ValueError as e:
+                    logger.warning(f"User order stream sent invalid JSON: {e}")
+                    continue
+
+                for event in data if isinstance(data, list) else (data,):
+                    await self.order_manager.apply_event(event)
+
+    def _handle_book_event(self, event: Dict):
+        """Apply a single market-channel event to the price table."""
+        msg_type = event.get("event_type") or event.get("type", "")
+
+        held = self.position_tracker.positions
+
+        if msg_type == "book":
+            token_id = event.get("asset_id")
+            if token_id:
+                self._store_book(token_id, event)
+                if token_id in held:
+                    self._position_event.set()
+
+        elif msg_type == "price_change":
+            for change in event.get("price_changes") or (event,):
+                token_id = change.get("asset_id")
+                best_bid = change.get("best_bid")
+                best_ask = change.get("best_ask")
+                if token_id and best_bid is not None and best_ask is not None:
+                    self.prices.update_quote(token_id, float(best_bid), float(best_ask))
+                    if token_id in held:
+                        self._position_event.set()
 
     # =========================================================================
     # Opportunity Execution
     # =========================================================================
 
-    async def _execute_opportunity(self, opp: SpreadOpportunity):
-        """Execute a spread capture opportunity."""
-        logger.info(
-            f"[SpreadCapture] Executing opportunity: {opp.token_id[:16]}... | "
-            f"Bid: ${opp.bid:.3f} | Ask: ${opp.ask:.3f} | Spread: {opp.spread_pct:.1f}%"
-        )
-
-        # Determine position size (percentage-based for compounding)
-        position_size = self.calculate_position_size()
-        current_exposure = await self.position_tracker.get_total_exposure()
-        max_exposure = self.calculate_max_exposure()
-        available_exposure = max_exposure - current_exposure
+    async def _execute_opportunities(
+        self,
+        opps: List[SpreadOpportunity],
+        current_exposure: float,
+    ) -> int:
+        """
+        Size a scan's opportunities and place them as one batch order.
 
-        size = min(position_size, available_exposure)
+        Arbitrage legs are submitted in the same batch as their primary;
+        if either leg is rejected the surviving one is cancelled and no
+        position is opened for that opportunity.
 
-        if size < 1:  # Minimum viable position
-            logger.debug(f"Position size too small: ${size:.2f}")
-            return
-
-        logger.info(
-            f"[SpreadCapture] Position sizing: ${size:.2f} "
-            f"({self.spread_config.position_size_pct*100:.0f}% of ${self.current_bankroll:.2f} bankroll)"
-        )
+        Args:
+            opps: Opportunities in priority order
+            current_exposure: Exposure held when the scan started
 
-        # Place limit buy at bid price
-        order_id = await self.order_manager.place_buy(
-            token_id=opp.token_id,
-            side=opp.side,
-            price=opp.bid,
-            size=size,
-            metadata={
-                "opportunity_type": "arbitrage" if opp.arbitrage_profit else "spread",
-                "spread_pct": opp.spread_pct,
-                "exit_target": opp.exit_target,
-            },
+        Returns:
+            Number of opportunities executed
+        """
+        legs = np.array([2 if opp.paired_token_id else 1 for opp in opps])
+        sizes = self._allocate_sizes(
+            self.calculate_position_size(),
+            self.calculate_max_exposure() - current_exposure,
+            legs,
         )
 
-        if not order_id:
-            logger.warning(f"Failed to place buy order for {opp.token_id[:16]}...")
-            return
-
-        # Track position (pending fill)
-        await self.position_tracker.add_position(
-            token_id=opp.token_id,
-            side=opp.side,
-            entry_price=opp.bid,
-            size=size,
-            take_profit_price=opp.exit_target,
-            stop_loss_price=opp.bid * (1 - self.spread_config.stop_loss_pct / 100),
-            max_hold_seconds=self.spread_config.max_hold_seconds,
-            order_id=order_id,
-            market_question=opp.market_question,
-            market_expiry=opp.market_expiry,
-        )
+        # Drop opportunities below the minimum viable position
+        keep = np.flatnonzero(sizes >= 1)
+        if len(keep) < len(opps):
+            logger.debug("%d opportunities below minimum position size", len(opps) - len(keep))
+        if not len(keep):
+            return 0
+        opps = [opps[i] for i in keep]
+        sizes = sizes[keep]
+        legs = legs[keep]
+
+        for opp, size in zip(opps, sizes):
+            logger.info(
+                "[SpreadCapture] Executing opportunity: %s... | Bid: $%.3f | Ask: $%.3f | "
+                "Spread: %.1f%% | Size: $%.2f",
+                opp.token_id[:16], opp.bid, opp.ask, opp.spread_pct, size,
+            )
 
-        self.spread_trades_executed += 1
+        order_ids = await self.order_manager.place_batch_buy(self._build_order_specs(opps, sizes))
 
-        # If arbitrage opportunity, also buy the paired side
-        if opp.arbitrage_profit and opp.paired_token_id:
-            paired_order = await self.order_manager.place_buy(
-                token_id=opp.paired_token_id,
-                side="NO" if opp.side == "YES" else "YES",
-                price=opp.paired_ask,
-                size=size,
-                metadata={"opportunity_type": "arbitrage_pair"},
-            )
+        now = time.time()
+        positions: List[Position] = []
+        leftover: List[str] = []
+        executed = 0
+        offset = 0
+
+        for opp, size, n in zip(opps, sizes, legs):
+            ids = order_ids[offset:offset + n]
+            offset += n
+
+            if not all(ids):
+                leftover.extend(oid for oid in ids if oid)
+                if n == 2:
+                    logger.warning(
+                        "Arbitrage batch incomplete for %s... - cancelled %d leg(s)",
+                        opp.token_id[:16], sum(1 for oid in ids if oid),
+                    )
+                else:
+                    logger.warning("Failed to place buy order for %s...", opp.token_id[:16])
+                continue
 
-            if paired_order:
-                await self.position_tracker.add_position(
+            positions.append(Position(
+                token_id=opp.token_id,
+                side=opp.side,
+                entry_price=opp.bid,
+                size=float(size),
+                entry_time=now,
+                take_profit_price=opp.exit_target,
+                stop_loss_price=opp.bid * (1 - self.spread_config.stop_loss_pct / 100),
+                max_hold_seconds=self.spread_config.max_hold_seconds,
+                current_price=opp.bid,
+                order_id=ids[0],
+                market_question=opp.market_question,
+                market_expiry=opp.market_expiry,
+            ))
+            if n == 2:
+                positions.append(Position(
                     token_id=opp.paired_token_id,
-                    side="NO" if opp.side == "YES" else "YES",
+                    side=self._paired_side(opp.side),
                     entry_price=opp.paired_ask,
-                    size=size,
+                    size=float(size),
+                    entry_time=now,
                     max_hold_seconds=self.spread_config.max_hold_seconds,
-                    order_id=paired_order,
+                    current_price=opp.paired_ask,
+                    order_id=ids[1],
                     market_question=opp.market_question,
                     market_expiry=opp.market_expiry,
-                )
+                ))
 
-        logger.info(
-            f"[SpreadCapture] Order placed: {order_id} | "
-            f"{opp.side} @ ${opp.bid:.3f} x ${size:.2f}"
-        )
+            executed += 1
+            logger.info(
+                "[SpreadCapture] Order placed: %s | %s @ $%.3f x $%.2f",
+                ids[0], opp.side, opp.bid, size,
+            )
+
+        if leftover:
+            await self.order_manager.cancel_orders(leftover)
+
+        if positions:
+            await self.position_tracker.add_positions(positions)
+            self.spread_trades_executed += executed
+            self._position_event.set()
+
+        return executed
+
+    @staticmethod
+    def _allocate_sizes(position_size: float, available: float, legs: np.ndarray) -> np.ndarray:
+        """
+        Per-leg sizes for opportunities filled in order from an exposure budget.
+
+        Each opportunity asks for position_size on every leg; once the budget
+        runs out the next one gets the remainder and the rest get zero.
+        """
+        requested = position_size * legs
+        spent_before = np.minimum(np.cumsum(requested) - requested, max(available, 0.0))
+        return np.clip((available - spent_before) / legs, 0.0, position_size)
+
+    def _build_order_specs(self, opps: List[SpreadOpportunity], sizes: np.ndarray) -> List[OrderSpec]:
+        """Buy orders for each opportunity, arbitrage legs adjacent to their primary."""
+        specs: List[OrderSpec] = []
+
+        for opp, size in zip(opps, sizes):
+            size = float(size)
+            specs.append(OrderSpec(
+                token_id=opp.token_id,
+                side=opp.side,
+                price=opp.bid,
+                size=size,
+                metadata={
+                    "opportunity_type": "arbitrage" if opp.arbitrage_profit else "spread",
+                    "spread_pct": opp.spread_pct,
+                    "exit_target": opp.exit_target,
+                },
+            ))
+            if opp.paired_token_id:
+                specs.append(OrderSpec(
+                    token_id=opp.paired_token_id,
+                    side=self._paired_side(opp.side),
+                    price=opp.paired_ask,
+                    size=size,
+                    metadata={"opportunity_type": "arbitrage_pair"},
+                ))
+
+        return specs
+
+    @staticmethod
+    def _paired_side(side: str) -> str:
+        """Outcome on the other side of a YES/NO pair."""
+        return "NO" if side == "YES" else "YES"
 
     # =========================================================================
     # Position Management
     # =========================================================================
 
     async def _position_management_loop(self):
-        """Background loop to manage open positions."""
+        """
+        Background loop to manage open positions.
+
+        Sleeps until a held token's price is pushed, a position is added, or
+        the next max-hold/pre-expiry deadline is due, whichever comes first.
+        """
         while self.running:
             try:
+                self._position_event.clear()
                 await self._manage_positions()
-                await asyncio.sleep(1)  # Check every second
+
+                timeout = self._next_deadline_delay(
+                    await self.position_tracker.get_all_positions()
+                )
+                try:
+                    await asyncio.wait_for(self._position_event.wait(), timeout=timeout)
+                except asyncio.TimeoutError:
+                    pass
             except asyncio.CancelledError:
                 break
             except Exception as e:
                 logger.error(f"Position management error: {e}")
                 await asyncio.sleep(1)
 
+    def _next_deadline_delay(self, positions: List[Position]) -> Optional[float]:
+        """
+        Seconds until the next time-based exit is due.
+
+        Returns:
+            Delay capped at POSITION_WAKE_MAX_SECONDS, or None (wait for an
+            event only) when there are no positions
+        """
+        if not positions:
+            return None
+
+        now = time.time()
+        delay = POSITION_WAKE_MAX_SECONDS
+
+        for pos in positions:
+            delay = min(delay, pos.entry_time + pos.max_hold_seconds - now)
+
+            time_to_expiry = pos.time_to_market_expiry
+            if time_to_expiry is not None:
+                delay = min(
+                    delay,
+                    time_to_expiry - self.spread_config.exit_before_expiry_seconds,
+                )
+
+        return max(delay, 0.0)
+
     async def _manage_positions(self):
         """Check positions for exit conditions."""
         # Get positions needing exit
@@ -610,65 +1197,95 @@ class SpreadCaptureStrategy(BaseStrategy):
         for position, reason in needs_exit:
             await self._exit_position(position, reason)
 
-        # Update prices for all positions
+        # Update prices for all positions, refetching only books older than
+        # POSITION_BOOK_MAX_AGE in a single batched request
         positions = await self.position_tracker.get_all_positions()
+        if not positions:
+            return
+
+        now = time.time()
+        stale = [
+            pos.token_id for pos in positions
+            if self.prices.age(pos.token_id, now) > POSITION_BOOK_MAX_AGE
+        ]
+        if stale:
+            await self._fetch_orderbooks_batch(stale)
+
         for pos in positions:
-            book = await self._fetch_orderbook(pos.token_id)
-            if book:
-                # For selling, we look at bid (what we can sell at)
-                current_price = book.get("bid", 0)
-                await self.position_tracker.update_position(
-                    pos.token_id,
-                    current_price=current_price,
-                )
+            # Skip books the batch failed to refresh
+            if self.prices.age(pos.token_id, now) > POSITION_BOOK_MAX_AGE:
+                continue
+
+            # For selling, we look at bid (what we can sell at)
+            current_price = float(self.prices.bid[self.prices.index[pos.token_id]])
+            await self.position_tracker.update_position(
+                pos.token_id,
+                current_price=current_price,
+            )
 
     async def _exit_position(self, position: Position, reason: str):
         """Exit a position."""
         logger.info(
-            f"[SpreadCapture] Exiting position: {position.token_id[:16]}... | "
-            f"Reason: {reason} | P&L: ${position.unrealized_pnl:.2f}"
+            "[SpreadCapture] Exiting position: %s... | Reason: %s | P&L: $%.2f",
+            position.token_id[:16], reason, position.unrealized_pnl,
         )
 
-        # Cancel any pending orders for this market
-        await self.order_manager.cancel_all_for_market(position.token_id)
+        if position.current_price <= 0:
+            # No price to sell at - just pull any pending orders
+            await self.order_manager.cancel_all_for_market(position.token_id)
+            return
 
-        # Place market sell order
-        if position.current_price > 0:
-            order_id = await self.order_manager.place_sell(
+        # Replace pending orders for this market with the exit sell
+        cancel_ids = await self.order_manager.get_active_order_ids(position.token_id)
+        order_id = await self.order_manager.cancel_and_place(
+            cancel_ids,
+            OrderSpec(
                 token_id=position.token_id,
                 side=position.side,
                 price=position.current_price * 0.99,  # Slightly below bid for quick fill
                 size=position.size,
                 metadata={"exit_reason": reason},
+            ),
+        )
+
+        if order_id:
+            # Close position in tracker
+            closed = await self.position_tracker.close_position(
+                position.token_id,
+                exit_price=position.current_price,
+                reason=reason,
             )
 
-            if order_id:
-                # Close position in tracker
-                closed = await self.position_tracker.close_position(
-                    position.token_id,
-                    exit_price=position.current_price,
-                    reason=reason,
+            if closed:
+                self.total_profit += closed.unrealized_pnl
+                logger.info(
+                    "[SpreadCapture] Position closed: %s... | Realized P&L: $%.2f",
+                    position.token_id[:16], closed.unrealized_pnl,
                 )
 
-                if closed:
-                    self.total_profit += closed.unrealized_pnl
-                    logger.info(
-                        f"[SpreadCapture] Position closed: {position.token_id[:16]}... | "
-                        f"Realized P&L: ${closed.unrealized_pnl:.2f}"
-                    )
-
     # =========================================================================
     # Order Sync
     # =========================================================================
 
     async def _order_sync_loop(self):
-        """Background loop to sync orders with exchange."""
+        """
+        Background loop to sync orders with exchange.
+
+        While the user order stream is live, HTTP sync only corrects drift
+        every ORDER_DRIFT_SYNC_SECONDS; otherwise it runs every pass.
+        """
+        last_sync = 0.0
+
         while self.running:
             try:
                 # Sync order states
-                changes = await self.order_manager.sync_with_exchange()
-                if changes > 0:
-                    logger.debug(f"Order sync: {changes} changes detected")
+                interval = ORDER_DRIFT_SYNC_SECONDS if self._user_stream_live else ORDER_SYNC_SECONDS
+                now = time.time()
+                if now - last_sync >= interval:
+                    last_sync = now
+                    changes = await self.order_manager.sync_with_exchange()
+                    if changes > 0:
+                        logger.debug("Order sync: %d changes detected", changes)
 
                 # Cancel stale orders
                 stale = await self.order_manager.cancel_stale_orders()
@@ -678,7 +1295,7 @@ class SpreadCaptureStrategy(BaseStrategy):
                 # Cleanup old completed orders
                 await self.order_manager.cleanup_completed()
 
-                await asyncio.sleep(5)  # Sync every 5 seconds
+                await asyncio.sleep(ORDER_SYNC_SECONDS)
 
             except asyncio.CancelledError:
                 break
@@ -0,0 +1,53 @@
+"""
+Shared pytest configuration for the test suite.
+"""
+
+import asyncio
+import os
+import sys
+
+import pytest_asyncio
+
+try:
+    import uvloop
+    UVLOOP_AVAILABLE = sys.platform != "win32"
+except ImportError:
+    UVLOOP_AVAILABLE = False
+
+
+@pytest_asyncio.fixture(scope="module", loop_scope="module")
+async def redis_pool():
+    """
+    Redis ConnectionPool shared by a module's stores, or None.
+
+    Set TEST_REDIS_URL (e.g. redis://localhost:6379/15) to run the storage
+    tests against a live Redis.
+    """
+    url = os.environ.get("TEST_REDIS_URL")
+    if not url:
+        yield None
+        return
+
+    import redis.asyncio as aioredis
+
+    pool = aioredis.ConnectionPool.from_url(url, decode_responses=True)
+    yield pool
+    await pool.disconnect()
+
+
+def pytest_addoption(parser):
+    parser.addoption(
+        "--uvloop",
+        action="store_true",
+        default=False,
+        help="run async tests on uvloop (pytest-timeout cannot interrupt a hung test there)",
+    )
+
+
+def pytest_asyncio_loop_factories(config, item):
+    """Event loop for async tests: uvloop with --uvloop, else the default asyncio loop"""
+    if config.getoption("--uvloop"):
+        if not UVLOOP_AVAILABLE:
+            raise RuntimeError("--uvloop given but uvloop is not installed")
+        return {"uvloop": uvloop.new_event_loop}
+    return {"asyncio": asyncio.new_event_loop}
@@ -18,8 +18,11 @@ Integration scenarios verify:
 
 import pytest
 import asyncio
+import dataclasses
+import time
+import inspect
 from datetime import datetime, timedelta, timezone
-from typing import List, Tuple
+from typing import List, Optional, Tuple
 
 # Core modules
 from core.market_state import Market, MarketState, SchedulerConfig, MarketStateMachine
@@ -52,15 +55,19 @@ from metrics import (
     TradeMetrics,
 )
 
+# All tests share one event loop; fixtures are function-scoped and hold no
+# loop-bound state between tests
+pytestmark = pytest.mark.asyncio(loop_scope="module")
+
 
 # ============================================================================
 # FIXTURES
 # ============================================================================
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def mock_config():
-    """Return test configuration for all modules"""
+    """Return test configuration for all modules (shared; treat as read-only)"""
     return {
         "scheduler": SchedulerConfig(
             time_to_eligibility_sec=60,
@@ -99,21 +106,30 @@ def mock_config():
 
 
 @pytest.fixture
-def state_machine(mock_config):
-    """Initialize MarketStateMachine for tests"""
-    return MarketStateMachine(mock_config["scheduler"])
+def state_machine(request, mock_config):
+    """
+    Initialize MarketStateMachine for tests.
+
+    Scheduler settings can be overridden per test with indirect
+    parametrization, e.g. ``{"stale_feed_threshold_ms": 100}``.
+    """
+    overrides = getattr(request, "param", {})
+    return MarketStateMachine(dataclasses.replace(mock_config["scheduler"], **overrides))
+
+
+def _make_risk_manager(cfg: dict, bankroll: float = 10000.0) -> RiskManager:
+    """Build a fresh RiskManager stack from the test configuration"""
+    return RiskManager(
+        KillSwitchManager(cfg["kill_switches"]),
+        CircuitBreakerRegistry(cfg["circuit_breakers"]),
+        ExposureManager(cfg["exposure"], initial_bankroll=bankroll),
+    )
 
 
 @pytest.fixture
 def risk_manager(mock_config):
-    """Initialize full RiskManager stack"""
-    kill_switches = KillSwitchManager(mock_config["kill_switches"])
-    circuit_breakers = CircuitBreakerRegistry(mock_config["circuit_breakers"])
-    exposure = ExposureManager(
-        mock_config["exposure"],
-        initial_bankroll=10000.0,
-    )
-    return RiskManager(kill_switches, circuit_breakers, exposure)
+    """Initialize full RiskManager stack (fresh per test)"""
+    return _make_risk_manager(mock_config)
 
 
 @pytest.fixture
@@ -130,31 +146,114 @@ def metrics_collector(mock_config):
     return MetricsCollector(mock_config["metrics"])
 
 
+@pytest.fixture
+def now():
+    """Single UTC timestamp shared by everything a test builds"""
+    return datetime.now(timezone.utc)
+
+
+@pytest.fixture
+def now_ns():
+    """Monotonic timestamp for feed-freshness checks"""
+    return time.monotonic_ns()
+
+
+# Defaults for recorded trades: attempted but unfilled
+_DEFAULT_TRADE = dict(
+    attempted=True,
+    filled=False,
+    fill_amount=0.0,
+    expected_payout=1.0,
+    outcome_reason="no_liquidity",
+)
+
+
+def _make_trade(market_id: str, timestamp: Optional[datetime] = None, **overrides) -> TradeMetrics:
+    """Helper to create trade metrics, overriding the test defaults"""
+    return TradeMetrics(
+        timestamp=timestamp or datetime.now(timezone.utc),
+        market_id=market_id,
+        **{**_DEFAULT_TRADE, **overrides},
+    )
+
+
+# Trade scenarios for test_metrics_collection (_make_trade kwargs per trade)
+TRADING_CYCLE_TRADES = [
+    dict(
+        market_id="market_1",
+        filled=True,
+        fill_amount=50.0,
+        tick_to_decision_ms=10.0,
+        decision_to_order_ms=5.0,
+        order_to_ack_ms=20.0,
+        total_latency_ms=35.0,
+        entry_price=0.51,
+        edge_cents=49.0,
+        actual_pnl=50.0,
+        outcome_reason="filled",
+    ),
+    dict(market_id="market_2", tick_to_decision_ms=15.0, decision_to_order_ms=3.0, total_latency_ms=18.0),
+]
+LARGER_FILL_TRADES = [
+    dict(
+        market_id="market_1",
+        filled=True,
+        fill_amount=100.0,
+        tick_to_decision_ms=15.0,
+        decision_to_order_ms=5.0,
+        order_to_ack_ms=20.0,
+        total_latency_ms=40.0,
+        entry_price=0.50,
+        edge_cents=50.0,
+        actual_pnl=50.0,
+        outcome_reason="filled",
+    ),
+    dict(market_id="market_2", tick_to_decision_ms=25.0, decision_to_order_ms=5.0, total_latency_ms=30.0),
+]
+ONE_OF_TWO_FILLED = dict(attempted=2, filled=1, fill_rate=0.5, pnl=50.0)
+
+
 def _create_test_market(
     token_id: str = "test_token",
     minutes_to_expiry: int = 5,
+    now: Optional[datetime] = None,
 ) -> Market:
-    """Helper to create a test market"""
+    """Helper to create a test market (now is naive UTC, as Market expects)"""
     return Market(
         token_id=token_id,
         condition_id=f"cond_{token_id}",
         question=f"Test market {token_id}",
-        end_time=datetime.utcnow() + timedelta(minutes=minutes_to_expiry),
+        end_time=(now or datetime.utcnow()) + timedelta(minutes=minutes_to_expiry),
     )
 
 
+async def wait_until(predicate, timeout: float = 2.0, interval: float = 0.02) -> bool:
+    """Poll a sync or async predicate until it is truthy or timeout elapses"""
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + timeout
+    while True:
+        result = predicate()
+        if inspect.isawaitable(result):
+            result = await result
+        if result:
+            return True
+        if loop.time() >= deadline:
+            return False
+        await asyncio.sleep(interval)
+
+
 # ============================================================================
 # TEST 1: FULL TRADING CYCLE
 # ============================================================================
 
 
-@pytest.mark.asyncio
-async def test_full_trading_cycle(state_machine, risk_manager, capital_system, metrics_collector):
+async def test_full_trading_cycle_orchestration(state_machine, risk_manager, capital_system, now_ns):
     """
     Test complete market lifecycle:
     DISCOVERED → WATCHING → ELIGIBLE → EXECUTING → RECONCILING → DONE
 
-    With capital allocation and metrics tracking.
+    With capital allocation and risk checks. Metrics aggregation for the
+    same trades is covered by test_metrics_collection.
     """
     allocator, recycler = capital_system
 
@@ -183,11 +282,10 @@ async def test_full_trading_cycle(state_machine, risk_manager, capital_system, m
     assert allocation.amount == 50.0
 
     # Step 4: Check risk approval
-    feed_time = datetime.now(timezone.utc)
     can_execute, reason = await risk_manager.pre_execution_check(
         market_id="market_1",
         amount=50.0,
-        feed_last_update=feed_time,
+        feed_last_update_ns=now_ns,
     )
     assert can_execute, reason
 
@@ -211,45 +309,7 @@ async def test_full_trading_cycle(state_machine, risk_manager, capital_system, m
         # The capital allocation and risk check were already done successfully above
         # So the trading cycle validation is complete
 
-    # Step 6: Record trade metrics
-    trade_metric = TradeMetrics(
-        timestamp=datetime.now(timezone.utc),
-        market_id="market_1",
-        attempted=True,
-        filled=True,
-        fill_amount=50.0,
-        tick_to_decision_ms=10.0,
-        decision_to_order_ms=5.0,
-        order_to_ack_ms=20.0,
-        total_latency_ms=35.0,
-        entry_price=0.51,
-        expected_payout=1.0,
-        edge_cents=49.0,
-        actual_pnl=50.0,
-        outcome_reason="filled",
-    )
-    await metrics_collector.record_trade(trade_metric)
-
-    # Record a second trade for metrics testing
-    trade_metric2 = TradeMetrics(
-        timestamp=datetime.now(timezone.utc),
-        market_id="market_2",
-        attempted=True,
-        filled=False,
-        fill_amount=0.0,
-        tick_to_decision_ms=15.0,
-        decision_to_order_ms=3.0,
-        order_to_ack_ms=0.0,
-        total_latency_ms=18.0,
-        entry_price=0.0,
-        expected_payout=1.0,
-        edge_cents=0.0,
-        actual_pnl=0.0,
-        outcome_reason="no_liquidity",
-    )
-    await metrics_collector.record_trade(trade_metric2)
-
-    # Step 7: Record P&L in risk manager
+    # Step 6: Record P&L in risk manager
     pnl = 50.0
     await risk_manager.post_execution_record(
         market_id="market_1",
@@ -258,38 +318,13 @@ async def test_full_trading_cycle(state_machine, risk_manager, capital_system, m
         latency_ms=35.0,
     )
 
-    # Step 8: Verify metrics aggregation
-    attempted, filled = await metrics_collector.get_current_trades()
-    fill_rate = await metrics_collector.get_current_fill_rate()
-    current_pnl = await metrics_collector.get_current_pnl()
-    latency_stats = await metrics_collector.get_latency_stats()
-
-    # Verify fill rate: 1 filled / 2 attempted = 50%
-    assert attempted == 2
-    assert filled == 1
-    assert fill_rate == 0.5
-
-    # Verify P&L: 50
-    assert current_pnl == 50.0
-
-    # Verify latency tracking exists
-    assert latency_stats["p95_decision_ms"] > 0
-    assert latency_stats["p95_order_ack_ms"] >= 0
-
-    # Verify capital allocation worked
-    assert allocated_amount == 50.0
-
-    # Verify risk controls passed
-    assert can_execute is True
-
 
 # ============================================================================
 # TEST 2: RISK CONTROLS BLOCK TRADE
 # ============================================================================
 
 
-@pytest.mark.asyncio
-async def test_risk_controls_block_trade(mock_config):
+async def test_risk_controls_block_trade(risk_manager, now_ns):
     """
     Verify risk controls prevent execution when risk threshold exceeded.
 
@@ -298,22 +333,16 @@ async def test_risk_controls_block_trade(mock_config):
     2. Verify trade is blocked
     3. Recovery with fresh feed
     """
-    # Create a fresh risk manager for this test
-    kill_switches = KillSwitchManager(mock_config["kill_switches"])
-    circuit_breakers = CircuitBreakerRegistry(mock_config["circuit_breakers"])
-    exposure = ExposureManager(
-        mock_config["exposure"],
-        initial_bankroll=10000.0,
-    )
-    risk = RiskManager(kill_switches, circuit_breakers, exposure)
+    risk = risk_manager
+    kill_switches = risk.kill_switches
 
     # Test 1: Trigger stale feed kill switch with a stale timestamp
-    stale_time = datetime.now(timezone.utc) - timedelta(milliseconds=700)
+    stale_ns = now_ns - 700_000_000
 
     can_execute_stale, reason_stale = await risk.pre_execution_check(
         market_id="market_2",
         amount=50.0,
-        feed_last_update=stale_time,
+        feed_last_update_ns=stale_ns,
     )
     # Verify stale feed was detected and blocked
     assert not can_execute_stale, "Stale feed should block execution"
@@ -325,8 +354,7 @@ async def test_risk_controls_block_trade(mock_config):
 
     # Test 3: Fresh feed detection works
     # Directly test the kill switch behavior independently
-    fresh_time = datetime.now(timezone.utc)
-    await kill_switches.check_stale_feed(fresh_time)
+    await kill_switches.check_stale_feed(time.monotonic_ns())
     assert not kill_switches.is_trading_halted(), "Fresh feed should clear the kill switch"
 
     # Test 4: Verify trading is resumed after fresh feed
@@ -339,7 +367,6 @@ async def test_risk_controls_block_trade(mock_config):
 # ============================================================================
 
 
-@pytest.mark.asyncio
 async def test_capital_limits_enforced(capital_system):
     """
     Verify capital allocation respects limits.
@@ -385,8 +412,7 @@ async def test_capital_limits_enforced(capital_system):
 # ============================================================================
 
 
-@pytest.mark.asyncio
-async def test_circuit_breaker_isolation(mock_config):
+async def test_circuit_breaker_isolation(risk_manager):
     """
     Verify circuit breaker isolates failing markets.
 
@@ -397,14 +423,7 @@ async def test_circuit_breaker_isolation(mock_config):
     4. Wait for recovery timeout
     5. Verify market A can recover
     """
-    # Create risk manager with test config
-    kill_switches = KillSwitchManager(mock_config["kill_switches"])
-    circuit_breakers = CircuitBreakerRegistry(mock_config["circuit_breakers"])
-    exposure = ExposureManager(
-        mock_config["exposure"],
-        initial_bankroll=10000.0,
-    )
-    risk = RiskManager(kill_switches, circuit_breakers, exposure)
+    risk = risk_manager
 
     market_a = "market_a"
     market_b = "market_b"
@@ -434,56 +453,28 @@ async def test_circuit_breaker_isolation(mock_config):
 # ============================================================================
 
 
-@pytest.mark.asyncio
-async def test_metrics_collection(metrics_collector):
+@pytest.mark.parametrize(
+    "trades,expected",
+    [
+        (TRADING_CYCLE_TRADES, ONE_OF_TWO_FILLED),
+        (LARGER_FILL_TRADES, ONE_OF_TWO_FILLED),
+    ],
+    ids=["trading_cycle", "larger_fill"],
+)
+async def test_metrics_collection(metrics_collector, now, trades, expected):
     """
     Verify metrics collection and aggregation.
 
     Scenario:
-    1. Execute mock trades
+    1. Record mock trades
     2. Verify fill rate calculation
     3. Verify P&L tracking
     4. Verify latency percentiles
     """
     collector = metrics_collector
 
-    # Record successful trade
-    trade_1 = TradeMetrics(
-        timestamp=datetime.now(timezone.utc),
-        market_id="market_1",
-        attempted=True,
-        filled=True,
-        fill_amount=100.0,
-        tick_to_decision_ms=15.0,
-        decision_to_order_ms=5.0,
-        order_to_ack_ms=20.0,
-        total_latency_ms=40.0,
-        entry_price=0.50,
-        expected_payout=1.0,
-        edge_cents=50.0,
-        actual_pnl=50.0,
-        outcome_reason="filled",
-    )
-    await collector.record_trade(trade_1)
-
-    # Record unsuccessful trade
-    trade_2 = TradeMetrics(
-        timestamp=datetime.now(timezone.utc),
-        market_id="market_2",
-        attempted=True,
-        filled=False,
-        fill_amount=0.0,
-        tick_to_decision_ms=25.0,
-        decision_to_order_ms=5.0,
-        order_to_ack_ms=0.0,
-        total_latency_ms=30.0,
-        entry_price=0.0,
-        expected_payout=1.0,
-        edge_cents=0.0,
-        actual_pnl=0.0,
-        outcome_reason="no_liquidity",
-    )
-    await collector.record_trade(trade_2)
+    for trade in trades:
+        await collector.record_trade(_make_trade(timestamp=now, **trade))
 
     # Get session stats
     attempted, filled = await collector.get_current_trades()
@@ -491,13 +482,10 @@ async def test_metrics_collection(metrics_collector):
     pnl = await collector.get_current_pnl()
     latency_stats = await collector.get_latency_stats()
 
-    # Verify fill rate: 1 filled / 2 attempted = 50%
-    assert attempted == 2
-    assert filled == 1
-    assert fill_rate == 0.5
-
-    # Verify P&L: 50 + 0 = 50
-    assert pnl == 50.0
+    assert attempted == expected["attempted"]
+    assert filled == expected["filled"]
+    assert fill_rate == expected["fill_rate"]
+    assert pnl == expected["pnl"]
 
     # Verify latency tracking
     assert latency_stats["p95_decision_ms"] > 0
@@ -509,7 +497,7 @@ async def test_metrics_collection(metrics_collector):
 # ============================================================================
 
 
-@pytest.mark.asyncio
+@pytest.mark.slow
 async def test_capital_recycling(capital_system, mock_config):
     """
     Verify capital recycling after market resolution.
@@ -547,16 +535,17 @@ async def test_capital_recycling(capital_system, mock_config):
     market_found = any(p.market_id == market_id for p in pending)
     assert market_found
 
-    # Start recycler and wait for processing
-    await recycler.start()
-    await asyncio.sleep(2.0)  # Wait longer than recycle delay
-    await recycler.stop()
+    # Start recycler and wait for processing (recycle delay is 1s)
+    async def recycled():
+        # Should have 9950 + 50 = 10000 from recycle
+        # Plus 25 from P&L = 10025
+        return await allocator.get_available_capital() >= 10000.0
 
-    # Verify capital was recycled
-    available_after_recycle = await allocator.get_available_capital()
-    # Should have 9950 + 50 = 10000 from recycle
-    # Plus 25 from P&L = 10025
-    assert available_after_recycle >= 9950.0
+    await recycler.start()
+    try:
+        assert await wait_until(recycled, timeout=3.0), "Capital was not recycled"
+    finally:
+        await recycler.stop()
 
 
 # ============================================================================
@@ -564,7 +553,6 @@ async def test_capital_recycling(capital_system, mock_config):
 # ============================================================================
 
 
-@pytest.mark.asyncio
 async def test_total_exposure_limit(capital_system):
     """
     Verify total portfolio exposure limit is enforced.
@@ -579,20 +567,20 @@ async def test_total_exposure_limit(capital_system):
     # Total limit is 30% of $10k = $3000
     # Per-market limit is $50 absolute, so need 60 markets to hit total limit
 
-    # Allocate $50 to markets 1-60 to hit total limit
-    for i in range(60):
-        result, amount = await allocator.request_allocation(f"market_{i}", 50.0)
-        if i < 59:
-            # First 59 should succeed
-            assert result == AllocationResult.SUCCESS
-            assert amount == 50.0
-        else:
-            # 60th should also succeed (3000 limit)
-            if result != AllocationResult.SUCCESS:
-                # At limit, total allocation should be ~3000
-                total = await allocator.get_total_allocated()
-                assert total >= 2950.0
-            break
+    # Allocate $50 to markets 1-60 to hit total limit; the allocator's lock
+    # serializes the concurrent requests
+    results = await asyncio.gather(*[
+        allocator.request_allocation(f"market_{i}", 50.0)
+        for i in range(60)
+    ])
+
+    # All but at most one (the request landing on the 3000 limit) succeed
+    failed = [r for r, _ in results if r != AllocationResult.SUCCESS]
+    assert len(failed) <= 1
+    assert all(amount == 50.0 for r, amount in results if r == AllocationResult.SUCCESS)
+
+    total = await allocator.get_total_allocated()
+    assert 2950.0 <= total <= 3000.0
 
     # Try to allocate more - should fail with TOTAL_LIMIT_EXCEEDED
     result, amount = await allocator.request_allocation("market_final", 10.0)
@@ -605,7 +593,8 @@ async def test_total_exposure_limit(capital_system):
 # ============================================================================
 
 
-@pytest.mark.asyncio
+@pytest.mark.slow
+@pytest.mark.parametrize("state_machine", [{"stale_feed_threshold_ms": 100}], indirect=True)
 async def test_stale_feed_with_state_machine(state_machine):
     """
     Verify state machine transitions market to ON_HOLD on stale feed.
@@ -616,8 +605,7 @@ async def test_stale_feed_with_state_machine(state_machine):
     3. Wait for stale threshold
     4. Verify automatic ON_HOLD transition
     """
-    config = SchedulerConfig(stale_feed_threshold_ms=100)
-    machine = MarketStateMachine(config)
+    machine = state_machine
 
     market = _create_test_market("market_stale")
     await machine.add_market(market)
@@ -627,12 +615,12 @@ async def test_stale_feed_with_state_machine(state_machine):
     await machine.check_transitions()
     assert market.state == MarketState.WATCHING
 
-    # Wait for staleness
-    await asyncio.sleep(0.15)
+    # Check transitions until the feed goes stale - should move to ON_HOLD
+    async def on_hold():
+        await machine.check_transitions()
+        return market.state == MarketState.ON_HOLD
 
-    # Check transitions - should move to ON_HOLD
-    await machine.check_transitions()
-    assert market.state == MarketState.ON_HOLD
+    assert await wait_until(on_hold, timeout=1.0)
 
 
 # ============================================================================
@@ -640,7 +628,6 @@ async def test_stale_feed_with_state_machine(state_machine):
 # ============================================================================
 
 
-@pytest.mark.asyncio
 async def test_multiple_markets_concurrent(state_machine, risk_manager, capital_system, metrics_collector):
     """
     Verify system handles multiple markets concurrently.
@@ -654,30 +641,29 @@ async def test_multiple_markets_concurrent(state_machine, risk_manager, capital_
     """
     allocator, _ = capital_system
 
-    # Create and add 5 markets
-    markets = [_create_test_market(f"market_{i}") for i in range(5)]
+    # Create and add 5 markets from one clock read
+    created = datetime.utcnow()
+    markets = [_create_test_market(f"market_{i}", now=created) for i in range(5)]
 
     for market in markets:
         await state_machine.add_market(market)
 
     # Update prices concurrently
-    tasks = [
-        state_machine.update_price(f"market_{i}", 0.50 + i * 0.01, 0.52 + i * 0.01)
-        for i in range(5)
-    ]
-    await asyncio.gather(*tasks)
+    async with asyncio.TaskGroup() as tg:
+        for i in range(5):
+            tg.create_task(state_machine.update_price(f"market_{i}", 0.50 + i * 0.01, 0.52 + i * 0.01))
 
     # Check transitions
     transitions = await state_machine.check_transitions()
     assert len(transitions) > 0
 
     # Allocate capital to all
-    alloc_tasks = [
-        allocator.request_allocation(f"market_{i}", 10.0 + i * 5)
-        for i in range(5)
-    ]
-    results = await asyncio.gather(*alloc_tasks)
-    assert all(r[0] == AllocationResult.SUCCESS for r in results)
+    async with asyncio.TaskGroup() as tg:
+        alloc_tasks = [
+            tg.create_task(allocator.request_allocation(f"market_{i}", 10.0 + i * 5))
+            for i in range(5)
+        ]
+    assert all(task.result()[0] == AllocationResult.SUCCESS for task in alloc_tasks)
 
     # Verify total exposure
     total = await allocator.get_total_allocated()
@@ -693,8 +679,8 @@ async def test_multiple_markets_concurrent(state_machine, risk_manager, capital_
 # ============================================================================
 
 
-@pytest.mark.asyncio
-async def test_failure_recovery_workflow(mock_config):
+@pytest.mark.parametrize("state_machine", [{"max_failures_before_hold": 2}], indirect=True)
+async def test_failure_recovery_workflow(state_machine, risk_manager):
     """
     Verify graceful recovery from failures.
 
@@ -704,8 +690,7 @@ async def test_failure_recovery_workflow(mock_config):
     3. Clear failures/recover
     4. Verify market becomes tradeable again
     """
-    config = SchedulerConfig(max_failures_before_hold=2)
-    machine = MarketStateMachine(config)
+    machine = state_machine
 
     market = _create_test_market("market_fail", minutes_to_expiry=10)
     await machine.add_market(market)
@@ -713,20 +698,20 @@ async def test_failure_recovery_workflow(mock_config):
     await machine.check_transitions()  # WATCHING
 
     # Record failures
-    await machine.mark_failure("market_fail", "Connection timeout")
-    await machine.mark_failure("market_fail", "Order rejection")
     # Need 3 failures to trigger ON_HOLD (max_failures_before_hold=2 means 3rd failure triggers)
-    await machine.mark_failure("market_fail", "Network error")
+    await machine.record_failures(
+        "market_fail",
+        ["Connection timeout", "Order rejection", "Network error"],
+    )
 
     # Should move to ON_HOLD after threshold
     await machine.check_transitions()
     assert market.state == MarketState.ON_HOLD
 
-    # Verify circuit breaker also tripped (using separate risk manager with same config)
-    circuit_breakers = CircuitBreakerRegistry(mock_config["circuit_breakers"])
+    # Verify circuit breaker also tripped (using a risk manager with the same config)
+    circuit_breakers = risk_manager.circuit_breakers
     # Simulate the same failures in circuit breaker
-    for _ in range(3):
-        await circuit_breakers.record_failure("market_fail", "error")
+    await circuit_breakers.record_failures("market_fail", ["error"] * 3)
 
     can_execute = await circuit_breakers.can_execute("market_fail")
     assert not can_execute
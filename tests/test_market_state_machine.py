@@ -12,13 +12,42 @@ Tests all functionality including:
 
 import pytest
 import asyncio
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
 import time
 
-from core.market_state import Market, MarketState, SchedulerConfig, MarketStateMachine
+from core.market_state import (
+    Market,
+    MarketState,
+    SchedulerConfig,
+    MarketStateMachine,
+    TRANSITION_HISTORY_LEN,
+)
 from core.priority_queue import MarketPriorityQueue
 
 
+@pytest.fixture
+def make_market():
+    """Factory for markets expiring ttl_sec from now"""
+    def _make(token: str = "test", ttl_sec: int = 30) -> Market:
+        return Market(
+            token_id=token,
+            condition_id=f"c_{token}",
+            question=f"q_{token}",
+            end_time_ns=time.monotonic_ns() + ttl_sec * 10**9,
+        )
+    return _make
+
+
+class FakeClock:
+    """Manually advanced monotonic nanosecond clock"""
+
+    def __init__(self, now_ns: int):
+        self.now_ns = now_ns
+
+    def read(self) -> int:
+        return self.now_ns
+
+
 class TestMarket:
     """Tests for Market dataclass"""
 
@@ -37,64 +66,70 @@ class TestMarket:
         assert market.current_bid is None
         assert market.current_ask is None
 
+    def test_market_has_no_instance_dict(self, make_market):
+        """Test Market uses slots rather than a per-instance __dict__"""
+        market = make_market()
+
+        assert not hasattr(market, "__dict__")
+        with pytest.raises(AttributeError):
+            market.unknown_field = 1
+
     def test_time_to_expiry(self):
         """Test time_to_expiry calculation"""
-        future = datetime.utcnow() + timedelta(seconds=30)
         market = Market(
             token_id="test",
             condition_id="cond",
             question="test",
-            end_time=future,
+            end_time_ns=time.monotonic_ns() + 30 * 10**9,
         )
 
-        time_to_expiry = market.time_to_expiry().total_seconds()
         # Should be approximately 30 seconds
-        assert 29 < time_to_expiry < 31
-
-    def test_is_stale_no_update(self):
-        """Test stale detection when no update"""
-        market = Market(
-            token_id="test",
+        assert 29 < market.time_to_expiry_sec() < 31
+        assert 29 < market.time_to_expiry().total_seconds() < 31
+        assert market.end_time is not None
+
+    def test_end_time_ns_from_datetime(self):
+        """Test naive and aware end_time both derive a monotonic deadline"""
+        naive = Market(
+            token_id="naive",
             condition_id="cond",
             question="test",
-            end_time=datetime.utcnow() + timedelta(minutes=5),
+            end_time=datetime.utcnow() + timedelta(seconds=30),
+        )
+        aware = Market(
+            token_id="aware",
+            condition_id="cond",
+            question="test",
+            end_time=datetime.now(timezone.utc) + timedelta(seconds=30),
         )
 
+        assert 29 < naive.time_to_expiry_sec() < 31
+        assert 29 < aware.time_to_expiry_sec() < 31
+
+    def test_is_stale_no_update(self, make_market):
+        """Test stale detection when no update"""
+        market = make_market("test", 300)
+
         # No update yet, should be stale
         assert market.is_stale(500) is True
 
-    def test_is_stale_recent_update(self):
+    def test_is_stale_recent_update(self, make_market):
         """Test fresh update is not stale"""
-        market = Market(
-            token_id="test",
-            condition_id="cond",
-            question="test",
-            end_time=datetime.utcnow() + timedelta(minutes=5),
-        )
+        market = make_market("test", 300)
 
-        market.last_update = datetime.utcnow()
+        market.last_update_ns = time.monotonic_ns()
         assert market.is_stale(500) is False
 
-    def test_is_stale_old_update(self):
+    def test_is_stale_old_update(self, make_market):
         """Test old update is stale"""
-        market = Market(
-            token_id="test",
-            condition_id="cond",
-            question="test",
-            end_time=datetime.utcnow() + timedelta(minutes=5),
-        )
+        market = make_market("test", 300)
 
-        market.last_update = datetime.utcnow() - timedelta(seconds=1)
+        market.last_update_ns = time.monotonic_ns() - 1_000_000_000
         assert market.is_stale(500) is True
 
-    def test_transition_history(self):
+    def test_transition_history(self, make_market):
         """Test transition history recording"""
-        market = Market(
-            token_id="test",
-            condition_id="cond",
-            question="test",
-            end_time=datetime.utcnow() + timedelta(minutes=5),
-        )
+        market = make_market("test", 300)
 
         market.record_transition(MarketState.WATCHING, "test-reason")
         market.record_transition(MarketState.ELIGIBLE, "test-reason-2")
@@ -103,30 +138,48 @@ class TestMarket:
         assert market.transition_history[0][2] == MarketState.WATCHING
         assert market.transition_history[1][2] == MarketState.ELIGIBLE
 
+    def test_transition_history_bounded(self):
+        """Test transition history keeps only the most recent entries"""
+        market = Market(
+            token_id="test",
+            condition_id="cond",
+            question="test",
+            end_time_ns=time.monotonic_ns() + 30 * 10**9,
+        )
+
+        for i in range(TRANSITION_HISTORY_LEN + 5):
+            market.record_transition(MarketState.WATCHING, f"reason-{i}")
 
+        assert len(market.transition_history) == TRANSITION_HISTORY_LEN
+        assert market.transition_history[0][3] == "reason-5"
+        assert market.last_transition_time() == market.transition_history[-1][0]
+
+
+@pytest.mark.asyncio(loop_scope="class")
 class TestMarketStateMachine:
     """Tests for MarketStateMachine"""
 
-    @pytest.fixture
-    def machine(self):
-        """Fixture for state machine"""
+    @pytest.fixture(scope="class")
+    @classmethod
+    def machine(cls):
+        """Fixture for state machine, shared across the class"""
         config = SchedulerConfig(
             time_to_eligibility_sec=60,
             max_buy_price=0.95,
         )
         return MarketStateMachine(config)
 
+    @pytest.fixture(autouse=True)
+    def reset_machine(self, machine):
+        """Start every test with no tracked markets"""
+        machine.markets.clear()
+        machine._by_state.clear()
+
     @pytest.fixture
-    def market(self):
+    def market(self, make_market):
         """Fixture for market"""
-        return Market(
-            token_id="test_token",
-            condition_id="cond_123",
-            question="Test market",
-            end_time=datetime.utcnow() + timedelta(seconds=30),
-        )
+        return make_market("test_token")
 
-    @pytest.mark.asyncio
     async def test_add_market(self, machine, market):
         """Test adding a market"""
         await machine.add_market(market)
@@ -134,14 +187,12 @@ class TestMarketStateMachine:
         assert len(markets) == 1
         assert markets[0].token_id == "test_token"
 
-    @pytest.mark.asyncio
     async def test_add_duplicate_market(self, machine, market):
         """Test adding duplicate market raises error"""
         await machine.add_market(market)
         with pytest.raises(ValueError):
             await machine.add_market(market)
 
-    @pytest.mark.asyncio
     async def test_remove_market(self, machine, market):
         """Test removing a market"""
         await machine.add_market(market)
@@ -149,7 +200,6 @@ class TestMarketStateMachine:
         markets = await machine.get_markets_by_state(MarketState.DISCOVERED)
         assert len(markets) == 0
 
-    @pytest.mark.asyncio
     async def test_update_price(self, machine, market):
         """Test price update"""
         await machine.add_market(market)
@@ -157,9 +207,24 @@ class TestMarketStateMachine:
 
         assert market.current_bid == 0.50
         assert market.current_ask == 0.52
+        assert market.last_update_ns > 0
         assert market.last_update is not None
 
-    @pytest.mark.asyncio
+    async def test_concurrent_calls_keep_index_consistent(self, machine, make_market):
+        """Test interleaved lock-free calls leave markets and state buckets in step"""
+        markets = [make_market(f"m{i}") for i in range(20)]
+
+        await asyncio.gather(*(machine.add_market(m) for m in markets))
+        await asyncio.gather(
+            *(machine.update_price(m.token_id, 0.50, 0.52) for m in markets),
+            machine.check_transitions(),
+        )
+        await machine.check_transitions()
+
+        stats = await machine.get_stats()
+        assert stats["total"] == 20
+        assert stats["watching"] + stats["eligible"] + stats["on_hold"] == 20
+
     async def test_transition_discovered_to_watching(self, machine, market):
         """Test DISCOVERED -> WATCHING transition"""
         await machine.add_market(market)
@@ -170,19 +235,20 @@ class TestMarketStateMachine:
         assert len(transitions) == 1
         assert transitions[0] == ("test_token", MarketState.DISCOVERED, MarketState.WATCHING)
 
-    @pytest.mark.asyncio
     async def test_transition_watching_to_eligible(self, machine, market):
         """Test WATCHING -> ELIGIBLE transition"""
         await machine.add_market(market)
         await machine.update_price("test_token", 0.50, 0.52)
-        await machine.check_transitions()
 
-        # With 30s to expiry and price 0.52 < 0.95, should transition
-        transitions = await machine.check_transitions()
+        # With 30s to expiry and price 0.52 < 0.95, should reach ELIGIBLE
+        transitions = await machine.advance_until_stable("test_token")
 
         assert market.state == MarketState.ELIGIBLE
+        assert transitions == [
+            ("test_token", MarketState.DISCOVERED, MarketState.WATCHING),
+            ("test_token", MarketState.WATCHING, MarketState.ELIGIBLE),
+        ]
 
-    @pytest.mark.asyncio
     async def test_transition_eligible_to_executing(self, machine, market):
         """Test ELIGIBLE -> EXECUTING transition"""
         await machine.add_market(market)
@@ -197,7 +263,6 @@ class TestMarketStateMachine:
         assert market.allocated_capital == 100.0
         assert market.orders_placed == 1
 
-    @pytest.mark.asyncio
     async def test_transition_executing_to_reconciling(self, machine, market):
         """Test EXECUTING -> RECONCILING transition"""
         await machine.add_market(market)
@@ -212,7 +277,6 @@ class TestMarketStateMachine:
         assert market.state == MarketState.RECONCILING
         assert market.pnl == 50.0
 
-    @pytest.mark.asyncio
     async def test_transition_reconciling_to_done(self, machine, market):
         """Test RECONCILING -> DONE transition"""
         await machine.add_market(market)
@@ -227,32 +291,86 @@ class TestMarketStateMachine:
         assert success
         assert market.state == MarketState.DONE
 
-    @pytest.mark.asyncio
-    async def test_stale_feed_detection(self, machine):
+    async def test_stale_feed_detection(self, machine, make_market):
         """Test automatic ON_HOLD for stale feeds"""
         config = SchedulerConfig(stale_feed_threshold_ms=100)
-        machine = MarketStateMachine(config)
+        fake = FakeClock(time.monotonic_ns())
+        machine = MarketStateMachine(config, clock=fake.read)
+
+        market = make_market("test")
+
+        await machine.add_market(market)
+        await machine.update_price("test", 0.50, 0.52)
+        await machine.check_transitions()
+
+        assert market.state == MarketState.WATCHING
 
+        # Advance past the staleness threshold
+        fake.now_ns += 150_000_000
+        await machine.check_transitions()
+
+        assert market.state == MarketState.ON_HOLD
+
+    async def test_guard_cache_skips_until_deadline(self):
+        """Test unchanged markets skip guard evaluation until a deadline passes"""
+        config = SchedulerConfig(time_to_eligibility_sec=60, stale_feed_threshold_ms=600_000)
+        fake = FakeClock(time.monotonic_ns())
+        machine = MarketStateMachine(config, clock=fake.read)
         market = Market(
             token_id="test",
             condition_id="cond",
             question="test",
-            end_time=datetime.utcnow() + timedelta(seconds=30),
+            end_time_ns=fake.now_ns + 120 * 10**9,
         )
 
         await machine.add_market(market)
         await machine.update_price("test", 0.50, 0.52)
+        await machine.check_transitions()  # DISCOVERED -> WATCHING
+        await machine.check_transitions()  # evaluated, cached
+        assert market.state == MarketState.WATCHING
+
+        evaluated = []
+        original = machine._check_market_transitions
+
+        def counting(m, now_ns):
+            evaluated.append(m.token_id)
+            return original(m, now_ns)
+
+        machine._check_market_transitions = counting
+
+        fake.now_ns += 30 * 10**9
+        assert await machine.check_transitions() == []
+        assert evaluated == []
+
+        # Crossing the eligibility deadline re-evaluates the guards
+        fake.now_ns += 31 * 10**9
         await machine.check_transitions()
+        assert evaluated == ["test"]
+        assert market.state == MarketState.ELIGIBLE
 
+    async def test_unknown_expiry_never_times_in(self):
+        """Test a market without end_time stays in WATCHING/EXECUTING"""
+        config = SchedulerConfig(time_to_eligibility_sec=60, stale_feed_threshold_ms=600_000)
+        fake = FakeClock(time.monotonic_ns())
+        machine = MarketStateMachine(config, clock=fake.read)
+        market = Market(token_id="x", condition_id="c", question="q")
+        assert market.end_time_ns == 0
+
+        await machine.add_market(market)
+        await machine.update_price("x", 0.50, 0.52)
+        await machine.advance_until_stable()
         assert market.state == MarketState.WATCHING
 
-        # Wait for staleness threshold
-        time.sleep(0.15)
-        await machine.check_transitions()
+        # No expiry deadline is cached, only the staleness one
+        assert market._guard_cache[1] == market.last_update_ns + 600_000 * 1_000_000
 
-        assert market.state == MarketState.ON_HOLD
+        # Forced into EXECUTING, it never resolves on its own
+        await machine.transition("x", MarketState.ELIGIBLE)
+        await machine.mark_execution_started("x", 10.0)
+        fake.now_ns += 60 * 10**9
+        await machine.advance_until_stable()
+        assert market.state == MarketState.EXECUTING
 
-    @pytest.mark.asyncio
     async def test_failure_counter(self, machine, market):
         """Test failure counting"""
         await machine.add_market(market)
@@ -264,18 +382,12 @@ class TestMarketStateMachine:
         await machine.mark_failure("test_token", "test failure 2")
         assert market.failure_count == 2
 
-    @pytest.mark.asyncio
-    async def test_failure_to_on_hold(self, machine):
+    async def test_failure_to_on_hold(self, machine, make_market):
         """Test ON_HOLD transition due to failures"""
         config = SchedulerConfig(max_failures_before_hold=2)
         machine = MarketStateMachine(config)
 
-        market = Market(
-            token_id="test",
-            condition_id="cond",
-            question="test",
-            end_time=datetime.utcnow() + timedelta(seconds=30),
-        )
+        market = make_market("test")
 
         await machine.add_market(market)
         await machine.update_price("test", 0.50, 0.52)
@@ -286,21 +398,22 @@ class TestMarketStateMachine:
 
         assert market.state == MarketState.ON_HOLD
 
-    @pytest.mark.asyncio
-    async def test_get_stats(self, machine):
+    async def test_record_failures_bulk(self, market):
+        """Test bulk failure recording counts every failure and holds once"""
+        machine = MarketStateMachine(SchedulerConfig(max_failures_before_hold=2))
+
+        await machine.add_market(market)
+        assert await machine.record_failures("test_token", ["timeout", "rejected", "network"])
+
+        assert market.failure_count == 3
+        assert market.state == MarketState.ON_HOLD
+        assert len(market.transition_history) == 1
+        assert not await machine.record_failures("unknown", ["timeout"])
+
+    async def test_get_stats(self, machine, make_market):
         """Test stats reporting"""
-        market1 = Market(
-            token_id="t1",
-            condition_id="c1",
-            question="q1",
-            end_time=datetime.utcnow() + timedelta(seconds=30),
-        )
-        market2 = Market(
-            token_id="t2",
-            condition_id="c2",
-            question="q2",
-            end_time=datetime.utcnow() + timedelta(seconds=30),
-        )
+        market1 = make_market("t1")
+        market2 = make_market("t2")
 
         await machine.add_market(market1)
         await machine.add_market(market2)
@@ -310,18 +423,35 @@ class TestMarketStateMachine:
         assert stats["total"] == 2
         assert stats["discovered"] == 2
 
-    @pytest.mark.asyncio
-    async def test_cleanup_old_done_markets(self, machine):
+    async def test_state_index_tracks_transitions(self, machine, market):
+        """Test state buckets follow transitions and DONE markets are skipped"""
+        await machine.add_market(market)
+        await machine.update_price("test_token", 0.50, 0.52)
+        await machine.check_transitions()
+        await machine.check_transitions()
+        await machine.mark_execution_started("test_token", 100.0)
+        await machine.mark_resolution("test_token", 50.0)
+        await machine.mark_done("test_token")
+
+        # A stale DONE market stays DONE
+        market.last_update_ns = 0
+        assert await machine.check_transitions() == []
+        assert [m.token_id for m in await machine.get_markets_by_state(MarketState.DONE)] == [
+            "test_token"
+        ]
+        stats = await machine.get_stats()
+        assert stats["done"] == 1
+        assert sum(v for k, v in stats.items() if k != "total") == 1
+
+        await machine.remove_market("test_token")
+        assert await machine.get_markets_by_state(MarketState.DONE) == []
+
+    async def test_cleanup_old_done_markets(self, machine, make_market):
         """Test cleanup of old DONE markets"""
         config = SchedulerConfig(max_hold_hours=0)  # Immediate cleanup
         machine = MarketStateMachine(config)
 
-        market = Market(
-            token_id="test",
-            condition_id="cond",
-            question="test",
-            end_time=datetime.utcnow() + timedelta(seconds=30),
-        )
+        market = make_market("test")
 
         await machine.add_market(market)
         await machine.update_price("test", 0.50, 0.52)
@@ -355,16 +485,11 @@ class TestMarketPriorityQueue:
         assert len(queue) == 0
         assert queue.is_empty() is True
 
-    def test_push_pop(self):
+    def test_push_pop(self, make_market):
         """Test push and pop"""
         queue = MarketPriorityQueue()
 
-        market = Market(
-            token_id="test",
-            condition_id="cond",
-            question="test",
-            end_time=datetime.utcnow() + timedelta(seconds=30),
-        )
+        market = make_market("test")
 
         queue.push(market)
         assert len(queue) == 1
@@ -373,22 +498,12 @@ class TestMarketPriorityQueue:
         assert token_id == "test"
         assert len(queue) == 0
 
-    def test_priority_ordering(self):
+    def test_priority_ordering(self, make_market):
         """Test priority queue ordering by time to expiry"""
         queue = MarketPriorityQueue()
 
-        market_quick = Market(
-            token_id="quick",
-            condition_id="c1",
-            question="q1",
-            end_time=datetime.utcnow() + timedelta(seconds=10),
-        )
-        market_slow = Market(
-            token_id="slow",
-            condition_id="c2",
-            question="q2",
-            end_time=datetime.utcnow() + timedelta(seconds=30),
-        )
+        market_quick = make_market("quick", 10)
+        market_slow = make_market("slow")
 
         queue.push(market_quick)
         queue.push(market_slow)
@@ -397,31 +512,34 @@ class TestMarketPriorityQueue:
         assert queue.pop() == "quick"
         assert queue.pop() == "slow"
 
-    def test_peek(self):
+    def test_heapify(self, make_market):
+        """Test bulk build matches successive pushes and stays indexed"""
+        queue = MarketPriorityQueue()
+        queue.push(make_market("stale", 5))
+        markets = [make_market(f"m{ttl}", ttl) for ttl in (40, 10, 30, 20, 50)]
+
+        queue.heapify(markets)
+
+        assert len(queue) == 5
+        assert "stale" not in queue.get_all_active()
+        assert queue.remove("m30")
+        assert [queue.pop() for _ in range(4)] == ["m10", "m20", "m40", "m50"]
+
+    def test_peek(self, make_market):
         """Test peek without removing"""
         queue = MarketPriorityQueue()
 
-        market = Market(
-            token_id="test",
-            condition_id="cond",
-            question="test",
-            end_time=datetime.utcnow() + timedelta(seconds=30),
-        )
+        market = make_market("test")
 
         queue.push(market)
         assert queue.peek() == "test"
         assert len(queue) == 1  # Still there after peek
 
-    def test_remove(self):
-        """Test lazy removal"""
+    def test_remove(self, make_market):
+        """Test removal"""
         queue = MarketPriorityQueue()
 
-        market = Market(
-            token_id="test",
-            condition_id="cond",
-            question="test",
-            end_time=datetime.utcnow() + timedelta(seconds=30),
-        )
+        market = make_market("test")
 
         queue.push(market)
         assert len(queue) == 1
@@ -429,40 +547,25 @@ class TestMarketPriorityQueue:
         queue.remove("test")
         assert len(queue) == 0
 
-    def test_update_priority(self):
+    def test_update_priority(self, make_market):
         """Test updating priority"""
         queue = MarketPriorityQueue()
 
-        market = Market(
-            token_id="test",
-            condition_id="cond",
-            question="test",
-            end_time=datetime.utcnow() + timedelta(seconds=30),
-        )
+        market = make_market("test")
 
         queue.push(market)
-        # Manually change end_time to test update
-        market.end_time = datetime.utcnow() + timedelta(seconds=10)
+        # Manually change expiry to test update
+        market.end_time_ns = time.monotonic_ns() + 10 * 10**9
         queue.update_priority(market)
 
         assert queue.peek() == "test"
 
-    def test_debug_stats(self):
+    def test_debug_stats(self, make_market):
         """Test debug statistics"""
         queue = MarketPriorityQueue()
 
-        market1 = Market(
-            token_id="t1",
-            condition_id="c1",
-            question="q1",
-            end_time=datetime.utcnow() + timedelta(seconds=10),
-        )
-        market2 = Market(
-            token_id="t2",
-            condition_id="c2",
-            question="q2",
-            end_time=datetime.utcnow() + timedelta(seconds=20),
-        )
+        market1 = make_market("t1", 10)
+        market2 = make_market("t2", 20)
 
         queue.push(market1)
         queue.push(market2)
@@ -471,8 +574,54 @@ class TestMarketPriorityQueue:
         stats = queue.debug_stats()
 
         assert stats["active_entries"] == 1
-        assert stats["removed_entries"] == 1
-        assert stats["total_entries"] == 2
+        assert stats["removed_entries"] == 0
+        assert stats["total_entries"] == 1
+
+    def test_priority_key_captured_at_push(self):
+        """Test the heap keys on the expiry captured at push, not live market state"""
+        queue = MarketPriorityQueue()
+        now = time.monotonic_ns()
+        first = Market(token_id="first", condition_id="c1", question="q1", end_time_ns=now + 10**9)
+        second = Market(token_id="second", condition_id="c2", question="q2", end_time_ns=now + 2 * 10**9)
+
+        queue.push(first)
+        queue.push(second)
+
+        # Not re-queued, so the stored key still wins
+        first.end_time_ns = now + 5 * 10**9
+        assert queue.peek() == "first"
+
+        queue.update_priority(first)
+        assert queue.peek() == "second"
+
+    def test_heap_order_after_removes_and_updates(self):
+        """Test pop order stays sorted after interleaved remove/update"""
+        queue = MarketPriorityQueue()
+        now = time.monotonic_ns()
+        markets = {
+            f"m{i}": Market(
+                token_id=f"m{i}",
+                condition_id=f"c{i}",
+                question=f"q{i}",
+                end_time_ns=now + 10 * (i + 1) * 10**9,
+            )
+            for i in range(8)
+        }
+        for market in markets.values():
+            queue.push(market)
+
+        queue.remove("m0")
+        queue.remove("m5")
+        markets["m7"].end_time_ns = now + 10**9
+        queue.update_priority(markets["m7"])
+        markets["m1"].end_time_ns = now + 200 * 10**9
+        queue.update_priority(markets["m1"])
+
+        popped = [queue.pop() for _ in range(len(queue))]
+
+        assert popped == ["m7", "m2", "m3", "m4", "m6", "m1"]
+        assert queue.pop() is None
+        assert queue.debug_stats()["heap_size"] == 0
 
 
 if __name__ == "__main__":
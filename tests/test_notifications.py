@@ -0,0 +1,167 @@
+"""
+Tests for Notifier (utils/notifications.py)
+===========================================
+
+Covers channel short-circuits, concurrent sends over the shared httpx
+client, the aiohttp fallback and close().
+"""
+
+import asyncio
+import json
+from unittest.mock import MagicMock
+
+import pytest
+
+httpx = pytest.importorskip("httpx")
+
+import utils.notifications as notifications_module
+from utils.notifications import Notifier
+
+TELEGRAM_TOKEN = "123:abc"
+TELEGRAM_CHAT = "42"
+DISCORD_WEBHOOK = "https://discord.example/api/webhooks/1/x"
+
+
+class RecordingTransport(httpx.MockTransport):
+    """Mock transport that records requests and peak concurrency"""
+
+    def __init__(self, status_code=200):
+        self.requests = []
+        self.active = 0
+        self.max_active = 0
+        self.status_code = status_code
+        super().__init__(self._handle)
+
+    async def _handle(self, request):
+        self.requests.append(request)
+        self.active += 1
+        self.max_active = max(self.max_active, self.active)
+        await asyncio.sleep(0.01)
+        self.active -= 1
+        return httpx.Response(self.status_code)
+
+
+def make_notifier(transport, **channels):
+    """Notifier whose httpx client goes through transport"""
+    notifier = Notifier(**channels)
+    notifier._client = httpx.AsyncClient(transport=transport)
+    return notifier
+
+
+@pytest.fixture
+def transport(monkeypatch):
+    monkeypatch.setattr(notifications_module, "HTTPX_AVAILABLE", True)
+    return RecordingTransport()
+
+
+async def test_notify_sends_both_channels_concurrently(transport):
+    """Test notify() posts to Telegram and Discord at the same time"""
+    notifier = make_notifier(
+        transport,
+        telegram_token=TELEGRAM_TOKEN,
+        telegram_chat=TELEGRAM_CHAT,
+        discord_webhook=DISCORD_WEBHOOK,
+    )
+    try:
+        await notifier.notify("hello", "Title")
+    finally:
+        await notifier.close()
+
+    hosts = sorted(r.url.host for r in transport.requests)
+    assert hosts == ["api.telegram.org", "discord.example"]
+    assert transport.max_active == 2
+
+    telegram = next(r for r in transport.requests if r.url.host == "api.telegram.org")
+    assert telegram.url.path == f"/bot{TELEGRAM_TOKEN}/sendMessage"
+    assert json.loads(telegram.content)["chat_id"] == TELEGRAM_CHAT
+
+
+async def test_notify_skips_disabled_channels(transport):
+    """Test only configured channels are contacted"""
+    notifier = make_notifier(transport, discord_webhook=DISCORD_WEBHOOK)
+    try:
+        assert await notifier.send_telegram("hello") is False
+        await notifier.notify("hello")
+    finally:
+        await notifier.close()
+
+    assert [r.url.host for r in transport.requests] == ["discord.example"]
+
+
+async def test_no_channels_creates_no_client(monkeypatch):
+    """Test a Notifier without credentials never opens an HTTP client"""
+    monkeypatch.setattr(notifications_module, "HTTPX_AVAILABLE", True)
+    notifier = Notifier()
+
+    await notifier.notify("hello")
+    await notifier.trade_alert("BUY", "YES", 0.95, 10.0)
+
+    assert notifier._client is None
+    assert notifier._session is None
+
+
+async def test_send_status_codes(monkeypatch):
+    """Test send results follow each API's success status codes"""
+    monkeypatch.setattr(notifications_module, "HTTPX_AVAILABLE", True)
+    notifier = make_notifier(
+        RecordingTransport(status_code=204),
+        telegram_token=TELEGRAM_TOKEN,
+        telegram_chat=TELEGRAM_CHAT,
+        discord_webhook=DISCORD_WEBHOOK,
+    )
+    try:
+        # Discord webhooks answer 204; Telegram only succeeds with 200
+        assert await notifier.send_discord("hello") is True
+        assert await notifier.send_telegram("hello") is False
+    finally:
+        await notifier.close()
+
+
+async def test_send_error_returns_false(monkeypatch):
+    """Test a transport error is logged and reported as a failed send"""
+    monkeypatch.setattr(notifications_module, "HTTPX_AVAILABLE", True)
+
+    def refuse(request):
+        raise httpx.ConnectError("refused", request=request)
+
+    notifier = make_notifier(httpx.MockTransport(refuse), discord_webhook=DISCORD_WEBHOOK)
+    try:
+        assert await notifier.send_discord("hello") is False
+    finally:
+        await notifier.close()
+
+
+async def test_close_closes_client(transport):
+    """Test close() closes the shared client and can be called again"""
+    notifier = make_notifier(transport, discord_webhook=DISCORD_WEBHOOK)
+    client = notifier._client
+
+    await notifier.close()
+
+    assert client.is_closed
+    assert notifier._client is None
+    await notifier.close()
+
+
+async def test_aiohttp_fallback(monkeypatch):
+    """Test sends go through the aiohttp session when httpx is unavailable"""
+    monkeypatch.setattr(notifications_module, "HTTPX_AVAILABLE", False)
+
+    session = MagicMock()
+    session.post.return_value.__aenter__.return_value.status = 200
+    notifier = Notifier(
+        telegram_token=TELEGRAM_TOKEN,
+        telegram_chat=TELEGRAM_CHAT,
+        discord_webhook=DISCORD_WEBHOOK,
+    )
+    monkeypatch.setattr(notifier, "_get_session", lambda: session)
+
+    assert await notifier.send_telegram("hello") is True
+    assert await notifier.send_discord("hello") is True
+
+    urls = [call.args[0] for call in session.post.call_args_list]
+    assert urls == [
+        f"https://api.telegram.org/bot{TELEGRAM_TOKEN}/sendMessage",
+        DISCORD_WEBHOOK,
+    ]
+    assert notifier._client is None
@@ -11,12 +11,13 @@ Tests the base architecture:
 """
 
 import sys
-import os
 import asyncio
-import tempfile
+import traceback
+import uuid
 from pathlib import Path
 
 import pytest
+import pytest_asyncio
 
 # Add parent directory to path
 sys.path.insert(0, str(Path(__file__).parent.parent))
@@ -26,11 +27,16 @@ from storage import PositionStore
 from executor import OrderExecutor, OrderRequest
 from strategies.base_strategy import BaseStrategy
 
+# Token ids shared by the tests (distinct so concurrent tests don't collide)
+TEST_TOKEN_A = "0x1234567890abcdef1234567890abcdef12345678"
+TEST_TOKEN_B = "0xabcdef1234567890abcdef1234567890abcdef12"
+TEST_TOKEN_C = "0xfedcba0987654321fedcba0987654321fedcba09"
+
 
 def create_test_config():
     """Create a test configuration"""
     return Config(
-        private_key="0x" + "0" * 64,  # Dummy private key
+        private_key="0x" + "0" * 63 + "1",  # Dummy private key (must be non-zero)
         wallet_address="0x" + "0" * 40,  # Dummy wallet address
         clob_api_key="test_key",
         clob_secret="test_secret",
@@ -42,6 +48,7 @@ def create_test_config():
         daily_loss_limit_pct=0.05,
         min_price_threshold=0.99,
         max_buy_price=0.99,
+        starting_bankroll=1000.0,
         dry_run=True,  # Always dry run for tests
         telegram_bot_token=None,
         telegram_chat_id=None,
@@ -49,6 +56,36 @@ def create_test_config():
     )
 
 
+def memory_db_path():
+    """Unique shared-cache in-memory SQLite URI for one test"""
+    return f"file:teststore_{uuid.uuid4().hex}?mode=memory&cache=shared"
+
+
+# One event loop for the module so the shared store fixture can span tests
+pytestmark = pytest.mark.asyncio(loop_scope="module")
+
+
+@pytest_asyncio.fixture(scope="module", loop_scope="module")
+async def position_store(redis_pool):
+    """In-memory PositionStore shared by the tests in this module"""
+    store = PositionStore(db_path=":memory:", redis_url=None, redis_pool=redis_pool)
+    await store.initialize()
+    yield store
+    await store.close()
+
+
+@pytest.fixture(scope="module")
+def config():
+    """Test Config built once for the module"""
+    return create_test_config()
+
+
+@pytest.fixture(scope="module")
+def order_executor(config, position_store):
+    """Dry-run OrderExecutor writing to the shared store"""
+    return OrderExecutor(config, position_store)
+
+
 class MockStrategy(BaseStrategy):
     """Mock strategy for testing (renamed to avoid pytest collection)"""
 
@@ -58,145 +95,231 @@ class MockStrategy(BaseStrategy):
         self.trades_executed = 3
         self.total_profit = 10.5
 
-        await asyncio.sleep(0.1)  # Reduced sleep for faster tests
-
     async def cleanup(self):
         """No cleanup needed"""
         pass
 
 
-@pytest.mark.asyncio
-async def test_position_store():
+async def test_position_store(position_store):
     """Test PositionStore database operations"""
     print("\n=== Testing PositionStore ===")
 
-    # Use temporary database
-    with tempfile.NamedTemporaryFile(suffix=".db", delete=False) as tmp:
-        db_path = tmp.name
+    # Test recording a trade (use valid token_id format)
+    test_token = TEST_TOKEN_A
+    trade_id = await position_store.record_trade(
+        token_id=test_token,
+        side="YES",
+        action="BUY",
+        price=0.65,
+        size=10.0,
+        strategy="MockStrategy",
+        status="executed",
+    )
+
+    print(f"✓ Recorded trade ID: {trade_id}")
+    assert trade_id is not None, "Trade ID should be returned"
+
+    # Test getting position
+    position = await position_store.get_position(test_token)
+    assert position is not None, "Position should exist"
+    assert position["entry_price"] == 0.65, "Entry price should match"
+    print(f"✓ Retrieved position: {position['token_id']}")
+
+    # Test getting open positions
+    open_positions = await position_store.get_open_positions()
+    assert open_positions, "Should have at least 1 open position"
+    print(f"✓ Found {len(open_positions)} open positions")
+
+    # Test getting trades
+    trades = await position_store.get_trades(limit=10)
+    assert trades, "Should have at least 1 trade"
+    print(f"✓ Retrieved {len(trades)} trades")
+
+    # Test stats
+    stats = await position_store.get_stats()
+    print(f"✓ Stats: {stats}")
+    assert stats["total_trades"] >= 1, "Should have at least 1 trade in stats"
+
+    print("✓ PositionStore tests passed!")
+
+
+async def test_position_store_schema_initialized_once():
+    """Test a second store on the same database skips schema setup"""
+    db_path = memory_db_path()
+    first = PositionStore(db_path=db_path, redis_url=None)
+    second = PositionStore(db_path=db_path, redis_url=None)
 
     try:
-        store = PositionStore(db_path=db_path, redis_url=None)
-
-        # Test recording a trade (use valid token_id format)
-        test_token = "0x1234567890abcdef1234567890abcdef12345678"
-        trade_id = await store.record_trade(
-            token_id=test_token,
-            side="YES",
-            action="BUY",
-            price=0.65,
-            size=10.0,
-            strategy="MockStrategy",
-            status="executed",
+        await first.initialize()
+        assert db_path in PositionStore._initialized_paths
+
+        await second.initialize()
+        test_token = TEST_TOKEN_A
+        await first.record_trade(
+            token_id=test_token, side="YES", action="BUY",
+            price=0.65, size=10.0, strategy="MockStrategy",
         )
+        assert (await second.get_position(test_token))["entry_price"] == 0.65
+
+    finally:
+        await second.close()
+        await first.close()
 
-        print(f"✓ Recorded trade ID: {trade_id}")
-        assert trade_id is not None, "Trade ID should be returned"
+    assert db_path not in PositionStore._initialized_paths
 
-        # Test getting position
-        position = await store.get_position(test_token)
-        assert position is not None, "Position should exist"
-        assert position["entry_price"] == 0.65, "Entry price should match"
-        print(f"✓ Retrieved position: {position['token_id']}")
 
-        # Test getting open positions
-        open_positions = await store.get_open_positions()
-        assert len(open_positions) >= 1, "Should have at least 1 open position"
-        print(f"✓ Found {len(open_positions)} open positions")
+async def test_position_store_batch():
+    """Test begin_batch commits grouped writes together or not at all"""
+    store = PositionStore(db_path=":memory:", redis_url=None)
+    tokens = [f"0x{i:040x}" for i in range(1, 5)]
 
-        # Test getting trades
-        trades = await store.get_trades(limit=10)
-        assert len(trades) >= 1, "Should have at least 1 trade"
-        print(f"✓ Retrieved {len(trades)} trades")
+    try:
+        async with store.begin_batch():
+            for token in tokens:
+                await store.record_trade(
+                    token_id=token, side="YES", action="BUY",
+                    price=0.65, size=10.0, strategy="MockStrategy",
+                )
+            # Uncommitted writes are visible inside the batch
+            assert (await store.get_position(tokens[0])) is not None
+
+        assert (await store.get_stats())["total_trades"] == len(tokens)
+
+        with pytest.raises(RuntimeError):
+            async with store.begin_batch():
+                await store.record_trade(
+                    token_id="0x" + "f" * 40, side="YES", action="BUY",
+                    price=0.65, size=10.0, strategy="MockStrategy",
+                )
+                raise RuntimeError("abort batch")
+
+        # The aborted batch left nothing behind
+        assert (await store.get_position("0x" + "f" * 40)) is None
+        assert (await store.get_stats())["total_trades"] == len(tokens)
+
+    finally:
+        await store.close()
 
-        # Test stats
-        stats = await store.get_stats()
-        print(f"✓ Stats: {stats}")
-        assert stats["total_trades"] >= 1, "Should have at least 1 trade in stats"
 
-        print("✓ PositionStore tests passed!")
+@pytest.mark.parametrize("file_backed", [False, True], ids=["memory", "file"])
+async def test_position_store_batch_isolated_from_other_tasks(file_backed, tmp_path):
+    """Test a write from another task waits for the batch and survives its rollback"""
+    db_path = str(tmp_path / "positions.db") if file_backed else ":memory:"
+    store = PositionStore(db_path=db_path, redis_url=None)
+    batch_token = "0x" + "b" * 40
+    other_token = "0x" + "c" * 40
+
+    try:
+        with pytest.raises(RuntimeError):
+            async with store.begin_batch():
+                await store.record_trade(
+                    token_id=batch_token, side="YES", action="BUY",
+                    price=0.65, size=10.0, strategy="MockStrategy",
+                )
+                other = asyncio.create_task(store.record_trade(
+                    token_id=other_token, side="YES", action="BUY",
+                    price=0.55, size=5.0, strategy="MockStrategy",
+                ))
+                await asyncio.sleep(0.05)
+                # The other task's write waits instead of joining the batch
+                assert not other.done()
+                raise RuntimeError("abort batch")
+
+        await other
+        assert (await store.get_position(batch_token)) is None
+        assert (await store.get_position(other_token))["entry_price"] == 0.55
 
     finally:
-        # Cleanup
-        if os.path.exists(db_path):
-            os.unlink(db_path)
-        # Also clean up WAL files
-        for suffix in ["-wal", "-shm"]:
-            wal_path = db_path + suffix
-            if os.path.exists(wal_path):
-                os.unlink(wal_path)
-
-
-@pytest.mark.asyncio
-async def test_executor():
+        await store.close()
+
+
+async def test_executor(order_executor):
     """Test OrderExecutor"""
     print("\n=== Testing OrderExecutor ===")
 
-    with tempfile.NamedTemporaryFile(suffix=".db", delete=False) as tmp:
-        db_path = tmp.name
+    # Test order execution (use valid token_id - minimum 10 chars)
+    request = OrderRequest(
+        token_id=TEST_TOKEN_C,
+        side="YES",
+        action="BUY",
+        size=5.0,
+        strategy="MockStrategy",
+        price=0.70,
+    )
 
-    try:
-        config = create_test_config()
-        store = PositionStore(db_path=db_path, redis_url=None)
-        executor = OrderExecutor(config, store)
-
-        # Test order execution (use valid token_id - minimum 10 chars)
-        request = OrderRequest(
-            token_id="0x1234567890abcdef1234567890abcdef12345678",
-            side="YES",
-            action="BUY",
-            size=5.0,
-            strategy="MockStrategy",
-            price=0.70,
-        )
+    success = await order_executor.execute_order(request)
+    assert success, "Order should execute in dry run"
+    print("✓ Order executed successfully")
+
+    # Test concurrent deduplication (submit same order while first is pending)
+    # Create tasks that will run concurrently
+    request2 = OrderRequest(
+        token_id=TEST_TOKEN_B,
+        side="YES",
+        action="BUY",
+        size=5.0,
+        strategy="MockStrategy",
+        price=0.70,
+    )
 
-        success = await executor.execute_order(request)
-        assert success, "Order should execute in dry run"
-        print("✓ Order executed successfully")
-
-        # Test concurrent deduplication (submit same order while first is pending)
-        # Create tasks that will run concurrently
-        request2 = OrderRequest(
-            token_id="0xabcdef1234567890abcdef1234567890abcdef12",
-            side="YES",
-            action="BUY",
-            size=5.0,
-            strategy="MockStrategy",
-            price=0.70,
-        )
+    # Submit two identical orders concurrently
+    task1 = asyncio.create_task(order_executor.execute_order(request2))
+    task2 = asyncio.create_task(order_executor.execute_order(request2))
+
+    results = await asyncio.gather(task1, task2)
 
-        # Submit two identical orders concurrently
-        task1 = asyncio.create_task(executor.execute_order(request2))
-        task2 = asyncio.create_task(executor.execute_order(request2))
+    # The duplicate awaits the in-flight order and shares its result
+    assert results == [True, True], "Duplicate should share the in-flight result"
+    assert order_executor.get_metrics()["pending_orders"] == 0
+    print(f"✓ Concurrent execution handled (results: {results})")
 
-        results = await asyncio.gather(task1, task2)
+    # Test metrics
+    metrics = order_executor.get_metrics()
+    assert metrics["total_orders"] >= 1, "Should have recorded orders"
+    print(f"✓ Executor metrics: {metrics}")
 
-        # One should succeed, one should fail (or both might succeed if timing is off)
-        # For testing purposes, we just verify both ran without error
-        print(f"✓ Concurrent execution handled (results: {results})")
+    print("✓ OrderExecutor tests passed!")
 
-        # Test metrics
-        metrics = executor.get_metrics()
-        assert metrics["total_orders"] >= 1, "Should have recorded orders"
-        print(f"✓ Executor metrics: {metrics}")
 
-        print("✓ OrderExecutor tests passed!")
+async def test_executor_duplicate_of_failed_order(order_executor, monkeypatch):
+    """Test a duplicate of an order that raises gets False, not the exception"""
+    started = asyncio.Event()
+    release = asyncio.Event()
 
-    finally:
-        if os.path.exists(db_path):
-            os.unlink(db_path)
-        # Also clean up WAL files
-        for suffix in ["-wal", "-shm"]:
-            wal_path = db_path + suffix
-            if os.path.exists(wal_path):
-                os.unlink(wal_path)
+    async def failing_order(request):
+        started.set()
+        await release.wait()
+        raise RuntimeError("submit failed")
 
+    monkeypatch.setattr(order_executor, "_execute_market_order", failing_order)
 
-@pytest.mark.asyncio
-async def test_base_strategy():
+    request = OrderRequest(
+        token_id=TEST_TOKEN_A,
+        side="YES",
+        action="BUY",
+        size=5.0,
+        strategy="MockStrategy",
+        price=0.70,
+    )
+
+    first = asyncio.create_task(order_executor.execute_order(request))
+    await started.wait()
+
+    # The duplicate attaches to the in-flight order before it fails
+    duplicate = asyncio.create_task(order_executor.execute_order(request))
+    await asyncio.sleep(0)
+    release.set()
+
+    with pytest.raises(RuntimeError, match="submit failed"):
+        await first
+    assert await duplicate is False
+    assert order_executor.get_metrics()["pending_orders"] == 0
+
+
+async def test_base_strategy(config):
     """Test BaseStrategy abstract class"""
     print("\n=== Testing BaseStrategy ===")
 
-    config = create_test_config()
     strategy = MockStrategy(config, name="MockStrategy")
 
     # Test initialization
@@ -230,35 +353,42 @@ async def main():
     print("Phase 1 Foundation Tests")
     print("=" * 70)
 
-    results = []
-
-    # Run tests
+    # One shared store, as with the module fixtures; the tests use distinct
+    # token_ids, so they can run concurrently
+    store = PositionStore(db_path=":memory:", redis_url=None)
+    await store.initialize()
+
+    async def run_executor_test():
+        await test_executor(OrderExecutor(create_test_config(), store))
+
+    async def run_test(name, coro):
+        """Run one test, reporting its failure instead of raising"""
+        try:
+            await coro
+            return True
+        except Exception as e:
+            print(f"✗ {name} test failed: {e}")
+            traceback.print_exception(e)
+            return False
+
+    # Each task catches its own failure, so one failing test doesn't
+    # cancel the others; the TaskGroup still waits for all of them
     try:
-        await test_position_store()
-        results.append(True)
-    except Exception as e:
-        print(f"✗ PositionStore test failed: {e}")
-        import traceback
-        traceback.print_exc()
-        results.append(False)
-
-    try:
-        await test_executor()
-        results.append(True)
-    except Exception as e:
-        print(f"✗ OrderExecutor test failed: {e}")
-        import traceback
-        traceback.print_exc()
-        results.append(False)
+        async with asyncio.TaskGroup() as tg:
+            tasks = [
+                tg.create_task(run_test("PositionStore", test_position_store(store))),
+                tg.create_task(run_test(
+                    "PositionStore schema reuse",
+                    test_position_store_schema_initialized_once(),
+                )),
+                tg.create_task(run_test("PositionStore batch", test_position_store_batch())),
+                tg.create_task(run_test("OrderExecutor", run_executor_test())),
+                tg.create_task(run_test("BaseStrategy", test_base_strategy(create_test_config()))),
+            ]
+    finally:
+        await store.close()
 
-    try:
-        await test_base_strategy()
-        results.append(True)
-    except Exception as e:
-        print(f"✗ BaseStrategy test failed: {e}")
-        import traceback
-        traceback.print_exc()
-        results.append(False)
+    results = [task.result() for task in tasks]
 
     # Summary
     print("\n" + "=" * 70)
@@ -277,5 +407,10 @@ async def main():
 
 
 if __name__ == "__main__":
+    try:
+        import uvloop
+        uvloop.install()
+    except ImportError:
+        pass
     exit_code = asyncio.run(main())
     sys.exit(exit_code)
@@ -6,9 +6,8 @@ Comprehensive tests for kill switches, circuit breakers, and exposure management
 Tests both individual components and integrated RiskManager.
 """
 
-import asyncio
+import time
 import pytest
-from datetime import datetime, timedelta, timezone
 from typing import Tuple
 
 # Import risk components
@@ -24,33 +23,55 @@ from risk import (
     RiskManager,
 )
 
+MARKET_ID = "market_123"
+MARKET_1 = "market_1"
+MARKET_2 = "market_2"
+MARKET_3 = "market_3"
+
+
+# Default configs, built once per module (the managers never mutate them)
+@pytest.fixture(scope="module")
+def kill_switch_config():
+    return KillSwitchConfig()
+
+
+@pytest.fixture(scope="module")
+def circuit_breaker_config():
+    return CircuitBreakerConfig()
+
+
+@pytest.fixture(scope="module")
+def exposure_config():
+    return ExposureConfig()
+
 
 # ============================================================================
 # KILL SWITCH TESTS
 # ============================================================================
 
-@pytest.mark.asyncio
 async def test_kill_switch_stale_feed():
     """Test stale feed detection."""
     config = KillSwitchConfig(stale_feed_threshold_ms=500)
     manager = KillSwitchManager(config)
 
+    # One clock read; the other timestamps are offsets from it
+    base_ns = time.monotonic_ns()
+    stale_ns = base_ns - 600_000_000
+    recovered_ns = base_ns + 1_000_000
+
     # Fresh feed - should not trigger
-    now = datetime.now(timezone.utc)
-    assert not await manager.check_stale_feed(now)
+    assert not await manager.check_stale_feed(base_ns)
     assert not manager.is_trading_halted()
 
     # Stale feed - should trigger
-    stale_time = now - timedelta(milliseconds=600)
-    assert await manager.check_stale_feed(stale_time)
+    assert await manager.check_stale_feed(stale_ns)
     assert manager.is_trading_halted()
 
     # Feed recovered - should clear
-    assert not await manager.check_stale_feed(datetime.now(timezone.utc))
+    assert not await manager.check_stale_feed(recovered_ns)
     assert not manager.is_trading_halted()
 
 
-@pytest.mark.asyncio
 async def test_kill_switch_rpc_lag():
     """Test RPC lag detection."""
     config = KillSwitchConfig(rpc_lag_threshold_ms=300)
@@ -69,7 +90,6 @@ async def test_kill_switch_rpc_lag():
     assert not manager.is_trading_halted()
 
 
-@pytest.mark.asyncio
 async def test_kill_switch_order_limit():
     """Test outstanding order limit."""
     config = KillSwitchConfig(max_outstanding_orders=10)
@@ -88,7 +108,6 @@ async def test_kill_switch_order_limit():
     assert not manager.is_trading_halted()
 
 
-@pytest.mark.asyncio
 async def test_kill_switch_daily_loss():
     """Test daily loss limit."""
     config = KillSwitchConfig(daily_loss_limit_percent=5.0)
@@ -111,11 +130,9 @@ async def test_kill_switch_daily_loss():
     assert not manager.is_trading_halted()
 
 
-@pytest.mark.asyncio
-async def test_kill_switch_manual_activation():
+async def test_kill_switch_manual_activation(kill_switch_config):
     """Test manual kill switch activation/deactivation."""
-    config = KillSwitchConfig()
-    manager = KillSwitchManager(config)
+    manager = KillSwitchManager(kill_switch_config)
 
     # Manually activate
     await manager.activate(KillSwitchType.MANUAL, "Operator intervention")
@@ -127,7 +144,6 @@ async def test_kill_switch_manual_activation():
     assert not manager.is_trading_halted()
 
 
-@pytest.mark.asyncio
 async def test_kill_switch_multiple_active():
     """Test multiple simultaneous kill switches."""
     config = KillSwitchConfig(rpc_lag_threshold_ms=300, max_outstanding_orders=5)
@@ -148,245 +164,239 @@ async def test_kill_switch_multiple_active():
 # CIRCUIT BREAKER TESTS
 # ============================================================================
 
-@pytest.mark.asyncio
 async def test_circuit_breaker_closed_to_open():
     """Test circuit breaker transitions CLOSED -> OPEN."""
     config = CircuitBreakerConfig(failure_threshold=3, recovery_timeout_seconds=60)
     registry = CircuitBreakerRegistry(config)
 
-    market_id = "market_123"
-
     # All requests allowed in CLOSED state
-    assert await registry.can_execute(market_id)
+    assert await registry.can_execute(MARKET_ID)
 
-    # Record failures
-    await registry.record_failure(market_id, "error 1")
-    assert await registry.can_execute(market_id)  # Still CLOSED
-
-    await registry.record_failure(market_id, "error 2")
-    assert await registry.can_execute(market_id)  # Still CLOSED
+    # Record failures below the threshold in one call
+    await registry.record_failures(MARKET_ID, ["error 1", "error 2"])
+    assert await registry.can_execute(MARKET_ID)  # Still CLOSED
 
     # Third failure trips to OPEN
-    await registry.record_failure(market_id, "error 3")
-    assert not await registry.can_execute(market_id)  # OPEN
+    await registry.record_failure(MARKET_ID, "error 3")
+    assert not await registry.can_execute(MARKET_ID)  # OPEN
 
     open_breakers = await registry.get_open_breakers()
-    assert market_id in open_breakers
+    assert MARKET_ID in open_breakers
 
 
-@pytest.mark.asyncio
 async def test_circuit_breaker_recovery():
     """Test circuit breaker transitions OPEN -> HALF_OPEN -> CLOSED."""
-    config = CircuitBreakerConfig(failure_threshold=3, recovery_timeout_seconds=1)
+    fake_now = [1000.0]
+    config = CircuitBreakerConfig(
+        failure_threshold=3,
+        recovery_timeout_seconds=1,
+        clock=lambda: fake_now[0],
+    )
     registry = CircuitBreakerRegistry(config)
 
-    market_id = "market_123"
-    breaker = await registry.get_or_create(market_id)
+    breaker = await registry.get_or_create(MARKET_ID)
 
     # Trip to OPEN
-    for _ in range(3):
-        await registry.record_failure(market_id, "error")
+    await registry.record_failures(MARKET_ID, ["error"] * 3)
 
-    assert not await registry.can_execute(market_id)
+    assert not await registry.can_execute(MARKET_ID)
     assert breaker.state == CircuitState.OPEN
 
-    # Wait for recovery timeout
-    await asyncio.sleep(1.1)
+    # Not recovered before the timeout
+    fake_now[0] += 0.9
+    breaker._check_recovery()
+    assert breaker.state == CircuitState.OPEN
+
+    # Advance past the recovery timeout
+    fake_now[0] += 0.2
 
     # Manually check recovery (normally called during can_execute)
     breaker._check_recovery()
     assert breaker.state == CircuitState.HALF_OPEN
 
     # Success in HALF_OPEN -> CLOSED
-    await registry.record_success(market_id)
+    await registry.record_success(MARKET_ID)
     assert breaker.state == CircuitState.CLOSED
-    assert await registry.can_execute(market_id)
+    assert await registry.can_execute(MARKET_ID)
+
+
+async def test_circuit_breaker_record_failures_bulk():
+    """Test bulk failure recording trips the breaker like individual failures."""
+    config = CircuitBreakerConfig(failure_threshold=3)
+    registry = CircuitBreakerRegistry(config)
+
+    await registry.record_failures(MARKET_ID, ["error 1", "error 2"])
+    assert await registry.can_execute(MARKET_ID)
+
+    await registry.record_failures(MARKET_ID, ["error 3"])
+    assert not await registry.can_execute(MARKET_ID)
+
+    breaker = await registry.get_or_create(MARKET_ID)
+    assert breaker.failure_count == 3
 
 
-@pytest.mark.asyncio
 async def test_circuit_breaker_per_market_isolation():
     """Test circuit breaker isolation across markets."""
     config = CircuitBreakerConfig(failure_threshold=2)
     registry = CircuitBreakerRegistry(config)
 
-    market_1 = "market_1"
-    market_2 = "market_2"
-
-    # Trip market_1
-    await registry.record_failure(market_1, "error")
-    await registry.record_failure(market_1, "error")
+    # Trip MARKET_1
+    await registry.record_failure(MARKET_1, "error")
+    await registry.record_failure(MARKET_1, "error")
 
-    # market_1 should be OPEN, market_2 should be CLOSED
-    assert not await registry.can_execute(market_1)
-    assert await registry.can_execute(market_2)
+    # MARKET_1 should be OPEN, MARKET_2 should be CLOSED
+    assert not await registry.can_execute(MARKET_1)
+    assert await registry.can_execute(MARKET_2)
 
 
 # ============================================================================
 # EXPOSURE MANAGER TESTS
 # ============================================================================
 
-def test_exposure_manager_initialization():
-    """Test exposure manager initialization."""
-    config = ExposureConfig(max_exposure_per_market_percent=5.0)
-    manager = ExposureManager(config, initial_bankroll=10000.0)
-
-    assert manager.bankroll == 10000.0
-    assert manager.config.max_exposure_per_market_percent == 5.0
-
-
-@pytest.mark.asyncio
-async def test_exposure_allocation():
-    """Test exposure allocation and limits."""
-    config = ExposureConfig(
-        max_exposure_per_market_percent=5.0,
-        max_exposure_per_market_absolute=50.0,
-        max_total_exposure_percent=30.0,
-    )
-    manager = ExposureManager(config, initial_bankroll=10000.0)
-
-    market_id = "market_123"
-
-    # Small allocation should succeed
-    can_allocate, reason = await manager.can_allocate(market_id, 100.0)
-    assert can_allocate, reason
-
-    await manager.allocate(market_id, 100.0)
-    exposure = await manager.get_market_exposure(market_id)
-    assert exposure == 100.0
-
-
-@pytest.mark.asyncio
-async def test_exposure_per_market_limit():
-    """Test per-market percentage limit."""
-    config = ExposureConfig(max_exposure_per_market_percent=5.0)
-    manager = ExposureManager(config, initial_bankroll=10000.0)
-
-    # Max per market = 5% of $10k = $500
-    market_id = "market_123"
-
-    # At limit
-    can_allocate, reason = await manager.can_allocate(market_id, 500.0)
-    assert can_allocate
-
-    await manager.allocate(market_id, 500.0)
-
-    # Exceed limit
-    can_allocate, reason = await manager.can_allocate(market_id, 1.0)
-    assert not can_allocate
-    assert "$500" in reason or "5.0%" in reason
-
-
-@pytest.mark.asyncio
-async def test_exposure_absolute_limit():
-    """Test per-market absolute limit."""
-    config = ExposureConfig(
-        max_exposure_per_market_percent=50.0,  # High percent
-        max_exposure_per_market_absolute=50.0,  # Low absolute
-    )
-    manager = ExposureManager(config, initial_bankroll=10000.0)
+class TestExposure:
+    """ExposureManager allocation, limit and P&L tests"""
 
-    market_id = "market_123"
+    @pytest.fixture
+    def make_manager(self, exposure_config):
+        """Build a fresh $10k ExposureManager (default config unless given)"""
+        def make(config=None):
+            return ExposureManager(config or exposure_config, initial_bankroll=10000.0)
+        return make
 
-    # At absolute limit
-    can_allocate, reason = await manager.can_allocate(market_id, 50.0)
-    assert can_allocate
+    def test_exposure_manager_initialization(self, make_manager):
+        """Test exposure manager initialization."""
+        config = ExposureConfig(max_exposure_per_market_percent=5.0)
+        manager = make_manager(config)
 
-    await manager.allocate(market_id, 50.0)
+        assert manager.bankroll == 10000.0
+        assert manager.config.max_exposure_per_market_percent == 5.0
 
-    # Exceed absolute limit (even though % limit allows it)
-    can_allocate, reason = await manager.can_allocate(market_id, 1.0)
-    assert not can_allocate
-
-
-@pytest.mark.asyncio
-async def test_exposure_total_limit():
-    """Test total portfolio exposure limit."""
-    config = ExposureConfig(
-        max_exposure_per_market_percent=100.0,  # No per-market limit
-        max_total_exposure_percent=30.0,
-    )
-    manager = ExposureManager(config, initial_bankroll=10000.0)
-
-    # Max total = 30% of $10k = $3k
-    market_1 = "market_1"
-    market_2 = "market_2"
-
-    # Allocate to market 1
-    await manager.allocate(market_1, 1500.0)
-    await manager.allocate(market_2, 1500.0)
+    async def test_exposure_allocation(self, make_manager):
+        """Test exposure allocation and limits."""
+        config = ExposureConfig(
+            max_exposure_per_market_percent=5.0,
+            max_exposure_per_market_absolute=50.0,
+            max_total_exposure_percent=30.0,
+        )
+        manager = make_manager(config)
+
+        # Small allocation should succeed
+        can_allocate, reason = await manager.can_allocate(MARKET_ID, 100.0)
+        assert can_allocate, reason
+
+        await manager.allocate(MARKET_ID, 100.0)
+        exposure = await manager.get_market_exposure(MARKET_ID)
+        assert exposure == 100.0
+
+    async def test_exposure_per_market_limit(self, make_manager):
+        """Test per-market percentage limit."""
+        config = ExposureConfig(max_exposure_per_market_percent=5.0)
+        manager = make_manager(config)
+
+        # Max per market = 5% of $10k = $500
+        # At limit
+        can_allocate, reason = await manager.can_allocate(MARKET_ID, 500.0)
+        assert can_allocate
+
+        await manager.allocate(MARKET_ID, 500.0)
+
+        # Exceed limit
+        can_allocate, reason = await manager.can_allocate(MARKET_ID, 1.0)
+        assert not can_allocate
+        assert "$500" in reason or "5.0%" in reason
+
+    async def test_exposure_absolute_limit(self, make_manager):
+        """Test per-market absolute limit."""
+        config = ExposureConfig(
+            max_exposure_per_market_percent=50.0,  # High percent
+            max_exposure_per_market_absolute=50.0,  # Low absolute
+        )
+        manager = make_manager(config)
 
-    # At limit
-    can_allocate, reason = await manager.can_allocate("market_3", 0.01)
-    assert not can_allocate
+        # At absolute limit
+        can_allocate, reason = await manager.can_allocate(MARKET_ID, 50.0)
+        assert can_allocate
 
+        await manager.allocate(MARKET_ID, 50.0)
 
-@pytest.mark.asyncio
-async def test_exposure_release():
-    """Test releasing exposure."""
-    config = ExposureConfig(max_exposure_per_market_percent=5.0)
-    manager = ExposureManager(config, initial_bankroll=10000.0)
+        # Exceed absolute limit (even though % limit allows it)
+        can_allocate, reason = await manager.can_allocate(MARKET_ID, 1.0)
+        assert not can_allocate
 
-    market_id = "market_123"
+    async def test_exposure_total_limit(self, make_manager):
+        """Test total portfolio exposure limit."""
+        config = ExposureConfig(
+            max_exposure_per_market_percent=100.0,  # No per-market limit
+            max_total_exposure_percent=30.0,
+        )
+        manager = make_manager(config)
 
-    # Allocate
-    await manager.allocate(market_id, 100.0)
-    assert await manager.get_market_exposure(market_id) == 100.0
+        # Max total = 30% of $10k = $3k
+        # Allocate to market 1
+        await manager.allocate(MARKET_1, 1500.0)
+        await manager.allocate(MARKET_2, 1500.0)
 
-    # Partial release
-    released = await manager.release(market_id, 30.0)
-    assert released == 30.0
-    assert await manager.get_market_exposure(market_id) == 70.0
+        # At limit
+        can_allocate, reason = await manager.can_allocate(MARKET_3, 0.01)
+        assert not can_allocate
 
-    # Release all
-    released = await manager.release(market_id)
-    assert released == 70.0
-    assert await manager.get_market_exposure(market_id) == 0.0
+    async def test_exposure_release(self, make_manager):
+        """Test releasing exposure."""
+        config = ExposureConfig(max_exposure_per_market_percent=5.0)
+        manager = make_manager(config)
 
+        # Allocate
+        await manager.allocate(MARKET_ID, 100.0)
+        assert await manager.get_market_exposure(MARKET_ID) == 100.0
 
-@pytest.mark.asyncio
-async def test_exposure_pnl_tracking():
-    """Test P&L recording and bankroll updates."""
-    config = ExposureConfig()
-    manager = ExposureManager(config, initial_bankroll=10000.0)
+        # Partial release
+        released = await manager.release(MARKET_ID, 30.0)
+        assert released == 30.0
+        assert await manager.get_market_exposure(MARKET_ID) == 70.0
 
-    market_id = "market_123"
+        # Release all
+        released = await manager.release(MARKET_ID)
+        assert released == 70.0
+        assert await manager.get_market_exposure(MARKET_ID) == 0.0
 
-    # Record loss
-    await manager.record_pnl(market_id, -100.0)
-    assert manager.bankroll == 9900.0
+    async def test_exposure_pnl_tracking(self, make_manager):
+        """Test P&L recording and bankroll updates."""
+        manager = make_manager()
 
-    # Record gain
-    await manager.record_pnl(market_id, 500.0)
-    assert manager.bankroll == 10400.0
+        # Record loss
+        await manager.record_pnl(MARKET_ID, -100.0)
+        assert manager.bankroll == 9900.0
 
+        # Record gain
+        await manager.record_pnl(MARKET_ID, 500.0)
+        assert manager.bankroll == 10400.0
 
-@pytest.mark.asyncio
-async def test_exposure_available_capital():
-    """Test available capital calculation."""
-    config = ExposureConfig()
-    manager = ExposureManager(config, initial_bankroll=10000.0)
+    async def test_exposure_available_capital(self, make_manager):
+        """Test available capital calculation."""
+        manager = make_manager()
 
-    assert await manager.get_available_capital() == 10000.0
+        assert await manager.get_available_capital() == 10000.0
 
-    # Allocate $2k
-    await manager.allocate("market_1", 2000.0)
-    assert await manager.get_available_capital() == 8000.0
+        # Allocate $2k
+        await manager.allocate(MARKET_1, 2000.0)
+        assert await manager.get_available_capital() == 8000.0
 
-    # Allocate $3k
-    await manager.allocate("market_2", 3000.0)
-    assert await manager.get_available_capital() == 5000.0
+        # Allocate $3k
+        await manager.allocate(MARKET_2, 3000.0)
+        assert await manager.get_available_capital() == 5000.0
 
 
 # ============================================================================
 # UNIFIED RISK MANAGER TESTS
 # ============================================================================
 
-@pytest.mark.asyncio
-async def test_risk_manager_global_halt():
+async def test_risk_manager_global_halt(
+    kill_switch_config, circuit_breaker_config, exposure_config
+):
     """Test RiskManager global trading halt."""
-    kill_switches = KillSwitchManager(KillSwitchConfig())
-    circuit_breakers = CircuitBreakerRegistry(CircuitBreakerConfig())
-    exposure = ExposureManager(ExposureConfig(), initial_bankroll=10000.0)
+    kill_switches = KillSwitchManager(kill_switch_config)
+    circuit_breakers = CircuitBreakerRegistry(circuit_breaker_config)
+    exposure = ExposureManager(exposure_config, initial_bankroll=10000.0)
     risk = RiskManager(kill_switches, circuit_breakers, exposure)
 
     # Should allow trading
@@ -402,54 +412,49 @@ async def test_risk_manager_global_halt():
     assert "MANUAL" in reason
 
 
-@pytest.mark.asyncio
-async def test_risk_manager_pre_execution():
+async def test_risk_manager_pre_execution(circuit_breaker_config):
     """Test comprehensive pre-execution check."""
     kill_switches = KillSwitchManager(
         KillSwitchConfig(stale_feed_threshold_ms=500)
     )
-    circuit_breakers = CircuitBreakerRegistry(CircuitBreakerConfig())
+    circuit_breakers = CircuitBreakerRegistry(circuit_breaker_config)
     exposure = ExposureManager(
         ExposureConfig(max_exposure_per_market_percent=5.0),
         initial_bankroll=10000.0,
     )
     risk = RiskManager(kill_switches, circuit_breakers, exposure)
 
-    market_id = "market_123"
-    feed_time = datetime.now(timezone.utc)
+    feed_time_ns = time.monotonic_ns()
 
     # Should pass all checks
     can_execute, reason = await risk.pre_execution_check(
-        market_id=market_id,
+        market_id=MARKET_ID,
         amount=100.0,
-        feed_last_update=feed_time,
+        feed_last_update_ns=feed_time_ns,
     )
     assert can_execute, reason
 
     # Stale feed should fail
-    stale_time = feed_time - timedelta(milliseconds=600)
+    stale_ns = feed_time_ns - 600_000_000
     can_execute, reason = await risk.pre_execution_check(
-        market_id=market_id,
+        market_id=MARKET_ID,
         amount=100.0,
-        feed_last_update=stale_time,
+        feed_last_update_ns=stale_ns,
     )
     assert not can_execute
     assert "stale" in reason.lower() or "feed" in reason.lower()
 
 
-@pytest.mark.asyncio
-async def test_risk_manager_post_execution():
+async def test_risk_manager_post_execution(kill_switch_config, exposure_config):
     """Test post-execution recording."""
-    kill_switches = KillSwitchManager(KillSwitchConfig())
+    kill_switches = KillSwitchManager(kill_switch_config)
     circuit_breakers = CircuitBreakerRegistry(CircuitBreakerConfig(failure_threshold=3))
-    exposure = ExposureManager(ExposureConfig(), initial_bankroll=10000.0)
+    exposure = ExposureManager(exposure_config, initial_bankroll=10000.0)
     risk = RiskManager(kill_switches, circuit_breakers, exposure)
 
-    market_id = "market_123"
-
     # Record success with P&L
     await risk.post_execution_record(
-        market_id=market_id,
+        market_id=MARKET_ID,
         success=True,
         pnl=50.0,
         latency_ms=100.0,
@@ -459,22 +464,21 @@ async def test_risk_manager_post_execution():
     assert exposure.bankroll == 10050.0
 
     # Record failures
-    await risk.post_execution_record(market_id=market_id, success=False)
-    await risk.post_execution_record(market_id=market_id, success=False)
+    await risk.post_execution_record(market_id=MARKET_ID, success=False)
+    await risk.post_execution_record(market_id=MARKET_ID, success=False)
 
     # Circuit breaker should still allow execution (not at threshold yet)
-    assert await circuit_breakers.can_execute(market_id)
+    assert await circuit_breakers.can_execute(MARKET_ID)
 
     # Third failure should trip
-    await risk.post_execution_record(market_id=market_id, success=False)
-    assert not await circuit_breakers.can_execute(market_id)
+    await risk.post_execution_record(market_id=MARKET_ID, success=False)
+    assert not await circuit_breakers.can_execute(MARKET_ID)
 
 
 # ============================================================================
 # INTEGRATION TEST
 # ============================================================================
 
-@pytest.mark.asyncio
 async def test_full_risk_integration():
     """Integration test: realistic trading scenario."""
     # Setup
@@ -499,25 +503,25 @@ async def test_full_risk_integration():
     )
     risk = RiskManager(kill_switches, circuit_breakers, exposure)
 
-    feed_time = datetime.now(timezone.utc)
+    feed_time_ns = time.monotonic_ns()
 
     # Trade 1: Should succeed
-    can_execute, _ = await risk.pre_execution_check("market_1", 100.0, feed_time)
+    can_execute, _ = await risk.pre_execution_check(MARKET_1, 100.0, feed_time_ns)
     assert can_execute
 
-    await risk.post_execution_record("market_1", success=True, pnl=25.0)
+    await risk.post_execution_record(MARKET_1, success=True, pnl=25.0)
     assert exposure.bankroll == 10025.0
 
     # Trade 2: Should succeed (different market)
-    can_execute, _ = await risk.pre_execution_check("market_2", 150.0, feed_time)
+    can_execute, _ = await risk.pre_execution_check(MARKET_2, 150.0, feed_time_ns)
     assert can_execute
 
-    await risk.post_execution_record("market_2", success=True, pnl=50.0)
+    await risk.post_execution_record(MARKET_2, success=True, pnl=50.0)
     assert exposure.bankroll == 10075.0
 
     # Trade 3: Stale feed should block
-    stale_time = feed_time - timedelta(milliseconds=600)
-    can_execute, reason = await risk.pre_execution_check("market_3", 100.0, stale_time)
+    stale_ns = feed_time_ns - 600_000_000
+    can_execute, reason = await risk.pre_execution_check(MARKET_3, 100.0, stale_ns)
     assert not can_execute
 
     # Trade 4: High RPC lag should activate kill switch
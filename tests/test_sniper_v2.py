@@ -11,6 +11,7 @@ Verifies integration with scaling modules:
 
 import pytest
 import asyncio
+import time
 from datetime import datetime, timezone, timedelta
 from unittest.mock import AsyncMock, MagicMock, patch
 
@@ -20,10 +21,14 @@ from risk import KillSwitchConfig, CircuitBreakerConfig, ExposureConfig, KillSwi
 from capital import CapitalConfig, AllocationResult
 from metrics import TradeMetrics
 
+# Wall-clock "now" read once for the module. Only used for far-off end dates
+# and record timestamps; execution-window tests use the now_ns fixture.
+NOW = datetime.now(timezone.utc)
 
-@pytest.fixture
+
+@pytest.fixture(scope="module")
 def mock_bot_config():
-    """Mock bot configuration"""
+    """Mock bot configuration (read-only, shared by the module)"""
     config = MagicMock()
     config.dry_run = True
     config.private_key = "0x" + "a" * 64
@@ -55,9 +60,9 @@ def sniper_config():
     )
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def mock_clob_client():
-    """Mock CLOB client"""
+    """Mock CLOB client, patched in once for the module"""
     with patch("sniper_v2.ClobClient") as mock:
         client = MagicMock()
         client.create_or_derive_api_creds.return_value = MagicMock()
@@ -65,17 +70,29 @@ def mock_clob_client():
         yield client
 
 
+@pytest.fixture(scope="module")
+def mock_trade_logger():
+    """Mock trade logger, patched in once for the module"""
+    with patch("sniper_v2.get_trade_logger") as mock:
+        trade_logger = MagicMock()
+        mock.return_value = trade_logger
+        yield trade_logger
+
+
 @pytest.fixture
-def enhanced_sniper(mock_bot_config, sniper_config, mock_clob_client):
-    """Create enhanced sniper instance with mocked dependencies"""
-    with patch("sniper_v2.get_trade_logger") as mock_logger:
-        mock_logger.return_value = MagicMock()
-        bot = EnhancedSniperBot(
-            bot_config=mock_bot_config,
-            sniper_config=sniper_config,
-            token_id="test_token_123",
-        )
-        yield bot
+def enhanced_sniper(mock_bot_config, sniper_config, mock_clob_client, mock_trade_logger):
+    """
+    Create enhanced sniper instance with mocked dependencies.
+
+    Built per test: tests allocate capital, trip kill switches, record
+    metrics and flip sniper_config flags, none of which a shared bot
+    could reset reliably.
+    """
+    return EnhancedSniperBot(
+        bot_config=mock_bot_config,
+        sniper_config=sniper_config,
+        token_id="test_token_123",
+    )
 
 
 class TestEnhancedSniperInitialization:
@@ -103,14 +120,13 @@ class TestEnhancedSniperInitialization:
 class TestMarketStateIntegration:
     """Test integration with MarketStateMachine"""
 
-    @pytest.mark.asyncio
     async def test_add_market_to_state_machine(self, enhanced_sniper):
         """Test adding market to state machine"""
         market_data = {
             "token_id": "test_market_001",
             "condition_id": "cond_001",
             "question": "Will BTC be above $50k?",
-            "end_date": datetime.now(timezone.utc) + timedelta(minutes=5),
+            "end_date": NOW + timedelta(minutes=5),
             "neg_risk": False,
         }
 
@@ -122,14 +138,13 @@ class TestMarketStateIntegration:
         market = enhanced_sniper.state_machine.markets["test_market_001"]
         assert market.state == MarketState.DISCOVERED
 
-    @pytest.mark.asyncio
     async def test_duplicate_market_not_added(self, enhanced_sniper):
         """Test that duplicate markets are not added twice"""
         market_data = {
             "token_id": "test_market_002",
             "condition_id": "cond_002",
             "question": "Test market",
-            "end_date": datetime.now(timezone.utc) + timedelta(minutes=5),
+            "end_date": NOW + timedelta(minutes=5),
             "neg_risk": False,
         }
 
@@ -142,62 +157,41 @@ class TestMarketStateIntegration:
         assert added2 is False
 
 
+@pytest.fixture
+def now_ns():
+    """One monotonic clock reading, so timing assertions don't race the clock"""
+    return time.monotonic_ns()
+
+
 class TestExecutionCriteria:
     """Test trade execution criteria"""
 
-    def test_should_execute_within_window(self, enhanced_sniper):
-        """Test execution within time window"""
+    @pytest.mark.parametrize(
+        "end_offset_sec, ask, last, expected",
+        [
+            pytest.param(0.5, 0.95, 0.96, True, id="within_window"),
+            pytest.param(10, 0.95, 0.96, False, id="outside_window"),
+            pytest.param(0.5, 0.995, 0.99, False, id="price_too_high"),
+            # Last price below the 0.50 threshold
+            pytest.param(0.5, 0.95, 0.40, False, id="price_too_low"),
+        ],
+    )
+    def test_should_execute(self, enhanced_sniper, now_ns, end_offset_sec, ask, last, expected):
+        """Test execution requires the time window and both price limits"""
         market = Market(
             token_id="test_001",
             condition_id="cond_001",
             question="Test",
-            end_time=datetime.now(timezone.utc) + timedelta(seconds=0.5),
-        )
-        prices = {"ask": 0.95, "last": 0.96}
-
-        assert enhanced_sniper.should_execute(market, prices) is True
-
-    def test_should_not_execute_outside_window(self, enhanced_sniper):
-        """Test no execution outside time window"""
-        market = Market(
-            token_id="test_002",
-            condition_id="cond_002",
-            question="Test",
-            end_time=datetime.now(timezone.utc) + timedelta(seconds=10),
-        )
-        prices = {"ask": 0.95, "last": 0.96}
-
-        assert enhanced_sniper.should_execute(market, prices) is False
-
-    def test_should_not_execute_price_too_high(self, enhanced_sniper):
-        """Test no execution when price above max"""
-        market = Market(
-            token_id="test_003",
-            condition_id="cond_003",
-            question="Test",
-            end_time=datetime.now(timezone.utc) + timedelta(seconds=0.5),
-        )
-        prices = {"ask": 0.995, "last": 0.99}
-
-        assert enhanced_sniper.should_execute(market, prices) is False
-
-    def test_should_not_execute_price_too_low(self, enhanced_sniper):
-        """Test no execution when price below threshold"""
-        market = Market(
-            token_id="test_004",
-            condition_id="cond_004",
-            question="Test",
-            end_time=datetime.now(timezone.utc) + timedelta(seconds=0.5),
+            end_time_ns=now_ns + int(end_offset_sec * 1e9),
         )
-        prices = {"ask": 0.95, "last": 0.40}  # Last price below 0.50 threshold
+        prices = {"ask": ask, "last": last}
 
-        assert enhanced_sniper.should_execute(market, prices) is False
+        assert enhanced_sniper.should_execute(market, prices, now_ns) is expected
 
 
 class TestRiskIntegration:
     """Test integration with RiskManager"""
 
-    @pytest.mark.asyncio
     async def test_pre_execution_risk_check_passes(self, enhanced_sniper):
         """Test successful pre-execution risk check"""
         can_execute, reason = await enhanced_sniper.pre_execution_checks(
@@ -209,7 +203,6 @@ class TestRiskIntegration:
         assert can_execute is True
         assert "Approved" in reason
 
-    @pytest.mark.asyncio
     async def test_kill_switch_blocks_execution(self, enhanced_sniper):
         """Test that active kill switch blocks execution"""
         # Activate kill switch using correct API
@@ -231,7 +224,6 @@ class TestRiskIntegration:
 class TestCapitalIntegration:
     """Test integration with CapitalAllocator"""
 
-    @pytest.mark.asyncio
     async def test_capital_allocation_success(self, enhanced_sniper):
         """Test successful capital allocation"""
         result, allocated = await enhanced_sniper.capital_allocator.request_allocation(
@@ -242,7 +234,6 @@ class TestCapitalIntegration:
         assert result == AllocationResult.SUCCESS
         assert allocated == 25.0  # Within limits
 
-    @pytest.mark.asyncio
     async def test_capital_allocation_capped(self, enhanced_sniper):
         """Test capital allocation capped at per-market limit"""
         result, allocated = await enhanced_sniper.capital_allocator.request_allocation(
@@ -257,11 +248,10 @@ class TestCapitalIntegration:
 class TestMetricsIntegration:
     """Test integration with MetricsCollector"""
 
-    @pytest.mark.asyncio
     async def test_trade_metrics_recorded(self, enhanced_sniper):
         """Test that trade metrics are recorded"""
         trade_metrics = TradeMetrics(
-            timestamp=datetime.now(timezone.utc),
+            timestamp=NOW,
             market_id="test_market",
             attempted=True,
             filled=True,
@@ -280,14 +270,13 @@ class TestMetricsIntegration:
 class TestDryRunExecution:
     """Test dry run execution mode"""
 
-    @pytest.mark.asyncio
-    async def test_dry_run_execution(self, enhanced_sniper):
+    async def test_dry_run_execution(self, enhanced_sniper, now_ns):
         """Test execution in dry run mode"""
         market = Market(
             token_id="dry_run_test",
             condition_id="cond_dry",
             question="Test market",
-            end_time=datetime.now(timezone.utc) + timedelta(seconds=0.5),
+            end_time_ns=now_ns + 500_000_000,
             is_neg_risk=False,
         )
 
@@ -310,7 +299,7 @@ class TestDryRunExecution:
 
         # Check if trade would execute (depends on state)
         prices = enhanced_sniper.market_prices["dry_run_test"]
-        should_exec = enhanced_sniper.should_execute(market, prices)
+        should_exec = enhanced_sniper.should_execute(market, prices, now_ns)
 
         # Should be True since we're within the execution window
         assert should_exec is True
@@ -319,7 +308,6 @@ class TestDryRunExecution:
 class TestPriceUpdates:
     """Test price update handling"""
 
-    @pytest.mark.asyncio
     async def test_handle_price_update(self, enhanced_sniper):
         """Test price update processing"""
         # Subscribe to market
@@ -343,7 +331,6 @@ class TestPriceUpdates:
 class TestMultiMarketMode:
     """Test multi-market mode functionality"""
 
-    @pytest.mark.asyncio
     async def test_multi_market_subscription(self, enhanced_sniper):
         """Test subscribing to multiple markets"""
         enhanced_sniper.sniper_config.multi_market_mode = True
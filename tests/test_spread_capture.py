@@ -0,0 +1,593 @@
+"""
+Tests for Spread Capture Strategy
+=================================
+
+Covers the struct-of-arrays price table, the eligible-market cache,
+opportunity screening and batched order placement.
+"""
+
+import asyncio
+import json
+import pytest
+import time
+import numpy as np
+from datetime import datetime, timezone, timedelta
+from unittest.mock import AsyncMock, MagicMock
+
+from strategies.spread_capture import (
+    PriceTable, SpreadCaptureConfig, SpreadCaptureStrategy, SpreadOpportunity,
+    _CRYPTO_RE, _parse_iso8601_to_epoch,
+)
+from strategies.position_tracker import PositionTracker
+from strategies.order_manager import OrderManager, OrderSpec, OrderStatus
+
+
+@pytest.fixture
+def strategy():
+    """Spread capture strategy with mocked executor and order manager"""
+    config = MagicMock()
+    config.dry_run = True
+    config.starting_bankroll = 100.0
+    return SpreadCaptureStrategy(
+        config=config,
+        executor=MagicMock(),
+        position_tracker=PositionTracker(max_positions=5),
+        order_manager=MagicMock(),
+    )
+
+
+def make_market(question: str, expires_in: timedelta, tokens=("yes_token", "no_token")) -> dict:
+    """Parsed market record as produced by _fetch_markets"""
+    end_date = datetime.now(timezone.utc) + expires_in
+    return {
+        "condition_id": "cond_123",
+        "question": question,
+        "end_epoch": end_date.timestamp(),
+        "end_date": end_date,
+        "is_crypto": "bitcoin" in question.lower(),
+        "neg_risk": False,
+        "tokens": [{"token_id": t, "outcome": o} for t, o in zip(tokens, ("Yes", "No"))],
+    }
+
+
+class TestPriceTable:
+    """Tests for PriceTable"""
+
+    def test_update_assigns_stable_rows(self):
+        """Test each token keeps the row it was first given"""
+        table = PriceTable()
+
+        first = table.update("token_a", bid=0.40, ask=0.45, bid_size=10, ask_size=20, now=100.0)
+        second = table.update("token_b", bid=0.50, ask=0.55, bid_size=5, ask_size=5, now=100.0)
+        again = table.update("token_a", bid=0.41, ask=0.44, bid_size=1, ask_size=2, now=101.0)
+
+        assert first == again == 0
+        assert second == 1
+        assert len(table) == 2
+        assert table.bid[first] == pytest.approx(0.41)
+        assert table.ask[second] == pytest.approx(0.55)
+
+    def test_grows_and_preserves_rows(self):
+        """Test capacity doubles without losing existing data"""
+        table = PriceTable(capacity=2)
+
+        for i in range(5):
+            table.update(f"token_{i}", bid=i / 10, ask=i / 10 + 0.05, bid_size=1, ask_size=1, now=100.0)
+
+        assert table.capacity == 8
+        assert len(table) == 5
+        assert table.bid[table.index["token_3"]] == pytest.approx(0.3)
+
+    def test_pair_links_rows_both_ways(self):
+        """Test paired_idx points each token at its counterpart"""
+        table = PriceTable(capacity=2)
+        table.update("solo", bid=0.4, ask=0.5, bid_size=1, ask_size=1)
+        table.pair("yes_token", "no_token")
+
+        yes, no = table.index["yes_token"], table.index["no_token"]
+        assert table.paired_idx[yes] == no
+        assert table.paired_idx[no] == yes
+        assert table.paired_idx[table.index["solo"]] == -1
+        assert table.tokens[no] == "no_token"
+
+    def test_age_and_stale_mask(self):
+        """Test freshness checks for known and unknown tokens"""
+        table = PriceTable()
+        table.update("old", bid=0.4, ask=0.5, bid_size=1, ask_size=1, now=100.0)
+        table.update("fresh", bid=0.4, ask=0.5, bid_size=1, ask_size=1, now=104.5)
+
+        assert table.age("fresh", 105.0) == pytest.approx(0.5)
+        assert table.age("missing", 105.0) == float("inf")
+        assert table.stale_mask(105.0, 1.0).tolist() == [True, False]
+
+
+@pytest.mark.parametrize("question,expected", [
+    ("Will BITCOIN be up at 3:15pm?", True),
+    ("Ethereum above $4k?", True),
+    ("SOL / Solana up or down", True),
+    ("Will it rain in NYC?", False),
+])
+def test_crypto_keyword_match(question, expected):
+    """Test crypto questions are detected case-insensitively"""
+    assert (_CRYPTO_RE.search(question) is not None) is expected
+
+
+@pytest.mark.parametrize("value", [
+    "2026-01-30T15:15:00Z",
+    "2026-01-30T15:15:00+00:00",
+    "2026-01-30T10:15:00-05:00",
+    "2026-01-30T15:15:00",
+])
+def test_parse_iso8601_to_epoch(value):
+    """Test Z suffix, offsets and naive timestamps all resolve to UTC epoch"""
+    expected = datetime(2026, 1, 30, 15, 15, tzinfo=timezone.utc).timestamp()
+    assert _parse_iso8601_to_epoch(value) == expected
+
+
+class TestEligibleMarketCache:
+    """Tests for the eligible-market list cache"""
+
+    async def test_reuses_cache_within_ttl(self, strategy):
+        """Test market list is fetched once per TTL window"""
+        strategy._fetch_markets = AsyncMock(return_value=[
+            make_market("Bitcoin up in 15 min?", timedelta(minutes=10)),
+            make_market("Will it rain?", timedelta(minutes=10), tokens=("rain_yes", "rain_no")),
+        ])
+
+        first = await strategy._fetch_eligible_markets()
+        second = await strategy._fetch_eligible_markets()
+
+        assert strategy._fetch_markets.await_count == 1
+        assert [m["token_id"] for m in first] == ["yes_token", "no_token"]
+        assert first == second
+
+    async def test_refetches_after_rollover(self, strategy):
+        """Test cache is dropped once its soonest eligible market leaves the window"""
+        strategy._fetch_markets = AsyncMock(return_value=[
+            make_market("Bitcoin up in 15 min?", timedelta(minutes=10)),
+        ])
+        await strategy._fetch_eligible_markets()
+
+        strategy._markets_cache_rollover = time.time() - 1
+        await strategy._fetch_eligible_markets()
+
+        assert strategy._fetch_markets.await_count == 2
+
+    async def test_invalidate_forces_refetch(self, strategy):
+        """Test explicit invalidation"""
+        strategy._fetch_markets = AsyncMock(return_value=[])
+        await strategy._fetch_eligible_markets()
+        strategy.invalidate_markets_cache()
+        await strategy._fetch_eligible_markets()
+
+        assert strategy._fetch_markets.await_count == 2
+
+
+class TestMarketIngest:
+    """Tests for parsing the Gamma market list"""
+
+    async def test_token_ids_interned(self, strategy):
+        """Test repeated fetches share one string object per token ID"""
+        body = json.dumps([{
+            "question": "Bitcoin up in 15 min?",
+            "endDate": "2030-01-01T00:00:00Z",
+            "tokens": [{"token_id": "1234567890" * 7}, {"token_id": "9876543210" * 7}],
+        }]).encode()
+
+        response = MagicMock(status=200)
+        response.read = AsyncMock(return_value=body)
+        response.__aenter__ = AsyncMock(return_value=response)
+        response.__aexit__ = AsyncMock(return_value=False)
+        strategy._session = MagicMock(closed=False)
+        strategy._session.get = MagicMock(return_value=response)
+
+        first = await strategy._fetch_markets()
+        second = await strategy._fetch_markets()
+
+        first_id = first[0]["tokens"][0]["token_id"]
+        assert first_id is second[0]["tokens"][0]["token_id"]
+        assert first_id is strategy.prices.tokens[strategy.prices.index[first_id]]
+        assert strategy.prices.paired_idx[strategy.prices.index[first_id]] >= 0
+
+
+class TestRequestConcurrency:
+    """Tests for the per-host outbound request caps"""
+
+    async def test_clob_requests_bounded(self, strategy):
+        """Test concurrent book fetches never exceed the CLOB semaphore"""
+        strategy._clob_sem = asyncio.BoundedSemaphore(2)
+        in_flight = peak = 0
+
+        class Response:
+            status = 200
+
+            async def __aenter__(self):
+                nonlocal in_flight, peak
+                in_flight += 1
+                peak = max(peak, in_flight)
+                await asyncio.sleep(0.01)
+                return self
+
+            async def __aexit__(self, *exc):
+                nonlocal in_flight
+                in_flight -= 1
+                return False
+
+            async def read(self):
+                return b"[]"
+
+        strategy._session = MagicMock(closed=False)
+        strategy._session.post = MagicMock(side_effect=lambda *a, **kw: Response())
+
+        await asyncio.gather(*(strategy._fetch_orderbooks_batch([f"t{i}"]) for i in range(6)))
+
+        assert strategy._session.post.call_count == 6
+        assert peak == 2
+
+
+class TestArbitragePairing:
+    """Tests for per-scan arbitrage pair deduplication"""
+
+    async def test_pair_checked_once_per_scan(self, strategy):
+        """Test a YES/NO pair yields one arbitrage opportunity and its leg is not traded again"""
+        strategy._fetch_markets = AsyncMock(return_value=[
+            make_market("Bitcoin up in 15 min?", timedelta(minutes=10)),
+        ])
+        strategy.prices.pair("yes_token", "no_token")
+        strategy.prices.update("yes_token", bid=0.45, ask=0.47, bid_size=10, ask_size=10)
+        strategy.prices.update("no_token", bid=0.46, ask=0.48, bid_size=10, ask_size=10)
+        strategy._execute_opportunities = AsyncMock(return_value=1)
+
+        await strategy._scan_markets()
+
+        assert strategy.arbitrage_opportunities == 1
+        (opp,) = strategy._execute_opportunities.await_args.args[0]
+        assert opp.combined_cost == pytest.approx(0.95)
+        assert opp.paired_token_id == "no_token"
+
+
+    async def test_single_leg_fills_slot_an_arbitrage_cannot(self, strategy):
+        """Test an arbitrage needing two slots is skipped, not the rest of the scan"""
+        # One slot left: two allowed, one held
+        strategy.spread_config.max_concurrent_positions = 2
+        await strategy.position_tracker.add_position("held_token", "YES", entry_price=0.45, size=10)
+        strategy._fetch_markets = AsyncMock(return_value=[
+            make_market("Bitcoin up in 15 min?", timedelta(minutes=10)),
+            make_market(
+                "Bitcoin above 100k?", timedelta(minutes=10),
+                tokens=("solo_yes", "solo_no"),
+            ),
+        ])
+        strategy.prices.pair("yes_token", "no_token")
+        strategy.prices.update("yes_token", bid=0.45, ask=0.47, bid_size=10, ask_size=10)
+        # The NO leg's own spread is too tight to trade alone
+        strategy.prices.update("no_token", bid=0.476, ask=0.48, bid_size=10, ask_size=10)
+        strategy.prices.update("solo_yes", bid=0.30, ask=0.32, bid_size=10, ask_size=10)
+        strategy.prices.update("solo_no", bid=0.68, ask=0.685, bid_size=10, ask_size=10)  # Too tight
+        strategy._execute_opportunities = AsyncMock(return_value=1)
+
+        await strategy._scan_markets()
+
+        opps, _ = strategy._execute_opportunities.await_args.args
+        assert strategy.arbitrage_opportunities == 1
+        assert [(o.token_id, o.paired_token_id) for o in opps] == [("solo_yes", None)]
+
+
+class TestScanSnapshot:
+    """Tests for the per-scan position snapshot"""
+
+    async def test_scan_reads_tracker_once_and_skips_held(self, strategy):
+        """Test held tokens are skipped using a single snapshot"""
+        strategy._fetch_markets = AsyncMock(return_value=[
+            make_market("Bitcoin up in 15 min?", timedelta(minutes=10)),
+        ])
+        await strategy.position_tracker.add_position("yes_token", "YES", entry_price=0.45, size=10)
+        strategy.prices.update("no_token", bid=0.46, ask=0.48, bid_size=10, ask_size=10)
+        strategy._execute_opportunities = AsyncMock(return_value=0)
+        strategy.position_tracker.get_position = AsyncMock()
+
+        snapshot = strategy.position_tracker.snapshot
+        strategy.position_tracker.snapshot = AsyncMock(side_effect=snapshot)
+
+        await strategy._scan_markets()
+
+        strategy.position_tracker.snapshot.assert_awaited_once()
+        strategy.position_tracker.get_position.assert_not_awaited()
+        opps, exposure = strategy._execute_opportunities.await_args.args
+        assert [opp.token_id for opp in opps] == ["no_token"]
+        assert exposure == pytest.approx(10)
+
+
+class TestOpportunityScreen:
+    """Tests for the vectorized opportunity screen"""
+
+    def test_screen_filters_spread_and_flags_arbitrage(self, strategy):
+        """Test spread bounds, missing books and arbitrage pairs"""
+        prices = strategy.prices
+        tight = prices.update("tight", bid=0.50, ask=0.505, bid_size=1, ask_size=1)     # 1% spread
+        good = prices.update("good", bid=0.45, ask=0.47, bid_size=1, ask_size=1)        # ~4.4%
+        pair = prices.update("pair", bid=0.46, ask=0.48, bid_size=1, ask_size=1)        # ~4.3%
+        wide = prices.update("wide", bid=0.20, ask=0.40, bid_size=1, ask_size=1)        # 100%
+
+        rows = np.array([tight, good, pair, wide, -1])
+        paired_rows = np.array([-1, pair, good, -1, -1])
+
+        hits, arb_mask = strategy._screen_opportunities(rows, paired_rows)
+
+        assert hits.tolist() == [1, 2]
+        assert arb_mask.tolist() == [False, True, True, False, False]
+
+
+class TestPositionPriceRefresh:
+    """Tests for position price updates in _manage_positions"""
+
+    async def test_only_stale_books_are_refetched(self, strategy):
+        """Test fresh books are reused and stale ones fetched in one batch"""
+        await strategy.position_tracker.add_position("fresh", "YES", entry_price=0.40, size=10)
+        await strategy.position_tracker.add_position("stale", "YES", entry_price=0.40, size=10)
+        strategy.prices.update("fresh", bid=0.42, ask=0.44, bid_size=1, ask_size=1)
+
+        async def fetch_batch(token_ids):
+            for token_id in token_ids:
+                strategy.prices.update(token_id, bid=0.38, ask=0.41, bid_size=1, ask_size=1)
+            return len(token_ids)
+
+        strategy._fetch_orderbooks_batch = AsyncMock(side_effect=fetch_batch)
+
+        await strategy._manage_positions()
+
+        strategy._fetch_orderbooks_batch.assert_awaited_once_with(["stale"])
+        fresh = await strategy.position_tracker.get_position("fresh")
+        stale = await strategy.position_tracker.get_position("stale")
+        assert fresh.current_price == pytest.approx(0.42)
+        assert stale.current_price == pytest.approx(0.38)
+
+
+class TestBookStream:
+    """Tests for applying market-channel events to the price table"""
+
+    def test_book_event_writes_top_of_book(self, strategy):
+        """Test a book snapshot populates bid/ask and sizes"""
+        strategy._handle_book_event({
+            "event_type": "book",
+            "asset_id": "token_a",
+            "bids": [{"price": "0.44", "size": "120"}],
+            "asks": [{"price": "0.46", "size": "80"}],
+        })
+
+        idx = strategy.prices.index["token_a"]
+        assert strategy.prices.bid[idx] == pytest.approx(0.44)
+        assert strategy.prices.ask_size[idx] == pytest.approx(80)
+
+    def test_price_change_updates_quote_only(self, strategy):
+        """Test price_change moves best bid/ask and keeps sizes"""
+        strategy.prices.update("token_a", bid=0.44, ask=0.46, bid_size=120, ask_size=80, now=100.0)
+
+        strategy._handle_book_event({
+            "event_type": "price_change",
+            "price_changes": [
+                {"asset_id": "token_a", "price": "0.45", "side": "BUY", "best_bid": "0.45", "best_ask": "0.46"},
+            ],
+        })
+
+        idx = strategy.prices.index["token_a"]
+        assert strategy.prices.bid[idx] == pytest.approx(0.45)
+        assert strategy.prices.bid_size[idx] == pytest.approx(120)
+        assert strategy.prices.last_update[idx] > 100.0
+
+
+class TestBatchOrders:
+    """Tests for batched order placement and cancellation"""
+
+    @pytest.fixture
+    def order_manager(self):
+        """Order manager over a mocked batch-capable executor"""
+        executor = MagicMock()
+        executor.place_limit_orders = AsyncMock(return_value=["order_1", "order_2"])
+        executor.cancel_orders = AsyncMock(side_effect=lambda ids: list(ids))
+        return OrderManager(executor)
+
+    async def test_place_batch_buy_tracks_all_orders(self, order_manager):
+        """Test both legs are submitted in one call and tracked"""
+        order_ids = await order_manager.place_batch_buy([
+            OrderSpec(token_id="yes_token", side="YES", price=0.47, size=10),
+            OrderSpec(token_id="no_token", side="NO", price=0.48, size=10),
+        ])
+
+        assert order_ids == ["order_1", "order_2"]
+        order_manager.executor.place_limit_orders.assert_awaited_once()
+        assert order_manager.total_orders_placed == 2
+        assert order_manager.orders["order_2"].action == "BUY"
+
+    async def test_cancel_all_for_market_uses_one_request(self, order_manager):
+        """Test market cancel issues a single batch cancel"""
+        await order_manager.place_batch_buy([
+            OrderSpec(token_id="yes_token", side="YES", price=0.47, size=10),
+            OrderSpec(token_id="yes_token", side="YES", price=0.46, size=10),
+        ])
+
+        cancelled = await order_manager.cancel_all_for_market("yes_token")
+
+        assert cancelled == 2
+        order_manager.executor.cancel_orders.assert_awaited_once_with(["order_1", "order_2"])
+        assert not order_manager.orders["order_1"].is_active
+
+    async def test_scan_opportunities_placed_in_one_batch(self, strategy, order_manager):
+        """Test arbitrage and spread opportunities share one order and one tracker call"""
+        order_manager.executor.place_limit_orders = AsyncMock(return_value=["order_1", "order_2", "order_3"])
+        strategy.order_manager = order_manager
+        add_positions = strategy.position_tracker.add_positions
+        strategy.position_tracker.add_positions = AsyncMock(side_effect=add_positions)
+
+        arbitrage = SpreadOpportunity(
+            token_id="yes_token", side="YES", market_question="Bitcoin up?", market_expiry=None,
+            bid=0.45, ask=0.47, mid=0.46, spread_pct=4.4,
+            paired_token_id="no_token", paired_ask=0.48,
+            combined_cost=0.95, arbitrage_profit=0.05,
+        )
+        spread = SpreadOpportunity(
+            token_id="eth_token", side="YES", market_question="ETH up?", market_expiry=None,
+            bid=0.30, ask=0.32, mid=0.31, spread_pct=6.7,
+        )
+
+        assert await strategy._execute_opportunities([arbitrage, spread], 0.0) == 2
+
+        (orders,), _ = order_manager.executor.place_limit_orders.await_args
+        assert [o["token_id"] for o in orders] == ["yes_token", "no_token", "eth_token"]
+        strategy.position_tracker.add_positions.assert_awaited_once()
+        positions = await strategy.position_tracker.snapshot()
+        assert positions["no_token"].side == "NO"
+        assert positions["eth_token"].order_id == "order_3"
+        assert strategy._position_event.is_set()
+
+    def test_allocate_sizes_fills_budget_in_order(self, strategy):
+        """Test sizes shrink to the remaining budget and then to zero"""
+        sizes = strategy._allocate_sizes(10.0, 35.0, np.array([2, 1, 1, 1]))
+        assert sizes.tolist() == pytest.approx([10.0, 10.0, 5.0, 0.0])
+
+    async def test_cancel_and_place_replaces_market_orders(self, order_manager):
+        """Test replacement ignores the cancelled orders when checking the market limit"""
+        order_manager.max_orders_per_market = 2
+        order_manager.executor.place_limit_order = AsyncMock(return_value="order_3")
+        await order_manager.place_batch_buy([
+            OrderSpec(token_id="yes_token", side="YES", price=0.47, size=10),
+            OrderSpec(token_id="yes_token", side="YES", price=0.46, size=10),
+        ])
+
+        order_id = await order_manager.cancel_and_place(
+            await order_manager.get_active_order_ids("yes_token"),
+            OrderSpec(token_id="yes_token", side="YES", price=0.50, size=10),
+        )
+
+        assert order_id == "order_3"
+        order_manager.executor.cancel_orders.assert_awaited_once_with(["order_1", "order_2"])
+        assert await order_manager.get_active_order_ids("yes_token") == ["order_3"]
+        assert order_manager.orders["order_3"].action == "SELL"
+
+    async def test_exit_position_replaces_pending_orders(self, strategy, order_manager):
+        """Test exit issues one cancel-and-place and closes the position"""
+        order_manager.cancel_and_place = AsyncMock(return_value="order_3")
+        strategy.order_manager = order_manager
+        await order_manager.place_batch_buy([
+            OrderSpec(token_id="yes_token", side="YES", price=0.47, size=10),
+        ])
+        await strategy.position_tracker.add_position(
+            token_id="yes_token", side="YES", entry_price=0.47, size=10,
+        )
+        position = await strategy.position_tracker.get_position("yes_token")
+
+        await strategy._exit_position(position, "target_hit")
+
+        cancel_ids, spec = order_manager.cancel_and_place.await_args.args
+        assert cancel_ids == ["order_1"]
+        assert spec.metadata == {"exit_reason": "target_hit"}
+        assert await strategy.position_tracker.get_all_positions() == []
+
+    async def test_incomplete_arbitrage_batch_cancels_survivor(self, strategy, order_manager):
+        """Test a lone arbitrage leg is cancelled and no position is opened"""
+        order_manager.executor.place_limit_orders = AsyncMock(return_value=["order_1", None])
+        strategy.order_manager = order_manager
+
+        opp = SpreadOpportunity(
+            token_id="yes_token", side="YES", market_question="Bitcoin up?", market_expiry=None,
+            bid=0.45, ask=0.47, mid=0.46, spread_pct=4.4,
+            paired_token_id="no_token", paired_ask=0.48,
+            combined_cost=0.95, arbitrage_profit=0.05,
+        )
+        assert await strategy._execute_opportunities([opp], 0.0) == 0
+
+        order_manager.executor.cancel_orders.assert_awaited_once_with(["order_1"])
+        assert await strategy.position_tracker.get_all_positions() == []
+
+
+class TestPositionWakeup:
+    """Tests for event-driven position management wakeups"""
+
+    async def test_deadline_delay(self, strategy):
+        """Test the loop waits on events only when flat and is capped otherwise"""
+        assert strategy._next_deadline_delay([]) is None
+
+        await strategy.position_tracker.add_position(
+            "token_a", "YES", entry_price=0.40, size=10, max_hold_seconds=600,
+            market_expiry=datetime.now(timezone.utc) + timedelta(seconds=60.3),
+        )
+        positions = await strategy.position_tracker.get_all_positions()
+
+        # Pre-expiry exit (60s before close) is ~0.3s away
+        assert strategy._next_deadline_delay(positions) == pytest.approx(0.3, abs=0.05)
+
+    def test_held_token_push_sets_event(self, strategy):
+        """Test only pushes for held tokens wake the position loop"""
+        strategy.position_tracker.positions["held"] = MagicMock()
+        book = {"event_type": "book", "bids": [], "asks": []}
+
+        strategy._handle_book_event({**book, "asset_id": "other"})
+        assert not strategy._position_event.is_set()
+
+        strategy._handle_book_event({**book, "asset_id": "held"})
+        assert strategy._position_event.is_set()
+
+
+class TestSizing:
+    """Tests for bankroll-based position sizing"""
+
+    def test_sizing_tracks_realized_pnl_and_caps(self):
+        """Test percentage sizing compounds on realized P&L and respects hard caps"""
+        config = MagicMock()
+        config.starting_bankroll = 100.0
+        tracker = PositionTracker()
+        strategy = SpreadCaptureStrategy(
+            config=config,
+            executor=MagicMock(),
+            position_tracker=tracker,
+            order_manager=MagicMock(),
+            spread_config=SpreadCaptureConfig(max_position_usd=30.0, max_total_exposure_usd=60.0),
+        )
+
+        assert strategy.calculate_position_size() == pytest.approx(25.0)
+        assert strategy.calculate_max_exposure() == pytest.approx(60.0)
+
+        tracker.total_realized_pnl = 40.0
+        assert strategy.calculate_position_size() == pytest.approx(30.0)
+        assert strategy.current_bankroll == pytest.approx(140.0)
+
+        tracker.total_realized_pnl = -99.5
+        assert strategy.calculate_position_size() == pytest.approx(1.0)
+
+
+class TestUserOrderStream:
+    """Tests for applying pushed user-channel order events"""
+
+    @pytest.fixture
+    def order_manager(self):
+        """Order manager holding one tracked $10 buy"""
+        manager = OrderManager(MagicMock())
+        manager._track_order("order_1", "yes_token", "YES", "BUY", 0.47, 10.0)
+        return manager
+
+    async def test_order_updates_apply_cumulative_fills(self, order_manager):
+        """Test PLACEMENT opens the order and UPDATEs move it to filled"""
+        assert await order_manager.apply_event({"event_type": "order", "id": "order_1", "type": "PLACEMENT", "size_matched": "0"})
+        assert order_manager.orders["order_1"].status == OrderStatus.OPEN
+
+        await order_manager.apply_event({"event_type": "order", "id": "order_1", "type": "UPDATE", "size_matched": "4"})
+        assert order_manager.orders["order_1"].status == OrderStatus.PARTIALLY_FILLED
+
+        await order_manager.apply_event({"event_type": "order", "id": "order_1", "type": "UPDATE", "size_matched": "10"})
+        assert order_manager.orders["order_1"].status == OrderStatus.FILLED
+        assert order_manager.total_orders_filled == 1
+        assert order_manager.total_volume_filled == pytest.approx(10.0)
+
+    async def test_cancellation_and_unrelated_events(self, order_manager):
+        """Test CANCELLATION is applied while trade and unknown-order events are ignored"""
+        assert not await order_manager.apply_event({"event_type": "trade", "taker_order_id": "order_1", "size": "10"})
+        assert not await order_manager.apply_event({"event_type": "order", "id": "other", "type": "CANCELLATION"})
+
+        assert await order_manager.apply_event({"event_type": "order", "id": "order_1", "type": "CANCELLATION"})
+        assert order_manager.orders["order_1"].status == OrderStatus.CANCELLED
+
+    async def test_user_stream_disabled_in_dry_run(self, strategy):
+        """Test the user stream does not connect without live credentials"""
+        strategy.running = True
+        await strategy._ws_user_loop()
+        assert not strategy._user_stream_live
@@ -0,0 +1,226 @@
+"""
+Tests for TradeLogger (utils/trade_logger.py)
+=============================================
+
+Covers the background writer thread: flush, close, restarting after
+close, daily rotation, dropping entries when the queue is full, the
+batch deadline, fsync of durable events and whole-line appends.
+"""
+
+import json
+import threading
+import time
+from datetime import datetime, timezone
+
+import pytest
+
+import utils.trade_logger as trade_logger_module
+from utils.trade_logger import TradeLogger
+
+
+class FrozenDatetime(datetime):
+    """datetime whose now() returns a settable instant"""
+
+    current = datetime(2025, 1, 1, 12, 0, tzinfo=timezone.utc)
+
+    @classmethod
+    def now(cls, tz=None):
+        return cls.current
+
+
+def read_entries(path):
+    """Parsed JSONL entries in a log file"""
+    with open(path, "rb") as f:
+        return [json.loads(line) for line in f]
+
+
+def wait_for(predicate, timeout=2.0):
+    """Poll predicate until it is true or timeout seconds pass"""
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        if time.monotonic() > deadline:
+            return False
+        time.sleep(0.005)
+    return True
+
+
+@pytest.fixture
+def trade_logger(tmp_path):
+    """TradeLogger writing to a temporary directory"""
+    tl = TradeLogger(log_dir=str(tmp_path))
+    yield tl
+    tl.close()
+
+
+def test_flush_writes_queued_entries(trade_logger):
+    """Test flush() returns once queued entries are in the file"""
+    for i in range(3):
+        trade_logger.log_scan(markets_found=i, asset="BTC", scan_mode="test")
+    trade_logger.flush()
+
+    entries = read_entries(trade_logger.log_file)
+    assert [e["markets_found"] for e in entries] == [0, 1, 2]
+    assert all(e["event_type"] == "SCAN" for e in entries)
+
+
+def test_flush_fsyncs(trade_logger, monkeypatch):
+    """Test flush() leaves the entries durable, not just written"""
+    fsynced = []
+    real_fsync = trade_logger_module.os.fsync
+
+    def record_fsync(fd):
+        fsynced.append(fd)
+        real_fsync(fd)
+
+    monkeypatch.setattr(trade_logger_module.os, "fsync", record_fsync)
+
+    trade_logger.log_scan(markets_found=1, asset="BTC", scan_mode="test")
+    trade_logger.flush()
+
+    assert len(fsynced) == 1
+
+
+def test_close_drains_queue(trade_logger):
+    """Test close() writes everything queued before stopping the writer"""
+    for i in range(100):
+        trade_logger.log_scan(markets_found=i, asset="BTC", scan_mode="test")
+    trade_logger.close()
+
+    assert len(read_entries(trade_logger.log_file)) == 100
+    assert trade_logger._writer is None
+
+
+def test_logging_after_close_restarts_writer(trade_logger):
+    """Test an entry logged after close() is written without a flush()"""
+    trade_logger.close()
+    trade_logger.log_scan(markets_found=1, asset="BTC", scan_mode="test")
+
+    assert trade_logger._writer is not None and trade_logger._writer.is_alive()
+    assert wait_for(lambda: trade_logger.log_file.exists()
+                    and len(read_entries(trade_logger.log_file)) == 1)
+
+
+def test_daily_rotation(tmp_path, monkeypatch):
+    """Test entries go to the file for their UTC day"""
+    monkeypatch.setattr(trade_logger_module, "datetime", FrozenDatetime)
+    monkeypatch.setattr(FrozenDatetime, "current",
+                        datetime(2025, 1, 1, 23, 59, 59, tzinfo=timezone.utc))
+    tl = TradeLogger(log_dir=str(tmp_path))
+    try:
+        tl.log_scan(markets_found=1, asset="BTC", scan_mode="test")
+        monkeypatch.setattr(FrozenDatetime, "current",
+                            datetime(2025, 1, 2, 0, 0, 1, tzinfo=timezone.utc))
+        tl.log_scan(markets_found=2, asset="BTC", scan_mode="test")
+        tl.flush()
+    finally:
+        tl.close()
+
+    day1 = read_entries(tmp_path / "trades_2025-01-01.jsonl")
+    day2 = read_entries(tmp_path / "trades_2025-01-02.jsonl")
+    assert [e["markets_found"] for e in day1] == [1]
+    assert [e["markets_found"] for e in day2] == [2]
+    assert day2[0]["day_of_week"] == "Thursday"
+    assert tl.current_date == "2025-01-02"
+
+
+def test_full_queue_drops_entries(tmp_path):
+    """Test entries are dropped and counted when the writer falls behind"""
+    gate = threading.Event()
+
+    class BlockedLogger(TradeLogger):
+        QUEUE_SIZE = 2
+
+        def _rotate_if_needed(self, now):
+            gate.wait()
+            super()._rotate_if_needed(now)
+
+    tl = BlockedLogger(log_dir=str(tmp_path))
+    try:
+        # The writer takes the first entry and blocks on it
+        tl.log_scan(markets_found=0, asset="BTC", scan_mode="test")
+        assert wait_for(lambda: tl._queue.qsize() == 0)
+
+        for i in range(1, 6):
+            tl.log_scan(markets_found=i, asset="BTC", scan_mode="test")
+        assert tl.dropped_entries == 3
+
+        gate.set()
+        tl.flush()
+    finally:
+        gate.set()
+        tl.close()
+
+    assert [e["markets_found"] for e in read_entries(tl.log_file)] == [0, 1, 2]
+
+
+def test_batch_written_after_deadline(tmp_path):
+    """Test a batched entry is written once BATCH_DELAY_SEC passes, without flush()"""
+
+    class SlowBatchLogger(TradeLogger):
+        BATCH_DELAY_SEC = 0.2
+
+    tl = SlowBatchLogger(log_dir=str(tmp_path))
+    try:
+        logged_at = time.monotonic()
+        tl.log_scan(markets_found=1, asset="BTC", scan_mode="test")
+        assert wait_for(lambda: tl.log_file.exists())
+        assert time.monotonic() - logged_at >= SlowBatchLogger.BATCH_DELAY_SEC
+        assert len(read_entries(tl.log_file)) == 1
+    finally:
+        tl.close()
+
+
+def test_durable_events_written_and_fsynced(tmp_path, monkeypatch):
+    """Test EXECUTION entries skip the batch window and are fsynced"""
+    fsynced = []
+    real_fsync = trade_logger_module.os.fsync
+
+    def record_fsync(fd):
+        fsynced.append(fd)
+        real_fsync(fd)
+
+    monkeypatch.setattr(trade_logger_module.os, "fsync", record_fsync)
+
+    class LongBatchLogger(TradeLogger):
+        BATCH_DELAY_SEC = 60.0
+
+    tl = LongBatchLogger(log_dir=str(tmp_path))
+    try:
+        tl.log_scan(markets_found=1, asset="BTC", scan_mode="test")
+        tl.log_execution(
+            token_id="0xabc", side="YES", size=5.0, price=0.95,
+            order_type="FOK", success=True,
+        )
+        # Written long before the 60s batch window, and the batched scan with it
+        assert wait_for(lambda: len(fsynced) == 1)
+        assert [e["event_type"] for e in read_entries(tl.log_file)] == ["SCAN", "EXECUTION"]
+    finally:
+        tl.close()
+
+
+def test_writes_end_on_line_boundaries(tmp_path, monkeypatch):
+    """Test every os.write call carries whole JSONL lines"""
+    chunks = []
+    real_write = trade_logger_module.os.write
+
+    def record_write(fd, data):
+        chunks.append(bytes(data))
+        return real_write(fd, data)
+
+    monkeypatch.setattr(trade_logger_module.os, "write", record_write)
+
+    class SmallBufferLogger(TradeLogger):
+        BUFFER_SIZE = 512
+
+    tl = SmallBufferLogger(log_dir=str(tmp_path))
+    try:
+        for i in range(200):
+            tl.log_scan(markets_found=i, asset="BTC", scan_mode="test")
+        tl.flush()
+    finally:
+        tl.close()
+
+    assert len(chunks) > 1
+    assert all(chunk.endswith(b"\n") for chunk in chunks)
+    assert b"".join(chunks) == tl.log_file.read_bytes()
+    assert [e["markets_found"] for e in read_entries(tl.log_file)] == list(range(200))
@@ -2,12 +2,22 @@
 Notification utilities - Telegram & Discord alerts
 """
 
+import asyncio
 import aiohttp
 import logging
-from typing import Optional
+from typing import Any, Dict, Optional
 
 logger = logging.getLogger(__name__)
 
+# httpx + h2 are optional - alerts share one multiplexed HTTP/2 connection
+# per host instead of HTTP/1.1 keep-alive (falls back to aiohttp)
+try:
+    import httpx
+    import h2  # noqa: F401 - required by httpx for http2=True
+    HTTPX_AVAILABLE = True
+except ImportError:
+    HTTPX_AVAILABLE = False
+
 
 class Notifier:
     """Send alerts to Telegram and Discord"""
@@ -16,28 +26,63 @@ class Notifier:
         self.telegram_token = telegram_token
         self.telegram_chat = telegram_chat
         self.discord_webhook = discord_webhook
+        self._telegram_enabled = bool(telegram_token and telegram_chat)
+        self._discord_enabled = bool(discord_webhook)
+        # One keep-alive client for every alert, created on first send
+        self._client = None
+        self._session: Optional[aiohttp.ClientSession] = None
+
+    def _get_client(self) -> "httpx.AsyncClient":
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(
+                http2=True,
+                timeout=3.0,
+                limits=httpx.Limits(max_connections=10, max_keepalive_connections=5),
+            )
+        return self._client
+
+    def _get_session(self) -> aiohttp.ClientSession:
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=10, ttl_dns_cache=300, keepalive_timeout=60),
+                timeout=aiohttp.ClientTimeout(total=3),
+            )
+        return self._session
+
+    async def _post(self, url: str, payload: Dict[str, Any]) -> int:
+        """POST a JSON payload and return the HTTP status"""
+        if HTTPX_AVAILABLE:
+            response = await self._get_client().post(url, json=payload)
+            return response.status_code
+        async with self._get_session().post(url, json=payload) as response:
+            return response.status
+
+    async def close(self):
+        """Close the shared HTTP client"""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
 
     async def send_telegram(self, message: str) -> bool:
-        if not self.telegram_token or not self.telegram_chat:
+        if not self._telegram_enabled:
             return False
         url = f"https://api.telegram.org/bot{self.telegram_token}/sendMessage"
         payload = {"chat_id": self.telegram_chat, "text": message, "parse_mode": "HTML"}
         try:
-            async with aiohttp.ClientSession() as session:
-                async with session.post(url, json=payload) as response:
-                    return response.status == 200
+            return await self._post(url, payload) == 200
         except Exception as e:
             logger.error(f"Telegram error: {e}")
         return False
 
     async def send_discord(self, message: str, title: str = "Polymarket Bot") -> bool:
-        if not self.discord_webhook:
+        if not self._discord_enabled:
             return False
         payload = {"embeds": [{"title": title, "description": message, "color": 5814783}]}
         try:
-            async with aiohttp.ClientSession() as session:
-                async with session.post(self.discord_webhook, json=payload) as response:
-                    return response.status in (200, 204)
+            return await self._post(self.discord_webhook, payload) in (200, 204)
         except Exception as e:
             logger.error(f"Discord error: {e}")
         return False
@@ -45,10 +90,19 @@ class Notifier:
     async def notify(self, message: str, title: str = "Polymarket Bot"):
         """Send to all channels"""
         logger.info(f"[NOTIFY] {message}")
-        await self.send_telegram(message)
-        await self.send_discord(message, title)
+        sends = []
+        if self._telegram_enabled:
+            sends.append(self.send_telegram(message))
+        if self._discord_enabled:
+            sends.append(self.send_discord(message, title))
+        if sends:
+            # Channels in parallel; each send logs and swallows its own errors
+            await asyncio.gather(*sends, return_exceptions=True)
 
     async def trade_alert(self, action: str, side: str, price: float, size: float, profit: float = None):
+        # Nothing would send or log the alert, so skip building it
+        if not (self._telegram_enabled or self._discord_enabled or logger.isEnabledFor(logging.INFO)):
+            return
         msg = f"🔔 <b>{action}</b>\nSide: {side}\nPrice: ${price:.3f}\nSize: ${size:.2f}"
         if profit:
             msg += f"\n💰 Profit: ${profit:.4f}"
@@ -14,53 +14,251 @@ Usage:
     logger.log_settlement(settlement_data)
 """
 
+import atexit
 import json
+import logging
 import os
-from datetime import datetime
+import queue
+import threading
+import time
+from datetime import datetime, timezone
 from typing import Dict, Any, Optional
 from pathlib import Path
 
+logger = logging.getLogger(__name__)
+
+# orjson is optional - serializes entries to bytes in C
+try:
+    import orjson
+
+    def _json_dumps(entry: Dict[str, Any]) -> bytes:
+        return orjson.dumps(entry, default=str, option=orjson.OPT_NON_STR_KEYS)
+
+    ORJSON_AVAILABLE = True
+except ImportError:
+    def _json_dumps(entry: Dict[str, Any]) -> bytes:
+        return json.dumps(entry, separators=(",", ":"), default=str).encode()
+
+    ORJSON_AVAILABLE = False
+
+# Control messages for the writer thread
+_FLUSH = object()
+_STOP = object()
+
+# Events written and fsynced as soon as they are dequeued, not batched
+_DURABLE_EVENTS = frozenset({"EXECUTION", "SETTLEMENT"})
+
+# Config keys containing any of these are left out of SESSION_START entries
+_SENSITIVE_KEY_PARTS = ("key", "secret", "pass")
+
+# datetime.weekday() -> name, without strftime("%A")
+_WEEKDAY_NAMES = (
+    "Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday",
+)
+
+
+def _r4(x: float) -> float:
+    """round(x, 4) for log fields, without round()'s decimal conversion."""
+    try:
+        return int(x * 10000 + (0.5 if x >= 0 else -0.5)) / 10000
+    except (ValueError, OverflowError):  # nan / inf
+        return x
+
+
+def _r4_or_none(x: Optional[float]) -> Optional[float]:
+    """_r4 for optional fields: None stays None, 0.0 stays 0.0."""
+    return None if x is None else _r4(x)
+
 
 class TradeLogger:
-    """Structured trade logger for RAG-ready data collection."""
+    """
+    Structured trade logger for RAG-ready data collection.
+
+    log_* calls only enqueue the entry; a background writer thread does the
+    JSON serialization and file I/O, so logging never blocks the trading
+    path on disk. If the queue is full, entries are dropped and counted in
+    dropped_entries.
+
+    The writer appends whole lines with os.write on an O_APPEND descriptor,
+    so several bot processes can share one day's file without splitting
+    each other's entries. Lines are batched for up to BATCH_DELAY_SEC or
+    BUFFER_SIZE bytes; EXECUTION and SETTLEMENT entries are written and
+    fsynced as soon as the writer reaches them.
+    """
+
+    __slots__ = (
+        "log_dir",
+        "current_date",
+        "log_file",
+        "_fd",
+        "_pending",
+        "_pending_deadline",
+        "_queue",
+        "_writer",
+        "_writer_lock",
+        "dropped_entries",
+    )
+
+    BUFFER_SIZE = 1 << 16  # Bytes of whole lines batched into one os.write
+    QUEUE_SIZE = 10000  # Pending entries before new ones are dropped
+    BATCH_DELAY_SEC = 0.01  # Longest an entry waits in the batch before it is written
 
     def __init__(self, log_dir: str = "logs/trades"):
         self.log_dir = Path(log_dir)
         self.log_dir.mkdir(parents=True, exist_ok=True)
 
         # Daily log files for easy querying
-        self.current_date = datetime.utcnow().strftime("%Y-%m-%d")
+        self.current_date = datetime.now(timezone.utc).strftime("%Y-%m-%d")
         self.log_file = self.log_dir / f"trades_{self.current_date}.jsonl"
 
-    def _rotate_if_needed(self):
+        # Owned by the writer thread: one O_APPEND descriptor per day and
+        # the encoded lines not yet written to it
+        self._fd: Optional[int] = None
+        self._pending = bytearray()
+        self._pending_deadline = 0.0  # time.monotonic() by which to write the batch
+        self._queue: queue.Queue = queue.Queue(maxsize=self.QUEUE_SIZE)
+        self._writer: Optional[threading.Thread] = None
+        self._writer_lock = threading.Lock()
+        self.dropped_entries = 0
+
+        self._ensure_writer()
+        atexit.register(self.close)
+
+    def _ensure_writer(self):
+        """Start the writer thread (again, after close())."""
+        with self._writer_lock:
+            if self._writer is None or not self._writer.is_alive():
+                self._writer = threading.Thread(
+                    target=self._drain, name="trade-logger", daemon=True
+                )
+                self._writer.start()
+
+    def _open_log(self) -> int:
+        return os.open(self.log_file, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+
+    def _write_pending(self):
+        """Append the batched lines to the log file."""
+        if not self._pending:
+            return
+        try:
+            if self._fd is None:
+                self._fd = self._open_log()
+            view = memoryview(self._pending)
+            while view:
+                view = view[os.write(self._fd, view):]
+            view.release()
+        finally:
+            # On failure the batch is dropped rather than retried forever
+            self._pending.clear()
+
+    def _close_log(self):
+        try:
+            self._write_pending()
+        finally:
+            if self._fd is not None:
+                os.close(self._fd)
+                self._fd = None
+
+    def _rotate_if_needed(self, now: datetime):
         """Rotate log file at midnight UTC."""
-        today = datetime.utcnow().strftime("%Y-%m-%d")
+        today = now.strftime("%Y-%m-%d")
         if today != self.current_date:
+            self._close_log()
             self.current_date = today
             self.log_file = self.log_dir / f"trades_{self.current_date}.jsonl"
 
-    def _write_log(self, event_type: str, data: Dict[str, Any]):
-        """Write a structured log entry."""
-        self._rotate_if_needed()
+    def _drain(self):
+        """Writer thread: serialize queued entries and append them to the log."""
+        while True:
+            # With nothing batched, sleep until the next entry or control message
+            timeout = None
+            if self._pending:
+                timeout = max(self._pending_deadline - time.monotonic(), 0.0)
+            try:
+                item = self._queue.get(timeout=timeout)
+            except queue.Empty:
+                try:
+                    self._write_pending()
+                except Exception as e:
+                    logger.error(f"Trade log write failed: {e}")
+                continue
 
-        entry = {
-            "timestamp": datetime.utcnow().isoformat() + "Z",
-            "event_type": event_type,
-            **data
-        }
+            try:
+                if item is _STOP:
+                    self._close_log()
+                    return
+                if item is _FLUSH:
+                    self._write_pending()
+                    if self._fd is not None:
+                        os.fsync(self._fd)
+                    continue
 
-        with open(self.log_file, "a") as f:
-            f.write(json.dumps(entry) + "\n")
+                now, event_type, data = item
+                self._rotate_if_needed(now)
+
+                entry = {
+                    "timestamp": now.isoformat(),
+                    "event_type": event_type,
+                    **data
+                }
+                pending = self._pending
+                if not pending:
+                    self._pending_deadline = time.monotonic() + self.BATCH_DELAY_SEC
+                pending += _json_dumps(entry)
+                pending += b"\n"
+                if event_type in _DURABLE_EVENTS:
+                    self._write_pending()
+                    if self._fd is not None:
+                        os.fsync(self._fd)
+                elif (
+                    len(pending) >= self.BUFFER_SIZE
+                    or time.monotonic() >= self._pending_deadline
+                ):
+                    self._write_pending()
+            except Exception as e:
+                logger.error(f"Trade log write failed: {e}")
+            finally:
+                self._queue.task_done()
+
+    def flush(self):
+        """Wait until queued entries are written and on disk (for critical events)."""
+        self._ensure_writer()
+        self._queue.put(_FLUSH)
+        self._queue.join()
+
+    def close(self):
+        """Write out queued entries, close the log file and stop the writer."""
+        with self._writer_lock:
+            writer = self._writer
+        if writer is None or not writer.is_alive():
+            return
+        self._queue.put(_STOP)
+        writer.join()
+        with self._writer_lock:
+            if self._writer is writer:
+                self._writer = None
+
+    def _write_log(self, event_type: str, data: Dict[str, Any], now: Optional[datetime] = None):
+        """Queue a structured log entry for the writer thread."""
+        try:
+            self._queue.put_nowait((now or datetime.now(timezone.utc), event_type, data))
+        except queue.Full:
+            self.dropped_entries += 1
+            return
+        # close() clears the writer; logging afterwards starts a new one
+        if self._writer is None:
+            self._ensure_writer()
 
     def log_scan(self, markets_found: int, asset: str, scan_mode: str):
         """Log market scan results."""
+        now = datetime.now(timezone.utc)
         self._write_log("SCAN", {
             "markets_found": markets_found,
             "asset": asset,
             "scan_mode": scan_mode,
-            "hour_utc": datetime.utcnow().hour,
-            "day_of_week": datetime.utcnow().strftime("%A")
-        })
+            "hour_utc": now.hour,
+            "day_of_week": _WEEKDAY_NAMES[now.weekday()]
+        }, now)
 
     def log_opportunity(
         self,
@@ -76,21 +274,24 @@ class TradeLogger:
         spot_change_pct: Optional[float] = None
     ):
         """Log detected trading opportunity."""
+        now = datetime.now(timezone.utc)
+        if len(market_question) > 100:
+            market_question = market_question[:100]  # Truncate for storage
         self._write_log("OPPORTUNITY", {
             "token_id": token_id,
-            "market_question": market_question[:100],  # Truncate for storage
-            "current_price": round(current_price, 4),
+            "market_question": market_question,
+            "current_price": _r4(current_price),
             "time_remaining_seconds": round(time_remaining_seconds, 2),
-            "bid": round(bid, 4),
-            "ask": round(ask, 4),
-            "spread": round(spread, 4),
-            "implied_edge": round(1.0 - ask, 4) if ask > 0 else 0,
+            "bid": _r4(bid),
+            "ask": _r4(ask),
+            "spread": _r4(spread),
+            "implied_edge": _r4(1.0 - ask) if ask > 0 else 0,
             "is_neg_risk": is_neg_risk,
             "spot_price": spot_price,
-            "spot_change_pct": round(spot_change_pct, 4) if spot_change_pct else None,
-            "hour_utc": datetime.utcnow().hour,
-            "day_of_week": datetime.utcnow().strftime("%A")
-        })
+            "spot_change_pct": _r4_or_none(spot_change_pct),
+            "hour_utc": now.hour,
+            "day_of_week": _WEEKDAY_NAMES[now.weekday()]
+        }, now)
 
     def log_execution(
         self,
@@ -113,7 +314,7 @@ class TradeLogger:
             "order_type": order_type,
             "success": success,
             "error_message": error_message,
-            "execution_time_ms": round(execution_time_ms, 2) if execution_time_ms else None,
+            "execution_time_ms": round(execution_time_ms, 2) if execution_time_ms is not None else None,
             "order_id": order_id,
             "expected_profit": round((1.0 - price) * size, 4) if success else 0
         })
@@ -171,10 +372,11 @@ class TradeLogger:
     def log_session_start(self, config: Dict[str, Any]):
         """Log bot session start with configuration."""
         # Sanitize config - never log private keys
-        safe_config = {
-            k: v for k, v in config.items()
-            if "key" not in k.lower() and "secret" not in k.lower() and "pass" not in k.lower()
-        }
+        safe_config = {}
+        for k, v in config.items():
+            lowered = k.lower()
+            if not any(part in lowered for part in _SENSITIVE_KEY_PARTS):
+                safe_config[k] = v
         self._write_log("SESSION_START", {
             "config": safe_config
         })
@@ -184,6 +386,7 @@ class TradeLogger:
         self._write_log("SESSION_END", {
             "stats": stats
         })
+        self.flush()
 
 
 # Convenience singleton